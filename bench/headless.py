@@ -0,0 +1,213 @@
+"""Stand-ins for tkinter so the dashboard can be benchmarked without a display.
+
+Widgets accept any option and count every call that would have become a Tcl
+command, which is the dominant cost of a real Tk render. Matplotlib still
+renders for real through an Agg canvas.
+"""
+import heapq
+import itertools
+import time
+import tkinter
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest import mock
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+class CallCounter:
+    def __init__(self):
+        self.calls = 0
+
+counter = CallCounter()
+
+class FakeWidget:
+    def __init__(self, *args, **options):
+        self.options = dict(options)
+        counter.calls += 1
+
+    def __getattr__(self, name):
+        # pack/grid/bind/destroy/... are all accepted and ignored
+        def method(*args, **kwargs):
+            counter.calls += 1
+        return method
+
+    def config(self, *args, **options):
+        counter.calls += 1
+        if not args:
+            self.options.update(options)
+
+    configure = config
+
+    def cget(self, option):
+        return self.options.get(option)
+
+    def __getitem__(self, option):
+        return self.options.get(option)
+
+    def __setitem__(self, option, value):
+        self.config(**{option: value})
+
+    def winfo_width(self):
+        return 800
+
+    def winfo_height(self):
+        return 600
+
+class FakeTreeview(FakeWidget):
+    def __init__(self, *args, columns=(), **options):
+        super().__init__(*args, columns=tuple(columns), **options)
+        self.rows = {}
+        self.order = []
+        self.ids = itertools.count()
+
+    def insert(self, parent, index, values=(), **options):
+        counter.calls += 1
+        iid = f"I{next(self.ids)}"
+        self.rows[iid] = tuple(values)
+        if index == 0:
+            self.order.insert(0, iid)
+        else:
+            self.order.append(iid)
+        return iid
+
+    def item(self, iid, values=None, **options):
+        counter.calls += 1
+        if values is not None:
+            self.rows[iid] = tuple(values)
+
+    def set(self, iid, column, value=None):
+        counter.calls += 1
+        row = list(self.rows[iid])
+        row[self.options["columns"].index(column)] = value
+        self.rows[iid] = tuple(row)
+
+    def delete(self, *iids):
+        counter.calls += 1
+        for iid in iids:
+            self.rows.pop(iid, None)
+        removed = set(iids)
+        self.order = [iid for iid in self.order if iid not in removed]
+
+    def get_children(self, item=""):
+        counter.calls += 1
+        return tuple(self.order)
+
+class FakeVar:
+    def __init__(self, master=None, value=None, name=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def trace_add(self, *args):
+        pass
+
+class FakeRoot(FakeWidget):
+    """A Tk root whose after() queue is driven by run() on the calling thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.timers = []
+        self.sequence = itertools.count()
+        self.stopped = False
+
+    def after(self, ms, callback=None, *args):
+        heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, next(self.sequence), callback, args))
+        return "after#%d" % len(self.timers)
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def quit(self):
+        self.stopped = True
+
+    def destroy(self):
+        self.stopped = True
+
+    def run(self, seconds):
+        deadline = time.perf_counter() + seconds
+        self.stopped = False
+        while not self.stopped and time.perf_counter() < deadline:
+            if not self.timers:
+                time.sleep(0.001)
+                continue
+            due = self.timers[0][0]
+            now = time.perf_counter()
+            if due > now:
+                time.sleep(min(due, deadline) - now)
+                continue
+            _, _, callback, args = heapq.heappop(self.timers)
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Headless callback error: {e}")
+
+class HeadlessCanvas(FigureCanvasAgg):
+    """FigureCanvasTkAgg replacement: real Agg rendering, fake Tk widget."""
+
+    def __init__(self, figure, master=None):
+        super().__init__(figure)
+        self.widget = FakeWidget()
+
+    def get_tk_widget(self):
+        return self.widget
+
+    def draw_idle(self):
+        self.draw()
+
+    def blit(self, bbox=None):
+        counter.calls += 1
+
+def fake_blit(photo, pixels, offsets):
+    counter.calls += 1
+
+def fake_tk():
+    names = {name: getattr(tkinter.constants, name) for name in dir(tkinter.constants) if name.isupper()}
+    widget_names = ("Frame", "Label", "Button", "Checkbutton", "Menubutton", "Menu",
+                    "Canvas", "Entry", "Scrollbar", "Toplevel", "PhotoImage")
+    names.update({name: FakeWidget for name in widget_names})
+    names.update(StringVar=FakeVar, BooleanVar=FakeVar, IntVar=FakeVar, DoubleVar=FakeVar,
+                 Tk=FakeRoot, TclError=tkinter.TclError)
+    return SimpleNamespace(**names)
+
+def fake_ttk():
+    return SimpleNamespace(Treeview=FakeTreeview, Combobox=FakeWidget, Style=FakeWidget,
+                           Scrollbar=FakeWidget, Frame=FakeWidget, Label=FakeWidget)
+
+@contextmanager
+def patched_tk():
+    """Swap tkinter for the fakes in every module that builds widgets."""
+    import config.theme
+    import core.app
+    import components.chart
+    import components.chart_raster
+    import components.depth
+    import components.market_grid
+    import components.metrics_overlay
+    import components.orderbook
+    import components.table
+    import components.ticker
+    import components.trades
+
+    tk, ttk = fake_tk(), fake_ttk()
+    with mock.patch.object(config.theme, "ttk", ttk), \
+            mock.patch.object(core.app, "tk", tk), \
+            mock.patch.object(components.ticker, "tk", tk), \
+            mock.patch.object(components.table, "tk", tk), \
+            mock.patch.object(components.metrics_overlay, "tk", tk), \
+            mock.patch.object(components.market_grid, "tk", tk), \
+            mock.patch.object(components.market_grid, "ttk", ttk), \
+            mock.patch.object(components.chart, "tk", tk), \
+            mock.patch.object(components.chart, "ttk", ttk), \
+            mock.patch.object(components.chart, "FigureCanvasTkAgg", HeadlessCanvas), \
+            mock.patch.object(components.chart_raster, "blit", fake_blit), \
+            mock.patch.object(components.depth, "tk", tk), \
+            mock.patch.object(components.depth, "ttk", ttk), \
+            mock.patch.object(components.depth, "blit", fake_blit), \
+            mock.patch.object(components.orderbook, "tk", tk), \
+            mock.patch.object(components.orderbook, "ttk", ttk), \
+            mock.patch.object(components.trades, "tk", tk), \
+            mock.patch.object(components.trades, "ttk", ttk):
+        yield
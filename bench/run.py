@@ -0,0 +1,299 @@
+"""Throughput and latency benchmark for the dashboard.
+
+Starts bench.server in a subprocess (so its CPU is not charged to the
+dashboard), points BinanceFeed and core.http at it, builds DashboardApp with
+the requested tickers and panels, and measures over a fixed window:
+
+  * messages/sec received by the feed
+  * end-to-end latency from the server's event time (E) to the end of the
+    render tick that displayed the message or a newer one, as percentiles
+  * CPU% and RSS of the dashboard process
+
+Results are written to bench/results/ and compared with the previous run of
+the same configuration.
+
+    python -m bench.run --symbols 6 --rate 2 --duration 20 --headless
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "bench", "results")
+PANELS = ("chart", "orderbook", "depth", "trades", "market")
+
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Dashboard benchmark")
+    parser.add_argument("--symbols", type=int, default=6, help="number of ticker cards")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="multiplier on every stream's message rate (see bench.server.STREAM_RATES)")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before the window")
+    parser.add_argument("--universe", type=int, default=300,
+                        help="USDT pairs served in exchangeInfo and !miniTicker@arr")
+    parser.add_argument("--panels", default="chart,orderbook,trades",
+                        help="comma-separated panels to show: chart,orderbook,depth,trades,market (or 'none')")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--chart-worker", action="store_true",
+                        help="render the chart in a worker process (components.chart_raster)")
+    parser.add_argument("--engine", choices=("threads", "asyncio"), default="threads",
+                        help="feed engine: websocket-client threads or core.aiofeed")
+    parser.add_argument("--headless", action="store_true",
+                        help="replace Tk widgets with counting fakes (implied when no display)")
+    parser.add_argument("--label", default="", help="tag stored with the result, e.g. a branch name")
+    parser.add_argument("--no-save", action="store_true")
+    return parser.parse_args()
+
+def start_server(rate, universe=300):
+    process = subprocess.Popen([sys.executable, "-m", "bench.server", "--rate", str(rate),
+                                "--universe", str(universe)],
+                               cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline().split()
+    if not line or line[0] != "READY":
+        process.kill()
+        raise RuntimeError("bench server failed to start")
+    return process, int(line[1]), int(line[2])
+
+def symbol_list(count):
+    known = ["btcusdt", "ethusdt", "bnbusdt", "solusdt", "adausdt", "xrpusdt"]
+    return (known + [f"sym{i:03d}usdt" for i in range(count)])[:count]
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+class Probe:
+    """Counts feed messages and turns event times into render latencies."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.pending = []
+        self.latencies = []
+        self.recording = False
+
+    def attach(self, feed, scheduler):
+        dispatch = feed.dispatch
+        tick = scheduler.tick
+
+        def counted_dispatch(stream, data):
+            with self.lock:
+                self.messages += 1
+                if "E" in data:
+                    self.pending.append(data["E"])
+            dispatch(stream, data)
+
+        def timed_tick():
+            with self.lock:
+                pending, self.pending = self.pending, []
+            tick()
+            done = time.time() * 1000
+            if self.recording:
+                self.latencies.extend(done - e for e in pending)
+
+        feed.dispatch = counted_dispatch
+        scheduler.tick = timed_tick
+
+    def begin(self):
+        with self.lock:
+            self.messages = 0
+            self.latencies = []
+            self.recording = True
+
+def build_app(root, args, symbols):
+    from core.app import DashboardApp
+    from core.candle_archive import CandleArchive
+    from components.ticker import CryptoTicker
+
+    feed = None
+    if args.engine == "asyncio":
+        from core.aiofeed import AsyncFeed
+        feed = AsyncFeed()
+    app = DashboardApp(root, feed=feed, fps=args.fps, archive=CandleArchive(os.path.join("cache", "archive"), initial_days=1),
+                       chart_worker=args.chart_worker)
+    for var in app.ticker_vars.values():
+        var.set(False)
+    app.update_tickers()
+    for symbol in symbols:
+        if symbol in app.ticker_vars:
+            app.ticker_vars[symbol].set(True)
+    app.update_tickers()
+    for symbol in symbols:
+        if symbol not in app.tickers:
+            ticker = CryptoTicker(app.ticker_frame, app.feed, app.scheduler, symbol, symbol.upper())
+            ticker.pack(side="left", padx=10, pady=5)
+            ticker.start()
+            app.tickers[symbol] = ticker
+
+    panels = [] if args.panels == "none" else args.panels.split(",")
+    for panel in panels:
+        if panel not in PANELS:
+            raise SystemExit(f"unknown panel {panel!r}")
+        getattr(app, "toggle_" + panel)()
+    return app
+
+def run(args):
+    import core.http
+    from core.feed import BinanceFeed
+
+    server, ws_port, http_port = start_server(args.rate, args.universe)
+    BinanceFeed.BASE_URL = f"ws://127.0.0.1:{ws_port}/stream"
+    core.http.API_URL = f"http://127.0.0.1:{http_port}"
+
+    headless = args.headless or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY"))
+    symbols = symbol_list(args.symbols)
+    workdir = tempfile.mkdtemp(prefix="dashboard-bench-")
+    # Preferences and the candle archive are relative paths; keep them out of the repo
+    os.chdir(workdir)
+
+    try:
+        if headless:
+            from bench import headless as fakes
+            with fakes.patched_tk():
+                root = fakes.FakeRoot()
+                app = build_app(root, args, symbols)
+                result = measure(app, args, lambda seconds: root.run(seconds), fakes.counter)
+        else:
+            import tkinter as tk
+            root = tk.Tk()
+
+            def pump(seconds):
+                root.after(int(seconds * 1000), root.quit)
+                root.mainloop()
+
+            app = build_app(root, args, symbols)
+            result = measure(app, args, pump, None)
+        app.on_closing()
+    finally:
+        server.kill()
+
+    result.update({
+        "config": {"symbols": args.symbols, "rate": args.rate, "universe": args.universe, "duration": args.duration,
+                   "panels": args.panels, "fps": args.fps, "engine": args.engine,
+                   "chart_worker": args.chart_worker, "headless": headless},
+        "revision": git_revision(),
+        "label": args.label,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+    return result
+
+def measure(app, args, pump, counter):
+    probe = Probe()
+    probe.attach(app.feed, app.scheduler)
+    pump(args.warmup)
+
+    probe.begin()
+    calls = counter.calls if counter else 0
+    coalesced = app.scheduler.coalesced
+    rasterizer = app.chart.rasterizer if app.chart else None
+    frames = (rasterizer.frames, rasterizer.dropped) if rasterizer else None
+    wall, cpu = time.perf_counter(), time.process_time()
+    pump(args.duration)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    with probe.lock:
+        latencies = probe.latencies
+        messages = probe.messages
+    result = {
+        "messages": messages,
+        "messages_per_sec": messages / wall,
+        "latency_ms": {f"p{p}": percentile(latencies, p) for p in (50, 90, 99)},
+        "latency_max_ms": max(latencies) if latencies else None,
+        "cpu_percent": cpu / wall * 100,
+        "rss_mb": rss_mb(),
+        "coalesced": app.scheduler.coalesced - coalesced,
+        "threads": threading.active_count(),
+    }
+    if rasterizer:
+        result["chart_frames_per_sec"] = (rasterizer.frames - frames[0]) / wall
+        result["chart_frames_dropped"] = rasterizer.dropped - frames[1]
+    if counter:
+        result["tk_calls_per_sec"] = (counter.calls - calls) / wall
+    return result
+
+def config_key(config):
+    return json.dumps(config, sort_keys=True)
+
+def previous_result(config):
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    for name in sorted(os.listdir(RESULTS_DIR), reverse=True):
+        try:
+            with open(os.path.join(RESULTS_DIR, name)) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if config_key(result.get("config", {})) == config_key(config):
+            return result
+    return None
+
+def report(result, previous):
+    def delta(value, old):
+        if previous is None or value is None or not old:
+            return ""
+        return f"  ({(value - old) / old * 100:+.1f}% vs {previous['revision']})"
+
+    old = previous or {}
+    print(f"\nrevision {result['revision']}  {result['config']}")
+    print(f"  messages/sec   {result['messages_per_sec']:10.1f}"
+          f"{delta(result['messages_per_sec'], old.get('messages_per_sec'))}")
+    for name, value in result["latency_ms"].items():
+        text = "n/a" if value is None else f"{value:10.2f}"
+        print(f"  latency {name:<6} {text} ms{delta(value, old.get('latency_ms', {}).get(name))}")
+    print(f"  cpu            {result['cpu_percent']:10.1f} %{delta(result['cpu_percent'], old.get('cpu_percent'))}")
+    print(f"  rss            {result['rss_mb']:10.1f} MB{delta(result['rss_mb'], old.get('rss_mb'))}")
+    print(f"  coalesced      {result['coalesced']:10d}")
+    if "threads" in result:
+        print(f"  threads        {result['threads']:10d}{delta(result['threads'], old.get('threads'))}")
+    if "chart_frames_per_sec" in result:
+        print(f"  chart frames/s {result['chart_frames_per_sec']:10.1f}   ({result['chart_frames_dropped']} stale dropped)")
+    if "tk_calls_per_sec" in result:
+        print(f"  tk calls/sec   {result['tk_calls_per_sec']:10.1f}"
+              f"{delta(result['tk_calls_per_sec'], old.get('tk_calls_per_sec'))}")
+
+def save(result):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{result['revision']}.json"
+    path = os.path.join(RESULTS_DIR, name)
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    return path
+
+def main():
+    args = parse_args()
+    result = run(args)
+    previous = previous_result(result["config"])
+    report(result, previous)
+    if not args.no_save:
+        print(f"\nSaved {save(result)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""Local stand-in for the Binance endpoints the dashboard talks to.
+
+Serves the combined websocket stream (/stream?streams=..., with
+SUBSCRIBE/UNSUBSCRIBE frames) and raw streams (/ws/<stream>), plus the REST
+calls /api/v3/klines, /api/v3/depth, /api/v3/ticker/24hr and
+/api/v3/exchangeInfo, all from a synthetic random-walk market. --universe
+sets how many USDT pairs exist for exchangeInfo and !miniTicker@arr. Only
+the standard library is used so the benchmark runs anywhere.
+
+    python -m bench.server --ws-port 9443 --http-port 8080 --rate 2
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Messages per second for one symbol at --rate 1, by stream suffix
+STREAM_RATES = {
+    "ticker": 1.0,
+    "depth10@100ms": 10.0,
+    "depth@100ms": 10.0,
+    "trade": 20.0,
+    "kline_1m": 2.0,
+    "arr": 1.0,  # !miniTicker@arr: one array of every symbol per second
+}
+
+MINUTE_MS = 60_000
+
+def now_ms():
+    return int(time.time() * 1000)
+
+class SymbolMarket:
+    """Random-walk price, trade ids and depth update ids for one symbol."""
+
+    def __init__(self, symbol):
+        self.symbol = symbol.upper()
+        seed = sum(map(ord, symbol))
+        self.random = random.Random(seed)
+        self.price = 10.0 + seed % 500 * 7.3
+        self.open = self.price
+        self.high = self.price
+        self.low = self.price
+        self.volume = 0.0
+        self.minute = now_ms() // MINUTE_MS * MINUTE_MS
+        self.trade_id = 0
+        self.update_id = 1
+        self.lock = threading.Lock()
+
+    def step(self):
+        self.price *= 1 + self.random.gauss(0, 0.0004)
+        self.high = max(self.high, self.price)
+        self.low = min(self.low, self.price)
+
+    def levels(self, side, count):
+        sign = -1 if side == "bids" else 1
+        tick = self.price * 0.0001
+        return [[f"{self.price + sign * tick * (i + 1):.2f}", f"{self.random.uniform(0.01, 5):.4f}"]
+                for i in range(count)]
+
+    def ticker(self):
+        with self.lock:
+            self.step()
+            change = self.price - self.open
+            return {
+                "e": "24hrTicker", "E": now_ms(), "s": self.symbol,
+                "c": f"{self.price:.2f}", "p": f"{change:.2f}",
+                "P": f"{change / self.open * 100:.3f}", "v": f"{self.volume:.4f}",
+                "h": f"{self.high:.2f}", "l": f"{self.low:.2f}",
+            }
+
+    def ticker_24hr(self):
+        """The current ticker in REST /api/v3/ticker/24hr form."""
+        ticker = self.ticker()
+        return {"symbol": self.symbol, "lastPrice": ticker["c"], "priceChange": ticker["p"],
+                "priceChangePercent": ticker["P"], "volume": ticker["v"],
+                "highPrice": ticker["h"], "lowPrice": ticker["l"]}
+
+    def trade(self):
+        with self.lock:
+            self.step()
+            self.trade_id += 1
+            qty = self.random.uniform(0.001, 2)
+            self.volume += qty
+            ts = now_ms()
+            return {
+                "e": "trade", "E": ts, "s": self.symbol, "t": self.trade_id,
+                "p": f"{self.price:.2f}", "q": f"{qty:.5f}", "T": ts,
+                "m": self.random.random() < 0.5,
+            }
+
+    def kline(self):
+        with self.lock:
+            self.step()
+            ts = now_ms()
+            minute = ts // MINUTE_MS * MINUTE_MS
+            closed = minute != self.minute
+            kline = {
+                "t": self.minute, "T": self.minute + MINUTE_MS - 1, "s": self.symbol, "i": "1m",
+                "o": f"{self.open:.2f}", "c": f"{self.price:.2f}", "h": f"{self.high:.2f}",
+                "l": f"{self.low:.2f}", "v": f"{self.volume:.4f}", "x": closed,
+            }
+            if closed:
+                self.minute = minute
+                self.open = self.high = self.low = self.price
+                self.volume = 0.0
+            return {"e": "kline", "E": ts, "s": self.symbol, "k": kline}
+
+    def mini_ticker(self, ts):
+        with self.lock:
+            self.step()
+            return {"e": "24hrMiniTicker", "E": ts, "s": self.symbol, "c": f"{self.price:.8f}",
+                    "o": f"{self.open:.8f}", "h": f"{self.high:.8f}", "l": f"{self.low:.8f}",
+                    "v": f"{self.volume:.4f}", "q": f"{self.volume * self.price + self.random.uniform(1e5, 1e8):.2f}"}
+
+    def partial_depth(self):
+        with self.lock:
+            return {"lastUpdateId": self.update_id,
+                    "bids": self.levels("bids", 10), "asks": self.levels("asks", 10)}
+
+    def depth_update(self):
+        with self.lock:
+            first = self.update_id + 1
+            self.update_id += self.random.randint(1, 3)
+            return {
+                "e": "depthUpdate", "E": now_ms(), "s": self.symbol,
+                "U": first, "u": self.update_id,
+                "b": self.levels("bids", 5), "a": self.levels("asks", 5),
+            }
+
+    def snapshot(self, limit):
+        with self.lock:
+            count = min(limit, 500)
+            return {"lastUpdateId": self.update_id,
+                    "bids": self.levels("bids", count), "asks": self.levels("asks", count)}
+
+    def klines(self, start_time, limit):
+        """Synthetic closed history up to and including the forming minute."""
+        end = now_ms() // MINUTE_MS * MINUTE_MS
+        start = end - (limit - 1) * MINUTE_MS if start_time is None else start_time // MINUTE_MS * MINUTE_MS
+        rows = []
+        price = self.price
+        for t in range(start, min(end, start + (limit - 1) * MINUTE_MS) + 1, MINUTE_MS):
+            rng = random.Random(t ^ self.trade_id)
+            o = price * (1 + rng.gauss(0, 0.001))
+            c = o * (1 + rng.gauss(0, 0.001))
+            rows.append([t, f"{o:.2f}", f"{max(o, c) * 1.0005:.2f}", f"{min(o, c) * 0.9995:.2f}",
+                         f"{c:.2f}", f"{rng.uniform(1, 50):.4f}", t + MINUTE_MS - 1])
+        return rows
+
+KNOWN_SYMBOLS = ["btcusdt", "ethusdt", "bnbusdt", "solusdt", "adausdt", "xrpusdt"]
+
+def universe_symbols(count):
+    return (KNOWN_SYMBOLS + [f"sym{i:03d}usdt" for i in range(count)])[:max(count, len(KNOWN_SYMBOLS))]
+
+class Market:
+    def __init__(self, rate=1.0, universe=300):
+        self.rate = rate
+        self.symbols = {}
+        self.universe = universe_symbols(universe)
+        self.lock = threading.Lock()
+        self.sent = 0
+
+    def get(self, symbol):
+        with self.lock:
+            market = self.symbols.get(symbol.lower())
+            if market is None:
+                market = self.symbols[symbol.lower()] = SymbolMarket(symbol.lower())
+            return market
+
+    def exchange_info(self):
+        return {"symbols": [{"symbol": s.upper(), "status": "TRADING",
+                             "baseAsset": s[:-4].upper(), "quoteAsset": "USDT"} for s in self.universe]}
+
+    def event(self, stream):
+        if stream == "!miniTicker@arr":
+            ts = now_ms()
+            return [self.get(symbol).mini_ticker(ts) for symbol in self.universe]
+        symbol, _, kind = stream.partition("@")
+        market = self.get(symbol)
+        if kind == "ticker":
+            return market.ticker()
+        if kind == "trade":
+            return market.trade()
+        if kind == "kline_1m":
+            return market.kline()
+        if kind == "depth10@100ms":
+            return market.partial_depth()
+        if kind == "depth@100ms":
+            return market.depth_update()
+        return None
+
+def encode_frame(payload, opcode=0x1):
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header.append(length)
+    elif length < 1 << 16:
+        header.append(126)
+        header += struct.pack(">H", length)
+    else:
+        header.append(127)
+        header += struct.pack(">Q", length)
+    return bytes(header) + payload
+
+class StreamHandler(socketserver.StreamRequestHandler):
+    """One websocket client: handshake, a reader for control frames and a
+    paced writer emitting every subscribed stream at its configured rate."""
+
+    TICK = 0.005
+
+    def handle(self):
+        request = self.rfile.readline().decode("latin-1").split()
+        if len(request) < 2:
+            return
+        headers = {}
+        while True:
+            line = self.rfile.readline().decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlparse(request[1])
+        if url.path == "/stream":
+            self.combined = True
+            streams = parse_qs(url.query).get("streams", [""])[0]
+            self.streams = {s for s in streams.split("/") if s}
+        elif url.path.startswith("/ws/"):
+            self.combined = False
+            self.streams = {url.path[len("/ws/"):]}
+        else:
+            self.wfile.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return
+
+        accept = base64.b64encode(hashlib.sha1((headers.get("sec-websocket-key", "") + WS_GUID).encode()).digest())
+        self.wfile.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        self.wfile.flush()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.market = self.server.market
+        self.send_lock = threading.Lock()
+        self.streams_lock = threading.Lock()
+        self.open = True
+        threading.Thread(target=self.read_loop, daemon=True).start()
+        self.write_loop()
+
+    def send(self, payload, opcode=0x1):
+        with self.send_lock:
+            self.request.sendall(encode_frame(payload, opcode))
+
+    def read_frame(self):
+        head = self.rfile.read(2)
+        if len(head) < 2:
+            return None, None
+        opcode = head[0] & 0x0F
+        length = head[1] & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self.rfile.read(8))[0]
+        mask = self.rfile.read(4) if head[1] & 0x80 else b"\0\0\0\0"
+        data = self.rfile.read(length)
+        return opcode, bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+
+    def read_loop(self):
+        try:
+            while self.open:
+                opcode, data = self.read_frame()
+                if opcode is None or opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    self.send(data, 0xA)
+                elif opcode == 0x1:
+                    self.on_request(json.loads(data))
+        except (OSError, ValueError):
+            pass
+        self.open = False
+
+    def on_request(self, request):
+        streams = set(request.get("params", ()))
+        with self.streams_lock:
+            if request.get("method") == "SUBSCRIBE":
+                self.streams |= streams
+            elif request.get("method") == "UNSUBSCRIBE":
+                self.streams -= streams
+        self.send(json.dumps({"result": None, "id": request.get("id")}).encode())
+
+    def write_loop(self):
+        due = {}
+        last = time.perf_counter()
+        try:
+            while self.open:
+                time.sleep(self.TICK)
+                now = time.perf_counter()
+                elapsed, last = now - last, now
+                with self.streams_lock:
+                    streams = list(self.streams)
+
+                for stream in streams:
+                    kind = stream.partition("@")[2]
+                    due[stream] = due.get(stream, 0.0) + elapsed * STREAM_RATES.get(kind, 0.0) * self.market.rate
+                    while due[stream] >= 1.0:
+                        due[stream] -= 1.0
+                        data = self.market.event(stream)
+                        if data is None:
+                            continue
+                        message = {"stream": stream, "data": data} if self.combined else data
+                        self.send(json.dumps(message).encode())
+                        self.market.sent += 1
+        except OSError:
+            pass
+        self.open = False
+
+class StreamServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, market):
+        super().__init__(address, StreamHandler)
+        self.market = market
+
+class RestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        market = self.server.market.get(params.get("symbol", "btcusdt"))
+
+        if url.path == "/api/v3/klines":
+            start = int(params["startTime"]) if "startTime" in params else None
+            body = market.klines(start, int(params.get("limit", 500)))
+        elif url.path == "/api/v3/depth":
+            body = market.snapshot(int(params.get("limit", 100)))
+        elif url.path == "/api/v3/ticker/24hr":
+            body = [self.server.market.get(s).ticker_24hr() for s in json.loads(params["symbols"])]
+        elif url.path == "/api/v3/exchangeInfo":
+            body = self.server.market.exchange_info()
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start(market, ws_port=0, http_port=0, host="127.0.0.1"):
+    """Start both servers on background threads; returns (ws_server, http_server)."""
+    ws_server = StreamServer((host, ws_port), market)
+    http_server = ThreadingHTTPServer((host, http_port), RestHandler)
+    http_server.daemon_threads = True
+    http_server.market = market
+    for server in (ws_server, http_server):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return ws_server, http_server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Binance stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--ws-port", type=int, default=0)
+    parser.add_argument("--http-port", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="multiplier applied to every stream's message rate")
+    parser.add_argument("--universe", type=int, default=300,
+                        help="number of USDT pairs in exchangeInfo and !miniTicker@arr")
+    args = parser.parse_args()
+
+    ws_server, http_server = start(Market(args.rate, args.universe), args.ws_port, args.http_port, args.host)
+    # The harness reads this line to learn the ports
+    print("READY", ws_server.server_address[1], http_server.server_address[1], flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
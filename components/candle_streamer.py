@@ -1,35 +1,28 @@
-import websocket
-import json
-import threading
+from core.decoding import SCHEMAS
+from core.feed import RESYNC
+
+KLINE_FIELDS = SCHEMAS["kline"]
 
 class CandleStreamer:
-    def __init__(self, chart_panel, symbol="btcusdt"):
+    def __init__(self, chart_panel, feed, symbol="btcusdt"):
         self.chart = chart_panel
+        self.feed = feed
         self.symbol = symbol.lower()
-        self.ws = None
         self.is_active = False
 
     def start(self):
         if self.is_active:
             return
         self.is_active = True
-
-        ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol}@kline_1m"
-
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=self.on_message,
-            on_error=lambda ws, err: print("Candle error:", err),
-            on_close=lambda ws, s, m: print("Candle closed"),
-            on_open=lambda ws: print(f"Candle stream connected: {self.symbol}")
-        )
-        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+        self.feed.watch(f"{self.symbol}@kline_1m", self.on_status)
+        self.feed.subscribe(f"{self.symbol}@kline_1m", self.on_message)
 
     def stop(self):
+        if not self.is_active:
+            return
         self.is_active = False
-        if self.ws:
-            self.ws.close()
-            self.ws = None
+        self.feed.unsubscribe(f"{self.symbol}@kline_1m", self.on_message)
+        self.feed.unwatch(f"{self.symbol}@kline_1m", self.on_status)
 
     def change_symbol(self, symbol):
         self.stop()
@@ -37,20 +30,31 @@ class CandleStreamer:
         if self.chart.visible:
             self.start()
 
-    def on_message(self, ws, message):
-        if not self.is_active:
+    def on_status(self, stream, status):
+        # Candles closed while disconnected are fetched over REST
+        if status == RESYNC and self.is_active and stream.startswith(self.symbol + "@"):
+            self.chart.scheduler.post((self, "resync"), self.chart.fetch_initial_data)
+
+    def on_message(self, stream, data):
+        # Frames already in flight for the previous symbol are dropped
+        if not self.is_active or not stream.startswith(self.symbol + "@"):
             return
 
-        data = json.loads(message)["k"]
+        open_time, o, h, l, c, v, is_closed = KLINE_FIELDS(data["k"])
 
         candle = {
-            "time": data["t"],
-            "open": float(data["o"]),
-            "high": float(data["h"]),
-            "low": float(data["l"]),
-            "close": float(data["c"]),
-            "volume": float(data["v"]),
-            "is_closed": data["x"]
+            "time": open_time,
+            "open": float(o),
+            "high": float(h),
+            "low": float(l),
+            "close": float(c),
+            "volume": float(v),
+            "is_closed": is_closed
         }
 
-        self.chart.parent.after(0, self.chart.update_realtime_candle, candle)
+        if candle["is_closed"]:
+            self.chart.archive.record(self.symbol, "1m", candle)
+
+        # Keyed by open time so a candle's final update is never coalesced
+        # away by the first update of the next one.
+        self.chart.scheduler.post((self, candle["time"]), self.chart.update_realtime_candle, candle)
@@ -1,18 +1,235 @@
 import tkinter as tk
 from tkinter import ttk
-import requests
-import matplotlib
+import threading
+import numpy as np
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.lines import Line2D
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from config.theme import DarkTheme
+from core.timeframes import TIMEFRAMES, TIMEFRAME_TITLES, TimeframeAggregator
+from core.indicators import INDICATORS, IndicatorEngine
 from components.candle_streamer import CandleStreamer
 
+def candle_geometry(x, opens, highs, lows, closes, volumes):
+    """Vertex arrays for candle bodies, wicks and volume bars at positions x."""
+    x = np.asarray(x, dtype=float)
+    opens = np.asarray(opens, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+
+    bottom = np.minimum(opens, closes)
+    height = np.abs(opens - closes)
+    height[height == 0] = 0.5
+    top = bottom + height
+
+    bodies = np.empty((len(x), 4, 2))
+    bodies[:, :, 0] = np.stack([x - 0.3, x + 0.3, x + 0.3, x - 0.3], axis=1)
+    bodies[:, :, 1] = np.stack([bottom, bottom, top, top], axis=1)
+
+    wicks = np.empty((len(x), 2, 2))
+    wicks[:, :, 0] = x[:, None]
+    wicks[:, 0, 1] = lows
+    wicks[:, 1, 1] = highs
+
+    bars = np.zeros((len(x), 4, 2))
+    bars[:, :, 0] = np.stack([x - 0.4, x + 0.4, x + 0.4, x - 0.4], axis=1)
+    bars[:, 2, 1] = volumes
+    bars[:, 3, 1] = volumes
+
+    colors = np.where(closes >= opens, DarkTheme.GREEN, DarkTheme.RED).tolist()
+    return bodies, wicks, bars, colors
+
+OUTPUT_COLORS = {
+    "sma": DarkTheme.YELLOW,
+    "ema": DarkTheme.PURPLE,
+    "upper": DarkTheme.BLUE,
+    "middle": DarkTheme.BLUE,
+    "lower": DarkTheme.BLUE,
+    "vwap": DarkTheme.CYAN,
+    "rsi": DarkTheme.YELLOW,
+    "macd": DarkTheme.BLUE,
+    "signal": DarkTheme.ORANGE,
+    "histogram": DarkTheme.GRAY,
+}
+
+def set_series(artist, x, y):
+    """Point a line, or a histogram LineCollection, at new data."""
+    if isinstance(artist, LineCollection):
+        segments = np.zeros((len(x), 2, 2))
+        segments[:, :, 0] = np.asarray(x)[:, None]
+        segments[:, 1, 1] = np.nan_to_num(y)
+        artist.set_segments(segments)
+    else:
+        artist.set_data(x, y)
+
+class ChartFigure:
+    """Price, volume and oscillator axes of one chart, independent of its canvas.
+
+    ChartPanel draws it through a FigureCanvasTkAgg on the Tk thread; the
+    raster worker (components.chart_raster) keeps its own copy on an Agg
+    canvas in another process.
+    """
+
+    def __init__(self, figsize=(10, 6), dpi=100):
+        self.fig = Figure(figsize=figsize, dpi=dpi, facecolor=DarkTheme.CARD_BG)
+        self.ax_price = self.fig.add_subplot(2, 1, 1, facecolor=DarkTheme.ACCENT)
+        self.ax_vol = self.fig.add_subplot(2, 1, 2, facecolor=DarkTheme.ACCENT)
+
+        # Closed candles live in static collections baked into the cached
+        # background; the forming candle is drawn by animated artists that
+        # are blitted on top of it on every tick.
+        self.bodies = PolyCollection([], linewidths=0)
+        self.wicks = LineCollection([], colors=DarkTheme.FG, linewidths=0.5)
+        self.vol_bars = PolyCollection([], linewidths=0)
+        self.last_body = PolyCollection([], linewidths=0, animated=True)
+        self.last_wick = LineCollection([], colors=DarkTheme.FG, linewidths=0.5, animated=True)
+        self.last_vol_bar = PolyCollection([], linewidths=0, animated=True)
+
+        self.ax_price.add_collection(self.wicks)
+        self.ax_price.add_collection(self.bodies)
+        self.ax_price.add_collection(self.last_wick)
+        self.ax_price.add_collection(self.last_body)
+        self.ax_vol.add_collection(self.vol_bars)
+        self.ax_vol.add_collection(self.last_vol_bar)
+        self.style_axes(self.ax_price, "Price (USDT)")
+        self.style_axes(self.ax_vol, "Volume")
+        self.ax_price.set_xticks([])
+
+        # Indicator outputs follow the candles' pattern: a static artist for
+        # closed bars and an animated one for the segment to the forming bar.
+        # Oscillators get their own axes below the volume pane.
+        self.overlays = {}
+        self.panel_axes = {}
+
+    def style_axes(self, ax, ylabel):
+        ax.set_ylabel(ylabel, color=DarkTheme.FG)
+        ax.tick_params(colors=DarkTheme.FG)
+        ax.grid(True, alpha=0.2, color=DarkTheme.FG)
+        for spine in ax.spines.values():
+            spine.set_color(DarkTheme.BORDER)
+
+    def layout(self, panels):
+        """Stack price, volume and one pane per oscillator panel name."""
+        for panel in list(self.panel_axes):
+            if panel not in panels:
+                self.panel_axes.pop(panel).remove()
+
+        ratios = [2, 1] + [1] * len(panels) if panels else [1, 1]
+        grid = self.fig.add_gridspec(len(ratios), 1, height_ratios=ratios)
+        self.ax_price.set_subplotspec(grid[0])
+        self.ax_vol.set_subplotspec(grid[1])
+        for row, panel in enumerate(panels, start=2):
+            if panel not in self.panel_axes:
+                ax = self.fig.add_subplot(grid[row], facecolor=DarkTheme.ACCENT, sharex=self.ax_vol)
+                self.style_axes(ax, panel)
+                self.panel_axes[panel] = ax
+            self.panel_axes[panel].set_subplotspec(grid[row])
+
+    def build_overlays(self, outputs):
+        """Artists for each (indicator, output, panel); panel "price" overlays the candles."""
+        for _, static, forming in self.overlays.values():
+            static.remove()
+            forming.remove()
+        self.overlays = {}
+
+        for name, output, panel in outputs:
+            ax = self.ax_price if panel == "price" else self.panel_axes[panel]
+            color = OUTPUT_COLORS.get(output, DarkTheme.FG)
+            if output == "histogram":
+                static = LineCollection([], colors=color, linewidths=2)
+                forming = LineCollection([], colors=color, linewidths=2, animated=True)
+                ax.add_collection(static)
+                ax.add_collection(forming)
+            else:
+                static = Line2D([], [], color=color, linewidth=1)
+                forming = Line2D([], [], color=color, linewidth=1, animated=True)
+                ax.add_line(static)
+                ax.add_line(forming)
+            self.overlays[(name, output)] = (ax, static, forming)
+
+    def update(self, title, view, values):
+        """Point every artist at view (the visible candles) and values[(name, output)]."""
+        self.ax_price.set_title(title, fontsize=12, fontweight='bold', color=DarkTheme.FG)
+
+        n = len(view)
+        if n:
+            bodies, wicks, bars, colors = candle_geometry(
+                np.arange(n), view["open"], view["high"], view["low"], view["close"], view["volume"])
+            self.bodies.set_verts(bodies[:-1])
+            self.bodies.set_facecolors(colors[:-1])
+            self.wicks.set_segments(wicks[:-1])
+            self.vol_bars.set_verts(bars[:-1])
+            self.vol_bars.set_facecolors(colors[:-1])
+
+            x = np.arange(n)
+            overlays = {}
+            for key, (ax, static, forming) in self.overlays.items():
+                y = values[key]
+                set_series(static, x[:-1], y[:-1])
+                set_series(forming, x[-2:], y[-2:])
+                overlays.setdefault(ax, []).append(y)
+
+            low, high = view["low"].min(), view["high"].max()
+            for y in overlays.get(self.ax_price, []):
+                if not np.isnan(y).all():
+                    low, high = min(low, np.nanmin(y)), max(high, np.nanmax(y))
+            pad = (high - low) * 0.05 or 1
+            self.ax_price.set_xlim(-1, n)
+            self.ax_price.set_ylim(low - pad, high + pad)
+            self.ax_vol.set_xlim(-1, n)
+            self.ax_vol.set_ylim(0, view["volume"].max() * 1.1 or 1)
+
+            for panel, ax in self.panel_axes.items():
+                if panel == "RSI":
+                    ax.set_ylim(0, 100)
+                    continue
+                stacked = np.concatenate(overlays.get(ax, [np.zeros(1)]))
+                low, high = np.nanmin(np.r_[stacked, 0.0]), np.nanmax(np.r_[stacked, 0.0])
+                pad = (high - low) * 0.1 or 1
+                ax.set_ylim(low - pad, high + pad)
+        else:
+            for collection in (self.bodies, self.vol_bars):
+                collection.set_verts([])
+            self.wicks.set_segments([])
+            for _, static, forming in self.overlays.values():
+                set_series(static, [], [])
+                set_series(forming, [], [])
+
+        self.set_last_candle(view[-1:], n - 1)
+
+    def set_last_candle(self, last, x):
+        """Point the forming-candle artists at last (a one-row view, or empty) at position x."""
+        if not len(last):
+            self.last_body.set_verts([])
+            self.last_wick.set_segments([])
+            self.last_vol_bar.set_verts([])
+            return
+
+        bodies, wicks, bars, colors = candle_geometry(
+            [x], last["open"], last["high"], last["low"], last["close"], last["volume"])
+        self.last_body.set_verts(bodies)
+        self.last_body.set_facecolors(colors)
+        self.last_wick.set_segments(wicks)
+        self.last_vol_bar.set_verts(bars)
+        self.last_vol_bar.set_facecolors(colors)
+
+    def draw_animated(self):
+        self.ax_price.draw_artist(self.last_wick)
+        self.ax_price.draw_artist(self.last_body)
+        self.ax_vol.draw_artist(self.last_vol_bar)
+        for ax, _, forming in self.overlays.values():
+            ax.draw_artist(forming)
+
 class ChartPanel:
-    def __init__(self, parent):
+    VISIBLE_CANDLES = 100
+
+    def __init__(self, parent, feed, scheduler, archive, capacity=129_600, worker=False):
         self.parent = parent
+        self.scheduler = scheduler
         self.frame = tk.Frame(parent, bg=DarkTheme.CARD_BG)
         self.visible = False
         self.current_symbol = "btcusdt"
+        self.timeframe = "1m"
 
         padding_frame = tk.Frame(self.frame, bg=DarkTheme.CARD_BG)
         padding_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
@@ -30,120 +247,230 @@ class ChartPanel:
         self.symbol_combo.pack(side=tk.LEFT, padx=5)
         self.symbol_combo.bind("<<ComboboxSelected>>", self.change_symbol)
 
-        self.fig = Figure(figsize=(10, 6), dpi=100, facecolor=DarkTheme.CARD_BG)
-        self.ax_price = self.fig.add_subplot(2, 1, 1, facecolor=DarkTheme.ACCENT)
-        self.ax_vol = self.fig.add_subplot(2, 1, 2, facecolor=DarkTheme.ACCENT)
+        tk.Label(control_frame, text="Timeframe:", font=("Arial", 10, "bold"),
+                bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack(side=tk.LEFT, padx=(15, 5))
+
+        self.timeframe_var = tk.StringVar(value=self.timeframe)
+        self.timeframe_combo = ttk.Combobox(control_frame, textvariable=self.timeframe_var,
+                                            values=list(TIMEFRAMES), state="readonly", width=5)
+        self.timeframe_combo.pack(side=tk.LEFT, padx=5)
+        self.timeframe_combo.bind("<<ComboboxSelected>>", self.change_timeframe)
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=padding_frame)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.configure(bg=DarkTheme.CARD_BG)
+        self.indicator_button = tk.Menubutton(control_frame, text="📈 Indicators",
+                                              bg=DarkTheme.ACCENT, fg=DarkTheme.FG,
+                                              activebackground=DarkTheme.BLUE,
+                                              relief="raised", padx=10, pady=3)
+        self.indicator_button.pack(side=tk.LEFT, padx=15)
+        indicator_menu = tk.Menu(self.indicator_button, tearoff=0,
+                                 bg=DarkTheme.CARD_BG, fg=DarkTheme.FG,
+                                 selectcolor=DarkTheme.FG)
+        self.indicator_vars = {}
+        for name in INDICATORS:
+            var = tk.BooleanVar(value=False)
+            self.indicator_vars[name] = var
+            indicator_menu.add_checkbutton(label=name, variable=var,
+                                           command=lambda n=name: self.toggle_indicator(n))
+        self.indicator_button["menu"] = indicator_menu
 
-        self.times = []
-        self.opens = []
-        self.highs = []
-        self.lows = []
-        self.closes = []
-        self.volumes = []
+        self.panels = []
+        self.background = None
+        self.needs_layout = True
+        self.rasterizer = None
+        if worker:
+            # Rendered in another process and shown as a plain image, so
+            # matplotlib never runs on the Tk thread
+            from components.chart_raster import ChartRasterizer
+            self.figure = None
+            self.photo = tk.PhotoImage(master=padding_frame, width=1, height=1)
+            self.canvas_widget = tk.Label(padding_frame, image=self.photo, bg=DarkTheme.CARD_BG,
+                                          borderwidth=0, highlightthickness=0)
+            self.canvas_widget.bind("<Configure>", self.on_widget_resize)
+            self.rasterizer = ChartRasterizer(scheduler, self.photo)
+        else:
+            self.figure = ChartFigure()
+            self.canvas = FigureCanvasTkAgg(self.figure.fig, master=padding_frame)
+            self.canvas_widget = self.canvas.get_tk_widget()
+            self.canvas_widget.configure(bg=DarkTheme.CARD_BG)
+            self.canvas.mpl_connect("draw_event", self.on_draw)
+            self.canvas.mpl_connect("resize_event", self.on_resize)
 
-        self.streamer = CandleStreamer(self)
+        # Every timeframe is derived locally from the 1m history and stream
+        self.capacity = capacity
+        self.aggregator = TimeframeAggregator(capacity)
+        self.candles = self.aggregator.buffers[self.timeframe]
+        self.indicators = IndicatorEngine(self.candles)
+        self.archive = archive
+        self.backfill_id = 0
+
+        self.streamer = CandleStreamer(self, feed)
 
     def change_symbol(self, event=None):
         """Change the symbol being displayed"""
         new_symbol = self.symbol_var.get()
         if new_symbol != self.current_symbol:
             self.current_symbol = new_symbol
+            self.needs_layout = True
+            self.aggregator.clear()
+            self.indicators.reload()
             self.fetch_initial_data()
             self.draw_chart()
             self.streamer.change_symbol(new_symbol)
 
+    def change_timeframe(self, event=None):
+        """Switch to another locally aggregated timeframe; no network needed."""
+        new_timeframe = self.timeframe_var.get()
+        if new_timeframe != self.timeframe:
+            self.timeframe = new_timeframe
+            self.candles = self.aggregator.buffers[new_timeframe]
+            self.indicators.bind(self.candles)
+            self.needs_layout = True
+            if self.visible:
+                self.draw_chart()
+
+    def toggle_indicator(self, name):
+        if self.indicator_vars[name].get():
+            self.indicators.add(name, INDICATORS[name]())
+        else:
+            self.indicators.remove(name)
+
+        self.layout_axes()
+        self.build_overlays()
+        if self.visible:
+            self.draw_chart()
+
+    def layout_axes(self):
+        """Stack price, volume and one pane per active oscillator."""
+        panels = []
+        for indicator in self.indicators.indicators.values():
+            if indicator.panel != "price" and indicator.panel not in panels:
+                panels.append(indicator.panel)
+        self.panels = panels
+        if self.figure:
+            self.figure.layout(panels)
+        self.needs_layout = True
+
+    def overlay_outputs(self):
+        return [(name, output, indicator.panel)
+                for name, indicator in self.indicators.indicators.items() for output in indicator.outputs]
+
+    def build_overlays(self):
+        if self.figure:
+            self.figure.build_overlays(self.overlay_outputs())
+
     def fetch_initial_data(self):
-        url = "https://api.binance.com/api/v3/klines"
-        params = {"symbol": self.current_symbol.upper(), "interval": "1m", "limit": 100}
-        data = requests.get(url, params=params).json()
+        """Backfill the current symbol on a worker thread; the chart paints when it lands."""
+        self.backfill_id += 1
+        threading.Thread(target=self.backfill, args=(self.backfill_id, self.current_symbol),
+                         daemon=True).start()
 
-        self.times = [c[0] for c in data]
-        self.opens = [float(c[1]) for c in data]
-        self.highs = [float(c[2]) for c in data]
-        self.lows  = [float(c[3]) for c in data]
-        self.closes = [float(c[4]) for c in data]
-        self.volumes = [float(c[5]) for c in data]
+    def backfill(self, backfill_id, symbol):
+        stored = self.archive.read(symbol, "1m", self.capacity)
+        if len(stored):
+            self.scheduler.post((self, "backfill"), self.apply_backfill, backfill_id, stored)
 
-    def update_realtime_candle(self, c):
-        if not self.times:
+        try:
+            self.archive.fill_gaps(symbol, "1m")
+        except Exception as e:
+            print(f"Chart backfill failed for {symbol}: {e}")
             return
+        candles = self.archive.read(symbol, "1m", self.capacity)
+        self.scheduler.post((self, "backfill"), self.apply_backfill, backfill_id, candles)
 
-        if c["time"] == self.times[-1]:
-            self.highs[-1] = c["high"]
-            self.lows[-1] = c["low"]
-            self.closes[-1] = c["close"]
-            self.volumes[-1] = c["volume"]
-        else:
-            self.times.append(c["time"])
-            self.opens.append(c["open"])
-            self.highs.append(c["high"])
-            self.lows.append(c["low"])
-            self.closes.append(c["close"])
-            self.volumes.append(c["volume"])
-
-            self.times = self.times[-100:] 
-            self.opens = self.opens[-100:]
-            self.highs = self.highs[-100:]
-            self.lows = self.lows[-100:]
-            self.closes = self.closes[-100:]
-            self.volumes = self.volumes[-100:]
+    def apply_backfill(self, backfill_id, candles):
+        if backfill_id != self.backfill_id or not len(candles):
+            return
+
+        # Keep live candles that arrived while the request was in flight
+        live = self.aggregator.buffers["1m"].view()
+        newer = live[live["time"] > candles["time"][-1]]
 
+        self.aggregator.load(np.concatenate([candles, newer]))
+        self.indicators.reload()
         if self.visible:
             self.draw_chart()
 
+    def update_realtime_candle(self, c):
+        started = self.aggregator.update(c)
+        if started is None:
+            return
+
+        self.indicators.update(self.timeframe in started)
+        if not self.visible:
+            return
+
+        if self.timeframe in started:
+            self.draw_chart()
+        else:
+            self.draw_last_candle()
+
+    def overlay_values(self, count):
+        """The newest count values of every indicator output."""
+        return {(name, output): self.indicators.values(name, output, count)
+                for name, output, _ in self.overlay_outputs()}
+
     def draw_chart(self):
-        self.ax_price.clear()
-        self.ax_vol.clear()
-
-        self.ax_price.set_facecolor(DarkTheme.ACCENT)
-        self.ax_vol.set_facecolor(DarkTheme.ACCENT)
-
-        for i in range(len(self.closes)):
-            o = self.opens[i]
-            h = self.highs[i]
-            l = self.lows[i]
-            c = self.closes[i]
-
-            color = DarkTheme.GREEN if c >= o else DarkTheme.RED
-            self.ax_price.plot([i, i], [l, h], color=DarkTheme.FG, linewidth=0.5)
-            self.ax_price.add_patch(
-                matplotlib.patches.Rectangle(
-                    (i - 0.3, min(o, c)),
-                    0.6,
-                    abs(o - c) if abs(o - c) > 0 else 0.5,
-                    color=color
-                )
-            )
-
-        self.ax_price.set_title(f"{self.current_symbol.upper()} 1-Minute Candlestick Chart", 
-                               fontsize=12, fontweight='bold', color=DarkTheme.FG)
-        self.ax_price.set_ylabel("Price (USDT)", color=DarkTheme.FG)
-        self.ax_price.tick_params(colors=DarkTheme.FG)
-        self.ax_price.grid(True, alpha=0.2, color=DarkTheme.FG)
-        self.ax_price.set_xticks([])
-        self.ax_price.spines['bottom'].set_color(DarkTheme.BORDER)
-        self.ax_price.spines['top'].set_color(DarkTheme.BORDER)
-        self.ax_price.spines['left'].set_color(DarkTheme.BORDER)
-        self.ax_price.spines['right'].set_color(DarkTheme.BORDER)
-
-        colors = [DarkTheme.GREEN if self.closes[i] >= self.opens[i] else DarkTheme.RED
-                  for i in range(len(self.closes))]
-        self.ax_vol.bar(range(len(self.volumes)), self.volumes, color=colors, width=0.8)
-        self.ax_vol.set_ylabel("Volume", color=DarkTheme.FG)
-        self.ax_vol.tick_params(colors=DarkTheme.FG)
-        self.ax_vol.grid(True, alpha=0.2, color=DarkTheme.FG)
-        self.ax_vol.spines['bottom'].set_color(DarkTheme.BORDER)
-        self.ax_vol.spines['top'].set_color(DarkTheme.BORDER)
-        self.ax_vol.spines['left'].set_color(DarkTheme.BORDER)
-        self.ax_vol.spines['right'].set_color(DarkTheme.BORDER)
-
-        self.fig.tight_layout()
+        """Full redraw; only needed for a new candle, a resize or a symbol change."""
+        title = f"{self.current_symbol.upper()} {TIMEFRAME_TITLES[self.timeframe]} Candlestick Chart"
+        view = self.candles.view(self.VISIBLE_CANDLES)
+        values = self.overlay_values(len(view))
+
+        if self.rasterizer:
+            self.rasterizer.request(title, view, values, self.overlay_outputs(), self.panels)
+            return
+
+        self.figure.update(title, view, values)
+        if self.needs_layout:
+            self.figure.fig.tight_layout()
+            self.needs_layout = False
         self.canvas.draw()
 
+    def draw_last_candle(self):
+        """Blit only the forming candle over the cached background."""
+        if self.rasterizer:
+            # Every worker frame is a full render; a queued one is replaced
+            self.draw_chart()
+            return
+
+        figure = self.figure
+        last = self.candles.view(1)[0]
+        bottom, top = figure.ax_price.get_ylim()
+        if (self.background is None or last["low"] < bottom or last["high"] > top
+                or last["volume"] > figure.ax_vol.get_ylim()[1]):
+            # The candle left the current scale, so the axes must be rebuilt
+            self.draw_chart()
+            return
+
+        n = min(len(self.candles), self.VISIBLE_CANDLES)
+        x = np.arange(n - 2, n) if n > 1 else np.arange(n)
+        for (name, output), (ax, _, forming) in figure.overlays.items():
+            y = self.indicators.values(name, output, len(x))
+            bottom, top = ax.get_ylim()
+            if not np.isnan(y[-1]) and not bottom <= y[-1] <= top:
+                self.draw_chart()
+                return
+            set_series(forming, x, y)
+
+        figure.set_last_candle(self.candles.view(1), n - 1)
+        self.canvas.restore_region(self.background)
+        figure.draw_animated()
+        for ax in (figure.ax_price, figure.ax_vol, *figure.panel_axes.values()):
+            self.canvas.blit(ax.bbox)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.fig.bbox)
+        self.figure.draw_animated()
+
+    def on_resize(self, event):
+        self.background = None
+        self.needs_layout = True
+        if self.visible:
+            self.figure.fig.tight_layout()
+            self.needs_layout = False
+
+    def on_widget_resize(self, event):
+        if self.rasterizer.resize(event.width, event.height) and self.visible:
+            self.draw_chart()
+
     def show(self):
         self.visible = True
         self.fetch_initial_data()
@@ -155,4 +482,9 @@ class ChartPanel:
     def hide(self):
         self.visible = False
         self.streamer.stop()
-        self.frame.pack_forget()
\ No newline at end of file
+        self.frame.pack_forget()
+
+    def close(self):
+        self.streamer.stop()
+        if self.rasterizer:
+            self.rasterizer.close()
\ No newline at end of file
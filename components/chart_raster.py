@@ -0,0 +1,235 @@
+"""Chart rasterization in a worker process.
+
+ChartRasterizer starts one worker with its own ChartFigure on an Agg canvas.
+The Tk thread sends it the visible candles and indicator values; the worker
+renders them and writes the RGBA pixels into a shared-memory frame, which
+the Tk thread copies into a PhotoImage in one step. The Tk thread never
+runs matplotlib, so input stays responsive however long a render takes.
+
+At most one request is in flight. A newer request replaces one still
+waiting to be sent, so a worker that falls behind drops stale frames
+instead of queueing them. A request the worker fails to render is
+reported and skipped; a worker that exits is restarted.
+"""
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+try:
+    # Copies an RGBA array into a PhotoImage; the routine FigureCanvasTkAgg itself draws with
+    from matplotlib.backends._backend_tk import blit
+except ImportError:
+    def blit(photo, pixels, offsets):
+        """Fallback for matplotlib versions without the private helper.
+
+        Hands Tk the pixels as a binary PPM, so alpha is dropped; every
+        frame drawn here is opaque.
+        """
+        height, width = pixels.shape[:2]
+        rgb = np.ascontiguousarray(pixels[..., list(offsets[:3])])
+        photo.tk.call(photo.name, "put", b"P6 %d %d 255\n" % (width, height) + rgb.tobytes(),
+                      "-format", "ppm")
+
+def run_worker(conn, dpi):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from components.chart import ChartFigure
+
+    figure = ChartFigure(dpi=dpi)
+    canvas = FigureCanvasAgg(figure.fig)
+    size = layout = None
+    segment = None
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        started = time.perf_counter()
+
+        try:
+            if segment is None or segment.name != request["segment"]:
+                if segment:
+                    segment.close()
+                    segment = None
+                segment = shared_memory.SharedMemory(request["segment"])
+            needs_layout = False
+            if request["size"] != size:
+                size = request["size"]
+                figure.fig.set_size_inches(size[0] / dpi, size[1] / dpi)
+                needs_layout = True
+            if (request["panels"], request["outputs"]) != layout:
+                layout = request["panels"], request["outputs"]
+                figure.layout(request["panels"])
+                figure.build_overlays(request["outputs"])
+                needs_layout = True
+
+            figure.update(request["title"], request["candles"], request["values"])
+            if needs_layout:
+                figure.fig.tight_layout()
+            canvas.draw()
+            figure.draw_animated()
+
+            pixels = np.asarray(canvas.buffer_rgba())
+            height, width = pixels.shape[:2]
+            frame = np.ndarray(pixels.shape, np.uint8, buffer=segment.buf)
+            frame[...] = pixels
+            del frame
+        except Exception as e:
+            # Every request gets a reply, or the Tk side would wait on it
+            # forever. The figure may be half laid out, so rebuild it next time.
+            size = layout = None
+            conn.send((request["id"], 0, 0, time.perf_counter() - started, repr(e)))
+            continue
+        conn.send((request["id"], width, height, time.perf_counter() - started, None))
+    if segment:
+        segment.close()
+
+class ChartRasterizer:
+    """Renders chart frames in a worker process and shows them in a PhotoImage."""
+
+    DPI = 100
+    # Worker exits survived before the chart stops rendering
+    MAX_RESTARTS = 3
+
+    def __init__(self, scheduler, photo, size=(1000, 600)):
+        self.scheduler = scheduler
+        self.photo = photo
+        self.size = size
+        self.shown_size = None
+        self.segment = None
+        self.next_id = 0
+        self.in_flight = False
+        self.pending = None
+        self.frames = 0
+        self.dropped = 0
+        self.render_seconds = 0.0
+        self.last_sent = None
+        self.restarts = 0
+        self.failed = False
+        self.closed = False
+        self.start_worker()
+
+    def start_worker(self):
+        # spawn, not fork: a forked copy of a process running Tk and feed
+        # threads is not safe to use
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=run_worker, args=(child, self.DPI), daemon=True,
+                                       name="chart-raster")
+        self.process.start()
+        child.close()
+        threading.Thread(target=self.read_replies, args=(self.conn,), daemon=True,
+                         name="chart-raster-replies").start()
+
+    def resize(self, width, height):
+        """True if the frame size changed and the chart should be redrawn."""
+        size = (max(width, 50), max(height, 50))
+        if size == self.size:
+            return False
+        self.size = size
+        return True
+
+    def request(self, title, candles, values, outputs, panels):
+        request = {"title": title, "candles": np.array(candles), "values": values,
+                   "outputs": outputs, "panels": list(panels), "size": self.size}
+        if self.in_flight:
+            if self.pending is not None:
+                self.dropped += 1
+            self.pending = request
+            return
+        self.send(request)
+
+    def send(self, request):
+        if self.closed or self.failed:
+            return
+        width, height = request["size"]
+        # Agg may round the figure up by a pixel in either direction
+        needed = (width + 2) * (height + 2) * 4
+        if self.segment is None or self.segment.size < needed:
+            if self.segment:
+                self.segment.close()
+                self.segment.unlink()
+            self.segment = shared_memory.SharedMemory(create=True, size=needed)
+        self.next_id += 1
+        request["id"] = self.next_id
+        request["segment"] = self.segment.name
+        self.last_sent = request
+        self.in_flight = True
+        try:
+            self.conn.send(request)
+        except (OSError, ValueError) as e:
+            print(f"Chart worker unavailable: {e}")
+            self.in_flight = False
+
+    def read_replies(self, conn):
+        while True:
+            try:
+                reply = conn.recv()
+            except (EOFError, OSError):
+                if not self.closed:
+                    self.scheduler.post((self, "exit"), self.worker_exited, conn)
+                return
+            self.scheduler.post((self, "frame"), self.show_frame, reply)
+
+    def worker_exited(self, conn):
+        if self.closed or conn is not self.conn:
+            return
+        self.in_flight = False
+        conn.close()
+        self.process.join(0.5)
+        if self.restarts >= self.MAX_RESTARTS:
+            print(f"Chart worker exited (code {self.process.exitcode}); giving up after "
+                  f"{self.restarts} restarts")
+            self.failed = True
+            return
+        self.restarts += 1
+        print(f"Chart worker exited (code {self.process.exitcode}); restarting")
+        self.start_worker()
+        # Redraw what was on its way, or the newest frame waiting behind it
+        request, self.pending = self.pending or self.last_sent, None
+        if request is not None:
+            self.send(request)
+
+    def show_frame(self, reply):
+        _, width, height, seconds, error = reply
+        self.in_flight = False
+        if self.closed:
+            return
+        if error:
+            print(f"Chart render failed: {error}")
+            self.send_pending()
+            return
+        self.frames += 1
+        self.render_seconds = seconds
+        if (width, height) != self.shown_size:
+            self.photo.configure(width=width, height=height)
+            self.shown_size = (width, height)
+        frame = np.ndarray((height, width, 4), np.uint8, buffer=self.segment.buf)
+        blit(self.photo, frame, (0, 1, 2, 3))
+        del frame
+        self.send_pending()
+
+    def send_pending(self):
+        pending, self.pending = self.pending, None
+        if pending is not None:
+            self.send(pending)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        if self.segment:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
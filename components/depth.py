@@ -0,0 +1,270 @@
+"""Cumulative depth curves over a scrolling liquidity heatmap.
+
+Every book update is binned into a DepthHistory row on the feed thread.
+Both views are then rendered as whole NumPy arrays: the visible cells are
+picked by index arrays, mapped to colours through lookup tables and copied
+into a PhotoImage in one call, so drawing costs the same however many
+price levels and snapshots are on screen.
+"""
+import time
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+from config.theme import DarkTheme
+from components.chart_raster import blit
+from core.depth_history import DepthHistory
+
+RANGES = {"0.1%": 0.001, "0.25%": 0.0025, "0.5%": 0.005, "1%": 0.01, "2%": 0.02}
+WINDOWS = {"30s": 30, "1m": 60, "2m": 120, "5m": 300}
+
+def rgba(color):
+    return np.array([int(color[i:i + 2], 16) for i in (1, 3, 5)] + [255], dtype=np.uint8)
+
+def packed(colors):
+    """RGBA rows as one uint32 each, so an image is filled with 2-D integer ops."""
+    return np.ascontiguousarray(colors).view(np.uint32).reshape(colors.shape[:-1])
+
+def gradient(color, n=256):
+    """n RGBA colours from the card background to color, on a square-root scale.
+
+    The square root keeps small resting sizes visible next to large walls.
+    """
+    start, end = rgba(DarkTheme.CARD_BG).astype(float), rgba(color).astype(float)
+    t = np.sqrt(np.linspace(0, 1, n))[:, None]
+    return (start + (end - start) * t).round().astype(np.uint8)
+
+# Asks in the first 256 entries, bids in the next: index = intensity + 256 * is_bid
+HEAT_COLORS = packed(np.concatenate([gradient(DarkTheme.RED), gradient(DarkTheme.GREEN)]))
+BLANK = packed(rgba(DarkTheme.CARD_BG))
+MID = packed(rgba(DarkTheme.YELLOW))
+
+def heatmap_pixels(sizes, mids, prices, count, width, height):
+    """RGBA image of sizes (rows of snapshots, one column per price bin).
+
+    Time runs left to right across count rows, the newest at the right
+    edge; price runs bottom to top. Bins below the mid of their snapshot
+    are bids. Intensity is size against the 99th percentile of what is on
+    screen, so a few huge walls do not wash out the rest.
+    """
+    n, levels = sizes.shape
+    rows = np.arange(width) * count // width - (count - n)
+    bins = levels - 1 - np.arange(height) * levels // height
+    filled = rows >= 0
+    rows = np.clip(rows, 0, n - 1)
+
+    cells = sizes.T[np.ix_(bins, rows)]
+    # A strided sample is plenty for the scale and far cheaper to sort
+    sample = cells[::4, ::4]
+    resting = sample[sample > 0]
+    scale = np.percentile(resting, 99) if len(resting) else 1.0
+    index = np.minimum(cells * np.float32(255 / scale), 255).astype(np.uint16)
+    index += (prices[bins][:, None] < mids[rows][None, :]) * np.uint16(256)
+    image = HEAT_COLORS[index]
+    image[:, ~filled] = BLANK
+
+    step = prices[1] - prices[0] if levels > 1 else 1.0
+    mid_y = ((prices[-1] + step - mids[rows]) / (step * levels) * height).astype(np.int64)
+    on_chart = filled & (mid_y >= 0) & (mid_y < height)
+    image[mid_y[on_chart], np.flatnonzero(on_chart)] = MID
+    return image.view(np.uint8).reshape(height, width, 4)
+
+def depth_pixels(sizes, mid, prices, width, height):
+    """RGBA image of cumulative bid (left) and ask (right) size out from mid."""
+    levels = len(sizes)
+    bins = np.arange(width) * levels // width
+    is_bid = prices < mid
+    bid_depth = np.cumsum(np.where(is_bid, sizes, 0)[::-1])[::-1]
+    ask_depth = np.cumsum(np.where(is_bid, 0, sizes))
+    depth = np.where(is_bid[bins], bid_depth[bins], ask_depth[bins])
+    top = max(bid_depth[0], ask_depth[-1]) or 1.0
+    curve = (depth / top * (height - 1)).astype(np.int64)
+
+    side = is_bid[bins].astype(np.intp) * 256
+    fill = HEAT_COLORS[side + 64][None, :]
+    edge = HEAT_COLORS[side + 255][None, :]
+    above = (height - 1 - np.arange(height))[:, None]
+    image = np.where(above < curve[None, :], fill, BLANK)
+    image = np.where(above == curve[None, :], edge, image)
+
+    mid_x = int((mid - prices[0]) / (prices[-1] - prices[0] or 1.0) * width)
+    if 0 <= mid_x < width:
+        image[:, mid_x] = MID
+    return image.view(np.uint8).reshape(height, width, 4)
+
+class DepthPanel:
+    """Depth curves and liquidity heatmap for one symbol's order book."""
+
+    HISTORY_SECONDS = 300
+
+    def __init__(self, parent, feed, scheduler, symbol="btcusdt"):
+        self.parent = parent
+        self.scheduler = scheduler
+        self.symbol = symbol.lower()
+        self.range = RANGES["0.5%"]
+        self.window = WINDOWS["2m"]
+        # The grid spans twice the visible range either side of the mid, so
+        # each range gets the full grid resolution
+        self.history = DepthHistory(capacity=int(self.HISTORY_SECONDS / DepthHistory.INTERVAL),
+                                    span=4 * self.range)
+        self.book = feed.order_book(self.symbol, on_update=self.on_book_update)
+        self.frame = tk.Frame(parent, relief="solid", borderwidth=1,
+                              bg=DarkTheme.CARD_BG, highlightbackground=DarkTheme.BORDER,
+                              highlightthickness=1)
+        self.visible = False
+        self.is_active = False
+        self.render_seconds = 0.0
+
+        padding_frame = tk.Frame(self.frame, bg=DarkTheme.CARD_BG)
+        padding_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        title_frame = tk.Frame(padding_frame, bg=DarkTheme.CARD_BG)
+        title_frame.pack(fill=tk.X)
+
+        tk.Label(title_frame, text="Depth & Liquidity",
+                 font=("Arial", 12, "bold"), bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack()
+
+        self.symbol_var = tk.StringVar(value=symbol)
+        self.symbol_combo = ttk.Combobox(title_frame, textvariable=self.symbol_var,
+                                         values=["btcusdt", "ethusdt", "bnbusdt", "solusdt", "adausdt", "xrpusdt"],
+                                         state="readonly", width=12)
+        self.symbol_combo.pack(pady=5)
+        self.symbol_combo.bind("<<ComboboxSelected>>", self.change_symbol)
+
+        options_frame = tk.Frame(title_frame, bg=DarkTheme.CARD_BG)
+        options_frame.pack()
+
+        tk.Label(options_frame, text="Range:", font=("Arial", 9),
+                 bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack(side=tk.LEFT)
+        self.range_var = tk.StringVar(value="0.5%")
+        self.range_combo = ttk.Combobox(options_frame, textvariable=self.range_var,
+                                        values=list(RANGES), state="readonly", width=5)
+        self.range_combo.pack(side=tk.LEFT, padx=5)
+        self.range_combo.bind("<<ComboboxSelected>>", self.change_range)
+
+        tk.Label(options_frame, text="History:", font=("Arial", 9),
+                 bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack(side=tk.LEFT)
+        self.window_var = tk.StringVar(value="2m")
+        self.window_combo = ttk.Combobox(options_frame, textvariable=self.window_var,
+                                         values=list(WINDOWS), state="readonly", width=4)
+        self.window_combo.pack(side=tk.LEFT, padx=5)
+        self.window_combo.bind("<<ComboboxSelected>>", self.change_window)
+
+        # Both views are plain images sized to their label
+        self.sizes = {}
+        self.shown = {}
+        self.photos = {}
+        self.labels = {}
+        for name, size in (("depth", (400, 150)), ("heatmap", (400, 300))):
+            photo = tk.PhotoImage(master=padding_frame, width=size[0], height=size[1])
+            label = tk.Label(padding_frame, image=photo, bg=DarkTheme.CARD_BG,
+                             borderwidth=0, highlightthickness=0)
+            label.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+            label.bind("<Configure>", lambda event, name=name: self.on_resize(name, event))
+            self.sizes[name] = size
+            self.photos[name] = photo
+            self.labels[name] = label
+
+        self.info_label = tk.Label(padding_frame, text="Waiting for book...", font=("Arial", 9),
+                                   bg=DarkTheme.CARD_BG, fg=DarkTheme.GRAY)
+        self.info_label.pack(pady=(5, 0))
+
+    def change_symbol(self, event=None):
+        new_symbol = self.symbol_var.get()
+        if new_symbol != self.symbol:
+            self.symbol = new_symbol
+            with self.history.lock:
+                self.history.clear()
+            self.book.change_symbol(new_symbol)
+            self.info_label.config(text="Waiting for book...")
+
+    def change_range(self, event=None):
+        value = RANGES[self.range_var.get()]
+        if value == self.range:
+            return
+        # A new price grid; history restarts from the next book update
+        self.range = value
+        with self.history.lock:
+            self.history.clear()
+            self.history.span = 4 * value
+
+    def change_window(self, event=None):
+        self.window = WINDOWS[self.window_var.get()]
+        self.render()
+
+    def on_resize(self, name, event):
+        size = (max(event.width, 50), max(event.height, 50))
+        if size != self.sizes[name]:
+            self.sizes[name] = size
+            self.render()
+
+    def start(self):
+        if self.is_active:
+            return
+        self.is_active = True
+        self.book.start()
+
+    def stop(self):
+        if not self.is_active:
+            return
+        self.is_active = False
+        self.book.stop()
+        with self.history.lock:
+            self.history.clear()
+
+    def on_book_update(self):
+        # Feed thread: sample the book into the history here, so the heatmap
+        # keeps every 100ms update however far the Tk thread falls behind
+        best_bids, best_asks = self.book.top(1)
+        if not best_bids or not best_asks:
+            return
+        # Every level the grid can hold: it reaches at most three quarters of
+        # its span from the mid before recentering. A fixed level count would
+        # stop a few ticks out on liquid pairs and leave the grid's edges empty.
+        mid = (best_bids[0][0] + best_asks[0][0]) / 2
+        span = self.history.span
+        bids, asks = self.book.range(mid * (1 - span), mid * (1 + span))
+        self.history.record(time.monotonic(), bids[::-1], asks)
+        self.scheduler.post(self, self.render)
+
+    def render(self):
+        if not self.is_active:
+            return
+        latest = self.history.latest()
+        if latest is None:
+            return
+        started = time.perf_counter()
+        mid = latest[1]
+        count = int(self.window / DepthHistory.INTERVAL)
+        view = self.history.window(count, mid * (1 - self.range), mid * (1 + self.range))
+        if view is None or view[0].shape[1] < 2:
+            return
+        sizes, mids, prices = view
+
+        width, height = self.sizes["heatmap"]
+        self.paint("heatmap", heatmap_pixels(sizes, mids, prices, count, width, height))
+        width, height = self.sizes["depth"]
+        self.paint("depth", depth_pixels(sizes[-1], mid, prices, width, height))
+
+        step = prices[1] - prices[0]
+        self.info_label.config(text=f"Mid {mid:.2f}  |  {prices[0]:.2f} – {prices[-1] + step:.2f}  |  "
+                                    f"{step:g} per row  |  {len(mids) * DepthHistory.INTERVAL:.0f}s of "
+                                    f"{self.window}s")
+        self.render_seconds = time.perf_counter() - started
+
+    def paint(self, name, pixels):
+        height, width = pixels.shape[:2]
+        photo = self.photos[name]
+        if self.shown.get(name) != (width, height):
+            photo.configure(width=width, height=height)
+            self.shown[name] = (width, height)
+        blit(photo, pixels, (0, 1, 2, 3))
+
+    def show(self):
+        self.visible = True
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        self.start()
+
+    def hide(self):
+        self.visible = False
+        self.stop()
+        self.frame.pack_forget()
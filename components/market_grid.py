@@ -0,0 +1,248 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from config.theme import DarkTheme
+from components.table import RowPool
+
+def format_price(price):
+    if price >= 100:
+        return f"{price:,.2f}"
+    if price >= 1:
+        return f"{price:.4f}"
+    return f"{price:.8f}"
+
+def format_volume(volume):
+    if volume >= 1_000_000_000:
+        return f"{volume / 1_000_000_000:.2f}B"
+    if volume >= 1_000_000:
+        return f"{volume / 1_000_000:.2f}M"
+    if volume >= 1_000:
+        return f"{volume / 1_000:.2f}K"
+    return f"{volume:.2f}"
+
+class MarketGrid:
+    """Every pair quoted in one asset, from the single !miniTicker@arr stream.
+
+    The table is virtualized: only VISIBLE_ROWS Treeview rows exist, kept
+    in a RowPool, and scrolling or sorting just rewrites their text with the
+    slice of the sorted symbol list that is in view. Hundreds of pairs cost
+    the same Tk work as one screenful.
+    """
+
+    STREAM = "!miniTicker@arr"
+    VISIBLE_ROWS = 25
+    COLUMNS = ("Pair", "Price", "Change", "Volume")
+    HEADINGS = {"Pair": "Pair", "Price": "Price", "Change": "24h %", "Volume": "Volume (quote)"}
+
+    def __init__(self, parent, feed, scheduler, universe, quote="USDT", on_select=None):
+        self.parent = parent
+        self.feed = feed
+        self.scheduler = scheduler
+        self.universe = universe
+        self.quote = quote
+        self.on_select = on_select
+        self.visible = False
+        self.is_active = False
+
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.names = {}
+        self.derive_names = False
+        # symbol -> (name, price, change %, quote volume)
+        self.rows = {}
+        self.order = []
+        self.window = []
+        self.offset = 0
+        self.sort_column = "Volume"
+        self.descending = True
+        self.count_text = None
+
+        self.frame = tk.Frame(parent, relief="solid", borderwidth=1,
+                             bg=DarkTheme.CARD_BG, highlightbackground=DarkTheme.BORDER,
+                             highlightthickness=1)
+
+        padding_frame = tk.Frame(self.frame, bg=DarkTheme.CARD_BG)
+        padding_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        title_frame = tk.Frame(padding_frame, bg=DarkTheme.CARD_BG)
+        title_frame.pack(fill=tk.X)
+
+        tk.Label(title_frame, text=f"{quote} Market",
+                font=("Arial", 12, "bold"), bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack()
+
+        options_frame = tk.Frame(title_frame, bg=DarkTheme.CARD_BG)
+        options_frame.pack(pady=5)
+
+        tk.Label(options_frame, text="Filter:", font=("Arial", 9),
+                bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar(value="")
+        self.filter_var.trace_add("write", lambda *args: self.resort())
+        tk.Entry(options_frame, textvariable=self.filter_var, width=10,
+                bg=DarkTheme.ACCENT, fg=DarkTheme.FG, insertbackground=DarkTheme.FG,
+                relief="flat").pack(side=tk.LEFT, padx=5)
+
+        self.count_label = tk.Label(options_frame, text="Loading symbols...", font=("Arial", 9),
+                                    bg=DarkTheme.CARD_BG, fg=DarkTheme.GRAY)
+        self.count_label.pack(side=tk.LEFT, padx=5)
+
+        table_frame = tk.Frame(padding_frame, bg=DarkTheme.CARD_BG)
+        table_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+
+        self.tree = ttk.Treeview(table_frame, columns=self.COLUMNS, show="headings",
+                                 height=self.VISIBLE_ROWS, style="Dark.Treeview", selectmode="none")
+        for column, width in zip(self.COLUMNS, (110, 110, 70, 110)):
+            self.tree.heading(column, text=self.HEADINGS[column],
+                              command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width, anchor=tk.E if column != "Pair" else tk.W)
+        self.tree.tag_configure("up", foreground=DarkTheme.GREEN)
+        self.tree.tag_configure("down", foreground=DarkTheme.RED)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Scrolls the symbol list, not the Treeview: the tree never holds
+        # more rows than fit on screen
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<MouseWheel>", self.on_wheel)
+        self.tree.bind("<Button-4>", self.on_wheel)
+        self.tree.bind("<Button-5>", self.on_wheel)
+        self.tree.bind("<Double-1>", self.on_double_click)
+
+        self.pool = RowPool(self.tree, self.VISIBLE_ROWS)
+        self.update_headings()
+
+    def start(self):
+        if self.is_active:
+            return
+        self.is_active = True
+        if not self.names and not self.derive_names:
+            self.universe.load_async(
+                lambda universe: self.scheduler.post((self, "universe"), self.set_universe))
+        self.feed.subscribe(self.STREAM, self.on_message)
+
+    def stop(self):
+        if not self.is_active:
+            return
+        self.is_active = False
+        self.feed.unsubscribe(self.STREAM, self.on_message)
+
+    def set_universe(self):
+        self.names = {symbol.upper(): name for symbol, name in self.universe.quoted_in(self.quote)}
+        # Without exchangeInfo (offline, no cache) fall back to the symbol suffix
+        self.derive_names = not self.names
+        self.rows = {s: row for s, row in self.rows.items() if self.name_for(s)}
+        self.resort()
+
+    def name_for(self, symbol):
+        name = self.names.get(symbol)
+        if name is None and self.derive_names and symbol.endswith(self.quote):
+            name = self.names[symbol] = f"{symbol[:-len(self.quote)]}/{self.quote}"
+        return name
+
+    def on_message(self, stream, data):
+        if not self.is_active:
+            return
+        # Raw items only; parsing and sorting happen once per frame
+        with self.lock:
+            for item in data:
+                self.pending[item["s"]] = item
+        self.scheduler.post(self, self.refresh)
+
+    def refresh(self):
+        if not self.is_active:
+            return
+        with self.lock:
+            pending, self.pending = self.pending, {}
+
+        for symbol, item in pending.items():
+            name = self.name_for(symbol)
+            if name is None:
+                continue
+            price = float(item["c"])
+            open_price = float(item["o"])
+            change = (price - open_price) / open_price * 100 if open_price else 0.0
+            self.rows[symbol] = (name, price, change, float(item["q"]))
+
+        if pending:
+            self.resort()
+
+    def resort(self):
+        needle = self.filter_var.get().strip().upper()
+        rows = self.rows
+        symbols = [s for s in rows if needle in rows[s][0]] if needle else list(rows)
+        index = self.COLUMNS.index(self.sort_column)
+        symbols.sort(key=lambda s: rows[s][index], reverse=self.descending)
+        self.order = symbols
+        self.render()
+
+    def render(self):
+        self.offset = max(0, min(self.offset, len(self.order) - self.VISIBLE_ROWS))
+        self.window = self.order[self.offset:self.offset + self.VISIBLE_ROWS]
+
+        values, tags = [], []
+        for symbol in self.window:
+            name, price, change, volume = self.rows[symbol]
+            values.append((name, format_price(price), f"{change:+.2f}%", format_volume(volume)))
+            tags.append(("up",) if change >= 0 else ("down",))
+        self.pool.set_rows(values, tags)
+
+        total = len(self.order)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.VISIBLE_ROWS) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        count_text = f"{total} pairs" if self.rows else "Waiting for data..."
+        if count_text != self.count_text:
+            self.count_text = count_text
+            self.count_label.config(text=count_text)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.order) - self.VISIBLE_ROWS))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.order)))
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self.offset + (-3 if up else 3))
+        return "break"
+
+    def on_double_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if iid in self.pool.items and self.on_select:
+            index = self.pool.items.index(iid)
+            if index < len(self.window):
+                self.on_select(self.window[index].lower())
+
+    def sort_by(self, column):
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = column != "Pair"
+        self.update_headings()
+        self.offset = 0
+        self.resort()
+
+    def update_headings(self):
+        for column in self.COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if column == self.sort_column else ""
+            self.tree.heading(column, text=self.HEADINGS[column] + arrow)
+
+    def show(self):
+        self.visible = True
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        self.start()
+
+    def hide(self):
+        self.visible = False
+        self.stop()
+        self.frame.pack_forget()
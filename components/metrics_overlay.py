@@ -0,0 +1,94 @@
+import tkinter as tk
+from config.theme import DarkTheme
+from core.metrics import STAGES, percentile
+
+class MetricsOverlay:
+    """One-line latency/throughput summary for the control bar.
+
+    Percentiles cover only the samples since the previous refresh, so the
+    numbers describe how the dashboard is doing now rather than since start.
+    Clicking the line opens a per-stream breakdown.
+    """
+
+    def __init__(self, parent, metrics):
+        self.metrics = metrics
+        self.previous = {}
+        self.detail = None
+        self.detail_label = None
+
+        self.label = tk.Label(parent, text="", font=("Consolas", 9), cursor="hand2",
+                              bg=DarkTheme.CARD_BG, fg=DarkTheme.GRAY)
+        self.label.bind("<Button-1>", self.toggle_detail)
+
+    def pack(self, **kwargs):
+        self.label.pack(**kwargs)
+
+    def window(self, snapshot):
+        """Per-stream bucket counts accumulated since the last refresh."""
+        windows = {}
+        for stream, values in snapshot["streams"].items():
+            old = self.previous.get(stream, {})
+            windows[stream] = {
+                stage: [new - prev for new, prev in zip(counts, old.get(stage, [0] * len(counts)))]
+                for stage, (counts, total) in values["stages"].items()
+            }
+        self.previous = {stream: {stage: counts for stage, (counts, total) in values["stages"].items()}
+                         for stream, values in snapshot["streams"].items()}
+        return windows
+
+    @staticmethod
+    def ms(value):
+        if value is None:
+            return "--"
+        return f"{value:.2f}" if value < 1 else f"{value:.0f}"
+
+    def refresh(self):
+        snapshot = self.metrics.snapshot()
+        windows = self.window(snapshot)
+
+        merged = {stage: None for stage in STAGES}
+        for stages in windows.values():
+            for stage, counts in stages.items():
+                merged[stage] = counts if merged[stage] is None else [a + b for a, b in zip(merged[stage], counts)]
+        merged = {stage: counts or [0] for stage, counts in merged.items()}
+
+        streams = snapshot["streams"].values()
+        rate = sum(s["rate"] for s in streams)
+        dropped = sum(s["dropped"] for s in streams)
+        end_to_end = merged["end_to_end"]
+
+        self.label.config(
+            text=f"e2e p50 {self.ms(percentile(end_to_end, 50))} / p99 {self.ms(percentile(end_to_end, 99))} ms"
+                 f" · net {self.ms(percentile(merged['network'], 90))}"
+                 f" · parse {self.ms(percentile(merged['parse'], 90))}"
+                 f" · render {self.ms(percentile(merged['render'], 90))}"
+                 f" | {rate} msg/s | {dropped} dropped | {snapshot['reconnects']} reconnects"
+        )
+
+        if self.detail is not None:
+            self.detail_label.config(text=self.detail_text(snapshot, windows))
+
+    def detail_text(self, snapshot, windows):
+        lines = [f"{'stream':<26}{'msg/s':>6}{'net':>7}{'parse':>7}{'render':>8}{'e2e':>7}"
+                 f"{'coal':>8}{'drop':>7}",
+                 "p90 latency in ms over the last refresh"]
+        for stream in sorted(snapshot["streams"]):
+            values = snapshot["streams"][stream]
+            p90 = {stage: self.ms(percentile(counts, 90)) for stage, counts in windows[stream].items()}
+            lines.append(f"{stream:<26}{values['rate']:>6}{p90['network']:>7}{p90['parse']:>7}"
+                         f"{p90['render']:>8}{p90['end_to_end']:>7}{values['coalesced']:>8}{values['dropped']:>7}")
+        return "\n".join(lines)
+
+    def toggle_detail(self, event=None):
+        if self.detail is not None:
+            self.detail.destroy()
+            self.detail = None
+            return
+
+        self.detail = tk.Toplevel(self.label)
+        self.detail.title("Stream Metrics")
+        self.detail.configure(bg=DarkTheme.BG)
+        self.detail.protocol("WM_DELETE_WINDOW", self.toggle_detail)
+        self.detail_label = tk.Label(self.detail, text="", justify=tk.LEFT, font=("Consolas", 9),
+                                     bg=DarkTheme.BG, fg=DarkTheme.FG)
+        self.detail_label.pack(padx=10, pady=10)
@@ -1,19 +1,26 @@
 import tkinter as tk
 from tkinter import ttk
-import websocket
-import json
-import threading
 from config.theme import DarkTheme
+from components.table import RowPool
+
+def format_levels(levels):
+    return [(f"{price:.2f}", f"{amount:.4f}", f"{price * amount:.2f}") for price, amount in levels]
 
 class OrderBookPanel:
-    def __init__(self, parent, symbol="btcusdt"):
+    DEPTHS = ["10", "20", "50"]
+    GROUPINGS = ["None", "0.01", "0.1", "1", "10"]
+
+    def __init__(self, parent, feed, scheduler, symbol="btcusdt"):
         self.parent = parent
+        self.scheduler = scheduler
         self.symbol = symbol.lower()
+        self.depth = 10
+        self.tick = None
+        self.book = feed.order_book(self.symbol, on_update=self.on_book_update)
         self.frame = tk.Frame(parent, relief="solid", borderwidth=1, 
                              bg=DarkTheme.CARD_BG, highlightbackground=DarkTheme.BORDER,
                              highlightthickness=1)
         self.visible = False
-        self.ws = None
         self.is_active = False
 
         # Add padding
@@ -34,19 +41,25 @@ class OrderBookPanel:
         self.symbol_combo.pack(pady=5)
         self.symbol_combo.bind("<<ComboboxSelected>>", self.change_symbol)
 
-        # Create style for dark treeview
-        style = ttk.Style()
-        style.theme_use('default')
-        style.configure("Dark.Treeview",
-                       background=DarkTheme.ACCENT,
-                       foreground=DarkTheme.FG,
-                       fieldbackground=DarkTheme.ACCENT,
-                       borderwidth=0)
-        style.configure("Dark.Treeview.Heading",
-                       background=DarkTheme.CARD_BG,
-                       foreground=DarkTheme.FG,
-                       borderwidth=1)
-        style.map('Dark.Treeview', background=[('selected', DarkTheme.BLUE)])
+        # Depth and price-level grouping
+        options_frame = tk.Frame(title_frame, bg=DarkTheme.CARD_BG)
+        options_frame.pack()
+
+        tk.Label(options_frame, text="Depth:", font=("Arial", 9),
+                bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack(side=tk.LEFT)
+        self.depth_var = tk.StringVar(value=str(self.depth))
+        self.depth_combo = ttk.Combobox(options_frame, textvariable=self.depth_var,
+                                        values=self.DEPTHS, state="readonly", width=4)
+        self.depth_combo.pack(side=tk.LEFT, padx=5)
+        self.depth_combo.bind("<<ComboboxSelected>>", self.change_depth)
+
+        tk.Label(options_frame, text="Group:", font=("Arial", 9),
+                bg=DarkTheme.CARD_BG, fg=DarkTheme.FG).pack(side=tk.LEFT)
+        self.group_var = tk.StringVar(value="None")
+        self.group_combo = ttk.Combobox(options_frame, textvariable=self.group_var,
+                                        values=self.GROUPINGS, state="readonly", width=5)
+        self.group_combo.pack(side=tk.LEFT, padx=5)
+        self.group_combo.bind("<<ComboboxSelected>>", self.change_grouping)
 
         # Create treeview for order book
         columns = ("Price", "Amount", "Total")
@@ -73,66 +86,72 @@ class OrderBookPanel:
             self.bids_tree.column(col, width=100)
         self.bids_tree.pack()
 
+        # Last session's book, shown grey until the live book replaces it
+        for tree in (self.asks_tree, self.bids_tree):
+            tree.tag_configure("stale", foreground=DarkTheme.GRAY)
+
+        self.ask_rows = RowPool(self.asks_tree, self.depth)
+        self.bid_rows = RowPool(self.bids_tree, self.depth)
+
     def change_symbol(self, event=None):
         new_symbol = self.symbol_var.get()
         if new_symbol != self.symbol:
             self.symbol = new_symbol
-            if self.is_active:
-                self.stop()
-                self.start()
+            self.book.change_symbol(new_symbol)
+            self.clear_display()
+
+    def change_depth(self, event=None):
+        self.depth = int(self.depth_var.get())
+        self.asks_tree.configure(height=self.depth)
+        self.bids_tree.configure(height=self.depth)
+        self.ask_rows.resize(self.depth)
+        self.bid_rows.resize(self.depth)
+        self.update_display()
+
+    def change_grouping(self, event=None):
+        value = self.group_var.get()
+        self.tick = None if value == "None" else float(value)
+        self.update_display()
 
     def start(self):
         if self.is_active:
             return
         self.is_active = True
-
-        ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol}@depth10@100ms"
-
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=self.on_message,
-            on_error=lambda ws, err: print(f"OrderBook error:", err),
-            on_close=lambda ws, s, m: print(f"OrderBook closed"),
-            on_open=lambda ws: print(f"OrderBook connected: {self.symbol}")
-        )
-        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+        self.book.start()
 
     def stop(self):
-        self.is_active = False
-        if self.ws:
-            self.ws.close()
-            self.ws = None
-
-    def on_message(self, ws, message):
         if not self.is_active:
             return
+        self.is_active = False
+        self.book.stop()
 
-        data = json.loads(message)
-        bids = data["bids"][:10]  
-        asks = data["asks"][:10]  
+    def on_book_update(self):
+        # Called on the feed thread after every applied diff; the scheduler
+        # collapses these into one redraw per frame.
+        self.scheduler.post(self, self.update_display)
 
-        self.parent.after(0, self.update_display, bids, asks)
+    def clear_display(self):
+        self.ask_rows.clear()
+        self.bid_rows.clear()
 
-    def update_display(self, bids, asks):
+    def update_display(self):
         if not self.is_active:
             return
 
-        for item in self.asks_tree.get_children():
-            self.asks_tree.delete(item)
-        for item in self.bids_tree.get_children():
-            self.bids_tree.delete(item)
-
-        for ask in reversed(asks):
-            price = float(ask[0])
-            amount = float(ask[1])
-            total = price * amount
-            self.asks_tree.insert("", 0, values=(f"{price:.2f}", f"{amount:.4f}", f"{total:.2f}"))
-
-        for bid in bids:
-            price = float(bid[0])
-            amount = float(bid[1])
-            total = price * amount
-            self.bids_tree.insert("", tk.END, values=(f"{price:.2f}", f"{amount:.4f}", f"{total:.2f}"))
+        bids, asks = self.book.top(self.depth, self.tick)
+        self.ask_rows.set_rows(format_levels(asks))
+        self.bid_rows.set_rows(format_levels(bids))
+
+    def levels(self, n=50):
+        """(bids, asks) for the snapshot, or None until the book has synced."""
+        if not self.book.synced:
+            return None
+        return self.book.top(n)
+
+    def show_snapshot(self, bids, asks):
+        stale = [("stale",)] * self.depth
+        self.ask_rows.set_rows(format_levels(asks[:self.depth]), stale)
+        self.bid_rows.set_rows(format_levels(bids[:self.depth]), stale)
 
     def show(self):
         self.visible = True
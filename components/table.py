@@ -0,0 +1,52 @@
+import tkinter as tk
+
+class RowPool:
+    """A fixed set of Treeview rows that are rewritten in place.
+
+    Rows are inserted once and then updated with item()/set(); cells whose
+    formatted text did not change are skipped, so a steady book costs almost
+    no Tcl calls per refresh.
+    """
+
+    def __init__(self, tree, size):
+        self.tree = tree
+        self.columns = tree["columns"]
+        self.blank = ("",) * len(self.columns)
+        self.items = []
+        self.values = []
+        self.tags = []
+        self.resize(size)
+
+    def resize(self, size):
+        while len(self.items) < size:
+            self.items.append(self.tree.insert("", tk.END, values=self.blank))
+            self.values.append(self.blank)
+            self.tags.append(())
+        if len(self.items) > size:
+            self.tree.delete(*self.items[size:])
+            del self.items[size:], self.values[size:], self.tags[size:]
+
+    def clear(self):
+        self.set_rows([])
+
+    def set_rows(self, rows, tags=None):
+        """Show rows (tuples of formatted cell text) from the top; blank the rest."""
+        for i, iid in enumerate(self.items):
+            values = rows[i] if i < len(rows) else self.blank
+            row_tags = tags[i] if tags and i < len(rows) else ()
+            old = self.values[i]
+
+            if row_tags != self.tags[i]:
+                self.tree.item(iid, values=values, tags=row_tags)
+            elif values != old:
+                changed = [c for c, new, prev in zip(self.columns, values, old) if new != prev]
+                if len(changed) == 1:
+                    column = changed[0]
+                    self.tree.set(iid, column, values[self.columns.index(column)])
+                else:
+                    self.tree.item(iid, values=values)
+            else:
+                continue
+
+            self.values[i] = values
+            self.tags[i] = row_tags
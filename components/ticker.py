@@ -1,16 +1,66 @@
+import time
 import tkinter as tk
-import websocket
-import json
-import threading
 from config.theme import DarkTheme
+from core.decoding import SCHEMAS
+from core import metrics, startup
+from core.feed import LIVE, STALE
+
+TICKER_FIELDS = SCHEMAS["ticker"]
+SNAPSHOT_FIELDS = SCHEMAS["ticker_24hr"]
+
+class WidgetState:
+    """Last options sent to a widget; config() is only called for values that changed."""
+
+    def __init__(self, widget, **options):
+        self.widget = widget
+        self.options = options
+
+    def set(self, **options):
+        changed = {k: v for k, v in options.items() if self.options.get(k) != v}
+        if changed:
+            self.options.update(changed)
+            self.widget.config(**changed)
+        return bool(changed)
+
+def format_volume(volume):
+    if volume >= 1_000_000:
+        return f"{volume/1_000_000:.2f}M"
+    if volume >= 1_000:
+        return f"{volume/1_000:.2f}K"
+    return f"{volume:.2f}"
 
 class CryptoTicker:
-    def __init__(self, parent, symbol, display_name):
+    """Price card for one symbol's @ticker stream.
+
+    Rendering goes through WidgetState, so an update only reaches Tk for the
+    fields whose text or colour changed, and at most MAX_RATE times a second
+    per card. Price ticks flash the price background for FLASH_SECONDS; the
+    fade and any throttled update are finished from the scheduler's frame
+    tick rather than per-message after() timers. show_snapshot() paints
+    last session's values as stale until live data arrives.
+    """
+
+    MAX_RATE = 4
+    FLASH_SECONDS = 0.3
+
+    def __init__(self, parent, feed, scheduler, symbol, display_name):
         self.parent = parent
+        self.feed = feed
+        self.scheduler = scheduler
         self.symbol = symbol.lower()
         self.display_name = display_name
         self.is_active = False
-        self.ws = None
+        self.stale = False
+        self.last_render = 0.0
+        self.deferred = None
+        # Metrics samples of the deferred update, reported when it is shown
+        self.deferred_samples = []
+        self.last_price = None
+        self.flash_until = 0.0
+        self.animating = False
+        # Raw fields last rendered, and whether they came from last session
+        self.fields = None
+        self.snapshot = False
 
         self.frame = tk.Frame(parent, relief="solid", borderwidth=1, 
                              bg=DarkTheme.CARD_BG, highlightbackground=DarkTheme.BORDER,
@@ -46,70 +96,134 @@ class CryptoTicker:
                                        bg=DarkTheme.CARD_BG, fg=DarkTheme.FG)
         self.high_low_label.pack()
 
+        self.border = WidgetState(self.frame, highlightbackground=DarkTheme.BORDER)
+        self.title = WidgetState(self.title_label, text=display_name, fg=DarkTheme.FG)
+        self.price = WidgetState(self.price_label, text="--,---", fg=DarkTheme.FG, bg=DarkTheme.CARD_BG)
+        self.change = WidgetState(self.change_label, text="--", fg=DarkTheme.FG)
+        self.volume = WidgetState(self.volume_label, text="Vol: --")
+        self.high_low = WidgetState(self.high_low_label, text="H: -- | L: --")
+
     def start(self):
-        """Start WebSocket streaming."""
+        """Subscribe to the ticker stream."""
         if self.is_active:
             return
 
         self.is_active = True
-        ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol}@ticker"
-
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=self.on_message,
-            on_error=lambda ws, err: print(f"{self.symbol} error:", err),
-            on_close=lambda ws, s, m: print(f"{self.symbol} closed"),
-            on_open=lambda ws: print(f"{self.symbol} connected"),
-        )
-
-        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+        self.feed.watch(f"{self.symbol}@ticker", self.on_status)
+        self.feed.subscribe(f"{self.symbol}@ticker", self.on_message)
 
     def stop(self):
-        """Stop WebSocket connection."""
+        """Unsubscribe from the ticker stream."""
+        if not self.is_active:
+            return
         self.is_active = False
-        if self.ws:
-            self.ws.close()
-            self.ws = None
+        self.feed.unsubscribe(f"{self.symbol}@ticker", self.on_message)
+        self.feed.unwatch(f"{self.symbol}@ticker", self.on_status)
 
-    def on_message(self, ws, message):
+    def on_message(self, stream, data):
         if not self.is_active:
             return
 
-        data = json.loads(message)
-        price = float(data["c"])
-        change = float(data["p"])
-        percent = float(data["P"])
-        volume = float(data["v"])
-        high = float(data["h"])
-        low = float(data["l"])
+        # Raw strings; converted only if this update is the one rendered
+        self.scheduler.post(self, self.update_display, *TICKER_FIELDS(data))
 
-        self.parent.after(
-            0, self.update_display, price, change, percent, volume, high, low
-        )
+    def seed(self, snapshot):
+        """Paint a REST 24hr ticker row; @ticker only pushes once a second."""
+        self.scheduler.post((self, "seed"), self.apply_seed, *SNAPSHOT_FIELDS(snapshot))
+
+    def apply_seed(self, *fields):
+        # The stream got there first; its data is newer
+        if self.is_active and (self.last_price is None or self.snapshot):
+            self.render(time.monotonic(), *fields)
+
+    def show_snapshot(self, fields):
+        """Paint last session's values, marked stale until live data replaces them."""
+        self.render(0.0, *fields, live=False)
+        self.snapshot = True
+        self.set_stale(True)
 
-    def update_display(self, price, change, percent, volume, high, low):
+    def on_status(self, stream, status):
+        if status in (STALE, LIVE):
+            self.scheduler.post((self, "stale"), self.set_stale, status == STALE)
+
+    def set_stale(self, stale):
+        """Grey out the card while its stream is silent; the next update recolors the price."""
+        if stale == self.stale:
+            return
+        self.stale = stale
+        if stale:
+            self.title.set(text=f"{self.display_name} · stale", fg=DarkTheme.ORANGE)
+            self.border.set(highlightbackground=DarkTheme.ORANGE)
+            self.flash_until = 0.0
+            self.price.set(fg=DarkTheme.GRAY, bg=DarkTheme.CARD_BG)
+            self.change.set(fg=DarkTheme.GRAY)
+        else:
+            self.title.set(text=self.display_name, fg=DarkTheme.FG)
+            self.border.set(highlightbackground=DarkTheme.BORDER)
+
+    def update_display(self, *fields):
         if not self.is_active:
             return
 
-        color = DarkTheme.GREEN if change >= 0 else DarkTheme.RED
-        self.price_label.config(text=f"{price:,.2f}", fg=color, bg=DarkTheme.CARD_BG)
+        now = time.monotonic()
+        if now - self.last_render < 1 / self.MAX_RATE:
+            # Keep only the newest; the frame tick renders it once the interval is up
+            metrics.registry.coalesced(self.deferred_samples)
+            self.deferred = fields
+            self.deferred_samples = self.scheduler.hold()
+            self.start_animation()
+            return
+        self.render(now, *fields)
+
+    def render(self, now, price, change, percent, volume, high, low, live=True):
+        if live and self.snapshot:
+            self.snapshot = False
+            self.set_stale(False)
+        self.last_render = now
+        self.deferred = None
+        # A deferred update replaced by newer fields is never shown
+        metrics.registry.coalesced(self.deferred_samples)
+        self.deferred_samples = []
+        self.fields = (price, change, percent, volume, high, low)
+
+        price, change, percent = float(price), float(change), float(percent)
+        volume, high, low = float(volume), float(high), float(low)
 
+        color = DarkTheme.GREEN if change >= 0 else DarkTheme.RED
         sign = "+" if change >= 0 else ""
-        self.change_label.config(
-            text=f"{sign}{change:,.2f} ({sign}{percent:.2f}%)",
-            foreground=color,
-            background=DarkTheme.CARD_BG
-        )
-
-        if volume >= 1_000_000:
-            vol_str = f"{volume/1_000_000:.2f}M"
-        elif volume >= 1_000:
-            vol_str = f"{volume/1_000:.2f}K"
-        else:
-            vol_str = f"{volume:.2f}"
-        
-        self.volume_label.config(text=f"Vol: {vol_str} USDT", bg=DarkTheme.CARD_BG)
-        self.high_low_label.config(text=f"H: {high:,.2f} | L: {low:,.2f}", bg=DarkTheme.CARD_BG)
+        bg = self.price.options["bg"]
+        if self.last_price is not None and price != self.last_price:
+            bg = DarkTheme.FLASH_UP if price > self.last_price else DarkTheme.FLASH_DOWN
+            self.flash_until = now + self.FLASH_SECONDS
+            self.start_animation()
+        self.last_price = price
+
+        self.price.set(text=f"{price:,.2f}", fg=color, bg=bg)
+        self.change.set(text=f"{sign}{change:,.2f} ({sign}{percent:.2f}%)", fg=color)
+        self.volume.set(text=f"Vol: {format_volume(volume)} USDT")
+        self.high_low.set(text=f"H: {high:,.2f} | L: {low:,.2f}")
+        if live and not startup.timer.painted:
+            startup.timer.first_paint()
+
+    def start_animation(self):
+        if not self.animating:
+            self.animating = True
+            self.scheduler.animate(self, self.animate)
+
+    def animate(self, now):
+        """Frame-tick step: end an expired flash, render a throttled update."""
+        if not self.is_active:
+            self.animating = False
+            return False
+        if self.flash_until and now >= self.flash_until:
+            self.flash_until = 0.0
+            self.price.set(bg=DarkTheme.CARD_BG)
+        if self.deferred is not None and now - self.last_render >= 1 / self.MAX_RATE:
+            samples, self.deferred_samples = self.deferred_samples, []
+            self.render(now, *self.deferred)
+            metrics.registry.rendered(samples)
+        self.animating = bool(self.flash_until or self.deferred is not None)
+        return self.animating
 
     def pack(self, **kwargs):
         self.frame.pack(**kwargs)
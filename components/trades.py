@@ -1,20 +1,23 @@
 import tkinter as tk
 from tkinter import ttk
-import websocket
-import json
-import threading
-from datetime import datetime
+from collections import deque
 from config.theme import DarkTheme
+from core.decoding import SCHEMAS, SecondClock
+
+TRADE_FIELDS = SCHEMAS["trade"]
 
 class RecentTradesPanel:
-    def __init__(self, parent, symbol="btcusdt"):
+    MAX_ROWS = 100
+
+    def __init__(self, parent, feed, scheduler, symbol="btcusdt"):
         self.parent = parent
+        self.feed = feed
+        self.scheduler = scheduler
         self.symbol = symbol.lower()
         self.frame = tk.Frame(parent, relief="solid", borderwidth=1,
                              bg=DarkTheme.CARD_BG, highlightbackground=DarkTheme.BORDER,
                              highlightthickness=1)
         self.visible = False
-        self.ws = None
         self.is_active = False
 
         padding_frame = tk.Frame(self.frame, bg=DarkTheme.CARD_BG)
@@ -53,68 +56,73 @@ class RecentTradesPanel:
         # Configure tags for colors
         self.trades_tree.tag_configure('buy', foreground=DarkTheme.GREEN)
         self.trades_tree.tag_configure('sell', foreground=DarkTheme.RED)
+        self.trades_tree.tag_configure('stale', foreground=DarkTheme.GRAY)
+
+        # Row ids, newest first, so trimming never has to ask Tk for children
+        self.trade_items = deque()
+        # The same trades as raw tuples, oldest first, for the snapshot
+        self.recent = deque(maxlen=self.MAX_ROWS)
+        self.clock = SecondClock()
 
     def change_symbol(self, event=None):
         new_symbol = self.symbol_var.get()
         if new_symbol != self.symbol:
+            was_active = self.is_active
+            self.stop()
             self.symbol = new_symbol
-            for item in self.trades_tree.get_children():
-                self.trades_tree.delete(item)
-            if self.is_active:
-                self.stop()
+            if self.trade_items:
+                self.trades_tree.delete(*self.trade_items)
+                self.trade_items.clear()
+            self.recent.clear()
+            if was_active:
                 self.start()
 
     def start(self):
         if self.is_active:
             return
         self.is_active = True
-
-        ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol}@trade"
-
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=self.on_message,
-            on_error=lambda ws, err: print(f"Trades error:", err),
-            on_close=lambda ws, s, m: print(f"Trades closed"),
-            on_open=lambda ws: print(f"Trades connected: {self.symbol}")
-        )
-        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+        self.feed.subscribe(f"{self.symbol}@trade", self.on_message)
 
     def stop(self):
-        self.is_active = False
-        if self.ws:
-            self.ws.close()
-            self.ws = None
-
-    def on_message(self, ws, message):
         if not self.is_active:
             return
+        self.is_active = False
+        self.feed.unsubscribe(f"{self.symbol}@trade", self.on_message)
 
-        data = json.loads(message)
-        trade = {
-            'time': datetime.fromtimestamp(data['T'] / 1000).strftime('%H:%M:%S'),
-            'price': float(data['p']),
-            'amount': float(data['q']),
-            'is_buyer_maker': data['m']
-        }
+    def on_message(self, stream, data):
+        # Frames already in flight for the previous symbol are dropped
+        if not self.is_active or not stream.startswith(self.symbol + "@"):
+            return
 
-        self.parent.after(0, self.add_trade, trade)
+        # (time ms, price, amount, is_buyer_maker), formatted in add_trades
+        self.scheduler.append(self, self.add_trades, TRADE_FIELDS(data))
 
-    def add_trade(self, trade):
+    def add_trades(self, trades):
         if not self.is_active:
             return
-
-        trade_type = "SELL" if trade['is_buyer_maker'] else "BUY"
-        tag = 'sell' if trade['is_buyer_maker'] else 'buy'
-
-        self.trades_tree.insert("", 0, 
-            values=(trade['time'], f"{trade['price']:.2f}", 
-                   f"{trade['amount']:.4f}", trade_type),
-            tags=(tag,))
-
-        children = self.trades_tree.get_children()
-        if len(children) > 100:
-            self.trades_tree.delete(children[-1])
+        self.insert_trades(trades)
+
+    def show_snapshot(self, trades):
+        """Last session's trades in grey; live ones push them out from the top."""
+        self.insert_trades(trades, stale=True)
+
+    def insert_trades(self, trades, stale=False):
+        # Only the newest MAX_ROWS can survive the trim below
+        trades = trades[-self.MAX_ROWS:]
+        self.recent.extend(trades)
+        for trade_time, price, amount, is_buyer_maker in trades:
+            trade_type = "SELL" if is_buyer_maker else "BUY"
+            tag = 'stale' if stale else 'sell' if is_buyer_maker else 'buy'
+
+            item = self.trades_tree.insert("", 0, 
+                values=(self.clock(trade_time), f"{float(price):.2f}", 
+                       f"{float(amount):.4f}", trade_type),
+                tags=(tag,))
+            self.trade_items.appendleft(item)
+
+        overflow = len(self.trade_items) - self.MAX_ROWS
+        if overflow > 0:
+            self.trades_tree.delete(*[self.trade_items.pop() for _ in range(overflow)])
 
     def show(self):
         self.visible = True
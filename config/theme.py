@@ -1,3 +1,5 @@
+from tkinter import ttk
+
 class DarkTheme:
     BG = "#1a1a1a"
     FG = "#e0e0e0"
@@ -6,4 +8,26 @@ class DarkTheme:
     GREEN = "#00ff88"
     RED = "#ff4444"
     BLUE = "#4488ff"
-    BORDER = "#404040"
\ No newline at end of file
+    BORDER = "#404040"
+    YELLOW = "#ffcc00"
+    ORANGE = "#ff8844"
+    PURPLE = "#cc88ff"
+    CYAN = "#00ddff"
+    GRAY = "#888888"
+    FLASH_UP = "#1e4a36"
+    FLASH_DOWN = "#4a1e24"
+
+def apply_styles():
+    """ttk styles shared by the panels (Dark.Treeview); call once after creating the root."""
+    style = ttk.Style()
+    style.theme_use('default')
+    style.configure("Dark.Treeview",
+                   background=DarkTheme.ACCENT,
+                   foreground=DarkTheme.FG,
+                   fieldbackground=DarkTheme.ACCENT,
+                   borderwidth=0)
+    style.configure("Dark.Treeview.Heading",
+                   background=DarkTheme.CARD_BG,
+                   foreground=DarkTheme.FG,
+                   borderwidth=1)
+    style.map('Dark.Treeview', background=[('selected', DarkTheme.BLUE)])
@@ -0,0 +1,307 @@
+"""Feed engine that runs all socket I/O on one asyncio event-loop thread.
+
+AsyncFeed is a drop-in BinanceFeed: components subscribe, watch and get
+callbacks exactly as before, from the loop thread instead of a
+websocket-client thread, and hand widget work to the Tk thread through
+RenderScheduler as they already do. The supervisor runs as a loop timer,
+not a thread, and each connection is a task that is cancelled when it is
+replaced or the feed closes. The process keeps one feed thread however
+often the socket reconnects, and close() joins it.
+
+    python main.py --engine asyncio
+
+WebSocket is a small RFC 6455 client on asyncio streams, enough for
+Binance's combined stream: text frames, fragmentation, ping/pong and close.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+from core.feed import BinanceFeed
+
+CONTINUATION, TEXT, BINARY, CLOSE, PING, PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+HANDSHAKE_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+def mask(payload, key):
+    """XOR payload with the repeated 4-byte key, as one big-integer operation."""
+    if not payload:
+        return payload
+    n = len(payload)
+    repeated = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(n, "big")
+
+class WebSocket:
+    """Client side of one websocket connection. Use from the loop thread only."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_pong = time.monotonic()
+
+    @classmethod
+    async def connect(cls, url, timeout=10):
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        port = parts.port or (443 if secure else 80)
+        context = ssl.create_default_context() if secure else None
+        # Depth snapshots and !miniTicker@arr frames exceed the default 64 KiB limit
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=context, limit=2**22), timeout)
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        writer.write((f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                      f"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+            lines = head.decode("latin-1").split("\r\n")
+            status = lines[0].split(" ", 2)
+            if len(status) < 2 or status[1] != "101":
+                raise ConnectionError(f"handshake rejected: {lines[0]}")
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            expected = base64.b64encode(hashlib.sha1((key + HANDSHAKE_GUID).encode()).digest()).decode()
+            if headers.get("sec-websocket-accept") != expected:
+                raise ConnectionError("handshake failed: bad Sec-WebSocket-Accept")
+        except BaseException:
+            writer.transport.abort()
+            raise
+        return cls(reader, writer)
+
+    async def recv(self):
+        """The next text (str) or binary (bytes) message; raises ConnectionError once closed."""
+        read = self.reader.readexactly
+        parts = []
+        kind = TEXT
+        while True:
+            head = await read(2)
+            opcode = head[0] & 0x0F
+            length = head[1] & 0x7F
+            if length == 126:
+                length = int.from_bytes(await read(2), "big")
+            elif length == 127:
+                length = int.from_bytes(await read(8), "big")
+            key = await read(4) if head[1] & 0x80 else None
+            payload = await read(length) if length else b""
+            if key:
+                payload = mask(payload, key)
+
+            if opcode == PING:
+                self.send_frame(PONG, payload)
+            elif opcode == PONG:
+                self.last_pong = time.monotonic()
+            elif opcode == CLOSE:
+                self.send_frame(CLOSE, payload[:2])
+                raise ConnectionError("closed by server")
+            else:
+                if opcode != CONTINUATION:
+                    kind = opcode
+                    parts = []
+                parts.append(payload)
+                if head[0] & 0x80:
+                    message = b"".join(parts)
+                    return message.decode() if kind == TEXT else message
+
+    def send_frame(self, opcode, payload=b""):
+        header = bytearray([0x80 | opcode])
+        n = len(payload)
+        if n < 126:
+            header.append(0x80 | n)
+        elif n < 2**16:
+            header.append(0x80 | 126)
+            header += n.to_bytes(2, "big")
+        else:
+            header.append(0x80 | 127)
+            header += n.to_bytes(8, "big")
+        key = os.urandom(4)
+        self.writer.write(bytes(header) + key + mask(payload, key))
+
+    def send(self, text):
+        self.send_frame(TEXT, text.encode())
+
+    def ping(self):
+        self.send_frame(PING)
+
+    def abort(self):
+        """Drop the connection at once; a pending recv() fails."""
+        self.writer.transport.abort()
+
+    async def close(self):
+        try:
+            self.send_frame(CLOSE, (1000).to_bytes(2, "big"))
+            await self.writer.drain()
+        except (OSError, RuntimeError):
+            pass
+        self.abort()
+
+class AsyncFeed(BinanceFeed):
+    """BinanceFeed on a single event-loop thread.
+
+    The supervisor keeps its reconnect, staleness and rate-limiting logic;
+    step() is called from a loop timer every CHECK_INTERVAL and straight
+    after a SUBSCRIBE/UNSUBSCRIBE is queued.
+    """
+
+    CONNECT_TIMEOUT = 10
+    CLOSE_TIMEOUT = 2.0
+
+    def __init__(self, recorder=None):
+        super().__init__(recorder)
+        self.loop = None
+        self.thread = None
+        self.task = None
+        self.socket = None
+        self.timer = None
+
+    def start_loop(self):
+        if self.thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.run_loop, daemon=True, name="feed-loop")
+        self.thread.start()
+        self.loop.call_soon_threadsafe(self.supervise)
+
+    def run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.close()
+
+    def supervise(self):
+        self.supervisor.step()
+        self.timer = self.loop.call_later(self.supervisor.CHECK_INTERVAL, self.supervise)
+
+    def connect(self):
+        url = self.stream_url()
+        self.closing = False
+        # Like ReplayFeed, the feed itself stands in for the websocket
+        self.ws = self
+        self.start_loop()
+        self.loop.call_soon_threadsafe(self.start_task, url)
+
+    def start_task(self, url):
+        if self.task:
+            self.task.cancel()
+        self.task = self.loop.create_task(self.run_connection(url))
+
+    async def run_connection(self, url):
+        socket = heartbeat = None
+        try:
+            socket = await WebSocket.connect(url, self.CONNECT_TIMEOUT)
+            self.socket = socket
+            self.on_open(None)
+            heartbeat = self.loop.create_task(self.heartbeat(socket))
+            while True:
+                message = await socket.recv()
+                try:
+                    self.on_message(self, message)
+                except Exception as e:
+                    print("Feed error:", e)
+        except asyncio.IncompleteReadError:
+            print("Feed error: connection lost")
+        except Exception as e:
+            # Network errors, timeouts and malformed frames (a text frame that
+            # is not UTF-8) all end this connection; cancellation does not
+            # land here, as CancelledError is not an Exception
+            print("Feed error:", e or type(e).__name__)
+        finally:
+            if heartbeat:
+                heartbeat.cancel()
+            if socket:
+                socket.abort()
+            if self.socket is socket:
+                self.socket = None
+
+        # A cancelled task never gets here; this connection ended on its own
+        if self.task is not asyncio.current_task() or self.closing:
+            return
+        self.task = None
+        self.connection_ended()
+
+    def connection_ended(self):
+        """Mark every stream stale and have the supervisor reconnect."""
+        if self.connected:
+            self.on_close(self, None, None)
+        self.connected = False
+        self.supervisor.connection_lost()
+        self.ws = None
+        with self.lock:
+            streams = list(self.subscribers)
+        for stream in streams:
+            self.mark_stale(stream)
+
+    async def heartbeat(self, socket):
+        while True:
+            await asyncio.sleep(self.PING_INTERVAL)
+            sent = time.monotonic()
+            socket.ping()
+            await asyncio.sleep(self.PING_TIMEOUT)
+            if socket.last_pong < sent:
+                print(f"Feed missed pong for {self.PING_TIMEOUT}s, reconnecting")
+                socket.abort()
+                return
+
+    def send(self, method, streams):
+        super().send(method, streams)
+        if self.connected and streams:
+            # Flush now rather than at the next supervision pass
+            self.loop.call_soon_threadsafe(self.supervisor.step)
+
+    def transmit(self, method, streams):
+        self.request_id += 1
+        payload = json.dumps({"method": method, "params": streams, "id": self.request_id})
+        self.loop.call_soon_threadsafe(self.write, payload)
+
+    def write(self, payload):
+        socket = self.socket
+        if socket:
+            socket.send(payload)
+
+    def drop(self):
+        """Close the socket without shutting down; the supervisor reconnects."""
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.abort)
+
+    def abort(self):
+        if self.socket:
+            self.socket.abort()
+        elif self.ws is not None and not self.closing and (self.task is None or self.task.done()):
+            # No connection is left to fail on its own, so fail over now
+            self.task = None
+            self.connection_ended()
+
+    async def shutdown(self):
+        if self.timer:
+            self.timer.cancel()
+        socket, task = self.socket, self.task
+        self.task = None
+        if socket:
+            await socket.close()
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def close(self):
+        self.closing = True
+        self.supervisor.stop()
+        self.ws = None
+        self.connected = False
+        if self.thread:
+            try:
+                asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result(self.CLOSE_TIMEOUT)
+            except Exception as e:
+                print(f"Feed shutdown incomplete: {e!r}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(self.CLOSE_TIMEOUT)
+            self.thread = None
+        if self.recorder:
+            self.recorder.close()
@@ -1,19 +1,58 @@
 import tkinter as tk
-from config.theme import DarkTheme
+import json
+import threading
+from config.theme import DarkTheme, apply_styles
 from core.preferences import PreferencesManager
+from core.feed import BinanceFeed
+from core.scheduler import RenderScheduler
+from core.candle_archive import CandleArchive
+from core.universe import SymbolUniverse
+from core.snapshot import SnapshotStore
+from core.http import get_json
+from core import metrics, startup
 from components.ticker import CryptoTicker
-from components.chart import ChartPanel
-from components.orderbook import OrderBookPanel
-from components.trades import RecentTradesPanel
+from components.metrics_overlay import MetricsOverlay
+
+# Panels are built on first show; the chart's module pulls in matplotlib
+PANELS = (
+    ("chart", "Chart"),
+    ("orderbook", "OrderBook"),
+    ("depth", "Depth"),
+    ("trades", "Trades"),
+    ("market", "Market"),
+)
 
 class DashboardApp:
-    def __init__(self, root):
+    # Panels restored from preferences wait for the first price (or this long)
+    RESTORE_DELAY_MS = 3000
+
+    def __init__(self, root, fps=30, feed=None, archive=None, diagnostics=False, snapshots=None,
+                 chart_worker=False):
         self.root = root
         self.root.title("Binance Real-Time Dashboard")
         self.root.geometry("1400x900")
         self.root.configure(bg=DarkTheme.BG)
+        apply_styles()
 
         self.prefs = PreferencesManager()
+        self.feed = feed or BinanceFeed()
+        self.scheduler = RenderScheduler(root, fps)
+        self.scheduler.start()
+        self.archive = archive or CandleArchive()
+        self.chart_worker = chart_worker
+        self.universe = SymbolUniverse()
+        self.snapshots = snapshots or SnapshotStore()
+        self.last_snapshot = self.snapshots.load()
+
+        self.watchdog = None
+        self.profiler = None
+        if diagnostics:
+            from core.diagnostics import LagWatchdog, SamplingProfiler
+            self.watchdog = LagWatchdog(root)
+            self.scheduler.monitor = self.watchdog
+            self.watchdog.start()
+            self.profiler = SamplingProfiler()
+            root.bind_all("<F12>", self.toggle_profiler)
 
         self.available_cryptos = [
             ("btcusdt", "BTC/USDT"),
@@ -55,6 +94,13 @@ class DashboardApp:
                                        relief="raised", padx=10, pady=5)
         self.orderbook_btn.pack(side=tk.LEFT, padx=5)
 
+        self.depth_btn = tk.Button(control_inner, text="🌊 Depth",
+                                   command=self.toggle_depth,
+                                   bg=DarkTheme.ACCENT, fg=DarkTheme.FG,
+                                   activebackground=DarkTheme.BLUE,
+                                   relief="raised", padx=10, pady=5)
+        self.depth_btn.pack(side=tk.LEFT, padx=5)
+
         self.trades_btn = tk.Button(control_inner, text="💱 Trades", 
                                     command=self.toggle_trades,
                                     bg=DarkTheme.ACCENT, fg=DarkTheme.FG,
@@ -62,10 +108,20 @@ class DashboardApp:
                                     relief="raised", padx=10, pady=5)
         self.trades_btn.pack(side=tk.LEFT, padx=5)
 
+        self.market_btn = tk.Button(control_inner, text="🌐 Market", 
+                                    command=self.toggle_market,
+                                    bg=DarkTheme.ACCENT, fg=DarkTheme.FG,
+                                    activebackground=DarkTheme.BLUE,
+                                    relief="raised", padx=10, pady=5)
+        self.market_btn.pack(side=tk.LEFT, padx=5)
+
         self.status_label = tk.Label(control_inner, text="Status: Active", 
                                      font=("Arial", 10), bg=DarkTheme.CARD_BG, fg=DarkTheme.FG)
         self.status_label.pack(side=tk.RIGHT, padx=10)
 
+        self.metrics_overlay = MetricsOverlay(control_inner, metrics.registry)
+        self.metrics_overlay.pack(side=tk.RIGHT, padx=10)
+
         ticker_control = tk.Frame(main_container, bg=DarkTheme.CARD_BG,
                                  relief="solid", borderwidth=1,
                                  highlightbackground=DarkTheme.BORDER,
@@ -102,20 +158,78 @@ class DashboardApp:
 
         self.chart_container = tk.Frame(self.data_container, bg=DarkTheme.BG)
         self.orderbook_container = tk.Frame(self.data_container, bg=DarkTheme.BG)
+        self.depth_container = tk.Frame(self.data_container, bg=DarkTheme.BG)
         self.trades_container = tk.Frame(self.data_container, bg=DarkTheme.BG)
+        self.market_container = tk.Frame(self.data_container, bg=DarkTheme.BG)
 
-        self.chart = ChartPanel(self.chart_container)
-        self.orderbook = OrderBookPanel(self.orderbook_container)
-        self.trades = RecentTradesPanel(self.trades_container)
+        self.chart = None
+        self.orderbook = None
+        self.depth = None
+        self.trades = None
+        self.market = None
+        self.selected_symbol = None
+        self.panels_restored = False
 
         self.update_tickers()
+        startup.timer.mark("widgets built")
 
-        if self.prefs.prefs['chart_visible']:
-            self.toggle_chart()
-        if self.prefs.prefs['orderbook_visible']:
-            self.toggle_orderbook()
-        if self.prefs.prefs['trades_visible']:
-            self.toggle_trades()
+        # Ticker cards first: building a restored chart imports matplotlib,
+        # which would otherwise hold up the first price
+        startup.timer.when_painted(self.restore_panels)
+        self.root.after(self.RESTORE_DELAY_MS, self.restore_panels)
+
+        self.refresh_status()
+        self.backfill_archive()
+        self.root.after(self.snapshots.INTERVAL * 1000, self.save_snapshot)
+
+    def panel(self, name):
+        """The named panel, constructing it (and importing its module) on first use."""
+        panel = getattr(self, name)
+        if panel is not None:
+            return panel
+
+        if name == "chart":
+            from components.chart import ChartPanel
+            panel = ChartPanel(self.chart_container, self.feed, self.scheduler, self.archive,
+                               worker=self.chart_worker)
+        elif name == "orderbook":
+            from components.orderbook import OrderBookPanel
+            panel = OrderBookPanel(self.orderbook_container, self.feed, self.scheduler)
+        elif name == "depth":
+            from components.depth import DepthPanel
+            panel = DepthPanel(self.depth_container, self.feed, self.scheduler)
+        elif name == "trades":
+            from components.trades import RecentTradesPanel
+            panel = RecentTradesPanel(self.trades_container, self.feed, self.scheduler)
+        else:
+            from components.market_grid import MarketGrid
+            panel = MarketGrid(self.market_container, self.feed, self.scheduler, self.universe,
+                               on_select=self.select_symbol)
+        setattr(self, name, panel)
+        startup.timer.mark(f"{name} panel built")
+
+        if self.selected_symbol and name != "market":
+            panel.symbol_var.set(self.selected_symbol)
+            panel.change_symbol()
+
+        # Chart candles come from the archive; the market grid fills within a second
+        saved = self.last_snapshot.get(name) if name in ("orderbook", "trades") else None
+        if saved and saved["symbol"] == panel.symbol:
+            if name == "orderbook":
+                panel.show_snapshot(saved["bids"], saved["asks"])
+            else:
+                panel.show_snapshot(saved["trades"])
+        return panel
+
+    def restore_panels(self):
+        """Reopen the panels that were visible last session."""
+        if self.panels_restored:
+            return
+        self.panels_restored = True
+        for name, _ in PANELS:
+            panel = getattr(self, name)
+            if self.prefs.prefs.get(f"{name}_visible") and not (panel and panel.visible):
+                getattr(self, f"toggle_{name}")()
 
     def update_tickers(self):
         visible = [symbol for symbol, var in self.ticker_vars.items() if var.get()]
@@ -126,25 +240,88 @@ class DashboardApp:
                 self.tickers[symbol].hide()
                 del self.tickers[symbol]
 
+        added = []
         for symbol in visible:
             if symbol not in self.tickers:
                 display_name = next(name for s, name in self.available_cryptos if s == symbol)
-                ticker = CryptoTicker(self.ticker_frame, symbol, display_name)
+                ticker = CryptoTicker(self.ticker_frame, self.feed, self.scheduler,
+                                      symbol, display_name)
                 ticker.pack(side=tk.LEFT, padx=10, pady=5)
+                fields = self.last_snapshot.get("tickers", {}).get(symbol)
+                if fields:
+                    ticker.show_snapshot(fields)
                 ticker.start()
                 self.tickers[symbol] = ticker
+                added.append(symbol)
+        self.seed_tickers(added)
 
         self.prefs.prefs['visible_tickers'] = visible
         self.prefs.save()
 
+    def seed_tickers(self, symbols):
+        """Fill new cards from one REST 24hr ticker call instead of waiting for the stream."""
+        if not symbols:
+            return
+
+        def run():
+            try:
+                rows = get_json("/api/v3/ticker/24hr",
+                                {"symbols": json.dumps([s.upper() for s in symbols], separators=(",", ":"))})
+            except Exception as e:
+                print(f"Ticker snapshot failed: {e}")
+                return
+            for row in rows:
+                ticker = self.tickers.get(row["symbol"].lower())
+                if ticker:
+                    ticker.seed(row)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def collect_snapshot(self):
+        """Last-known values of everything shown, merged over the previous snapshot."""
+        snapshot = dict(self.last_snapshot)
+        tickers = dict(snapshot.get("tickers", {}))
+        for symbol, ticker in self.tickers.items():
+            if ticker.fields:
+                tickers[symbol] = ticker.fields
+        snapshot["tickers"] = tickers
+
+        levels = self.orderbook.levels() if self.orderbook else None
+        if levels:
+            snapshot["orderbook"] = {"symbol": self.orderbook.symbol, "bids": levels[0], "asks": levels[1]}
+        if self.trades and self.trades.recent:
+            snapshot["trades"] = {"symbol": self.trades.symbol, "trades": list(self.trades.recent)}
+
+        self.last_snapshot = snapshot
+        return snapshot
+
+    def save_snapshot(self):
+        self.snapshots.save_async(self.collect_snapshot())
+        self.root.after(self.snapshots.INTERVAL * 1000, self.save_snapshot)
+
+    def backfill_archive(self):
+        """Close history gaps for every watched symbol in the background."""
+        symbols = list(self.tickers)
+        if self.chart and self.chart.current_symbol not in symbols:
+            symbols.append(self.chart.current_symbol)
+
+        def run():
+            for symbol in symbols:
+                try:
+                    self.archive.fill_gaps(symbol, "1m")
+                except Exception as e:
+                    print(f"Archive backfill failed for {symbol}: {e}")
+
+        threading.Thread(target=run, daemon=True).start()
+
     def toggle_chart(self):
-        if self.chart.visible:
+        if self.chart and self.chart.visible:
             self.chart.hide()
             self.chart_container.pack_forget()
             self.chart_btn.config(text="📊 Chart")
         else:
             self.chart_container.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-            self.chart.show()
+            self.panel("chart").show()
             self.chart_btn.config(text="📊 Chart ✓")
         
         self.prefs.prefs['chart_visible'] = self.chart.visible
@@ -152,57 +329,123 @@ class DashboardApp:
         self.update_status()
 
     def toggle_orderbook(self):
-        if self.orderbook.visible:
+        if self.orderbook and self.orderbook.visible:
             self.orderbook.hide()
             self.orderbook_container.pack_forget()
             self.orderbook_btn.config(text="📖 Order Book")
         else:
             self.orderbook_container.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-            self.orderbook.show()
+            self.panel("orderbook").show()
             self.orderbook_btn.config(text="📖 Order Book ✓")
         
         self.prefs.prefs['orderbook_visible'] = self.orderbook.visible
         self.prefs.save()
         self.update_status()
 
+    def toggle_depth(self):
+        if self.depth and self.depth.visible:
+            self.depth.hide()
+            self.depth_container.pack_forget()
+            self.depth_btn.config(text="🌊 Depth")
+        else:
+            self.depth_container.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+            self.panel("depth").show()
+            self.depth_btn.config(text="🌊 Depth ✓")
+
+        self.prefs.prefs['depth_visible'] = self.depth.visible
+        self.prefs.save()
+        self.update_status()
+
     def toggle_trades(self):
-        if self.trades.visible:
+        if self.trades and self.trades.visible:
             self.trades.hide()
             self.trades_container.pack_forget()
             self.trades_btn.config(text="💱 Trades")
         else:
             self.trades_container.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
-            self.trades.show()
+            self.panel("trades").show()
             self.trades_btn.config(text="💱 Trades ✓")
         
         self.prefs.prefs['trades_visible'] = self.trades.visible
         self.prefs.save()
         self.update_status()
 
+    def toggle_market(self):
+        if self.market and self.market.visible:
+            self.market.hide()
+            self.market_container.pack_forget()
+            self.market_btn.config(text="🌐 Market")
+        else:
+            self.market_container.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+            self.panel("market").show()
+            self.market_btn.config(text="🌐 Market ✓")
+
+        self.prefs.prefs['market_visible'] = self.market.visible
+        self.prefs.save()
+        self.update_status()
+
+    def select_symbol(self, symbol):
+        """Point the chart, order book, depth and trades panels at symbol (double-click in the market grid)."""
+        self.selected_symbol = symbol
+        for panel in (self.chart, self.orderbook, self.depth, self.trades):
+            if panel:
+                panel.symbol_var.set(symbol)
+                panel.change_symbol()
+
     def update_status(self):
         active_panels = []
-        if self.chart.visible:
-            active_panels.append("Chart")
-        if self.orderbook.visible:
-            active_panels.append("OrderBook")
-        if self.trades.visible:
-            active_panels.append("Trades")
+        for name, title in PANELS:
+            panel = getattr(self, name)
+            if panel and panel.visible:
+                active_panels.append(title)
         
         status = f"Active: {len(self.tickers)} Tickers"
         if active_panels:
             status += f" | {', '.join(active_panels)}"
+        status += f" | {self.scheduler.coalesced} coalesced"
+        if self.feed.reconnecting:
+            status += " | ⚠ Reconnecting"
+        elif self.feed.stale:
+            status += f" | ⚠ {len(self.feed.stale)} stale"
+        if self.profiler and self.profiler.running:
+            status += " | ● Profiling"
         
         self.status_label.config(text=status)
 
+    def refresh_status(self):
+        self.update_status()
+        self.metrics_overlay.refresh()
+        self.root.after(1000, self.refresh_status)
+
+    def toggle_profiler(self, event=None):
+        """F12 in diagnostics mode: sample all threads for 10s (F12 again stops early)."""
+        if self.profiler.running:
+            self.profiler.stop()
+        else:
+            print("Profiling all threads for 10s...")
+            self.profiler.start(10)
+        self.update_status()
+
     def on_closing(self):
         print("Shutting down dashboard...")
         
         for ticker in self.tickers.values():
             ticker.stop()
+
+        self.snapshots.save(self.collect_snapshot())
         
-        self.chart.streamer.stop()
-        self.orderbook.stop()
-        self.trades.stop()
+        if self.chart:
+            self.chart.close()
+        for panel in (self.orderbook, self.depth, self.trades, self.market):
+            if panel:
+                panel.stop()
+        self.feed.close()
+        self.scheduler.stop()
+        if self.watchdog:
+            self.watchdog.stop()
+            print(self.watchdog.report())
+        if self.profiler and self.profiler.running:
+            self.profiler.stop()
         
         self.prefs.save()
         
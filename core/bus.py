@@ -0,0 +1,410 @@
+"""Local feed bus: one Binance connection shared over a Unix socket.
+
+A headless daemon owns the BinanceFeed (with its supervisor, so reconnects
+and staleness work as in the dashboard) and serves any number of local
+clients. Dashboards use RemoteFeed in place of BinanceFeed; scripts use
+BusClient and get typed events from core.events.
+
+    python -m core.bus --socket /tmp/binance-feed.sock
+    python main.py --bus /tmp/binance-feed.sock
+
+The protocol is newline-delimited JSON. Clients send
+{"op": "subscribe" | "unsubscribe", "streams": [...]} and optionally
+{"op": "format", "format": "events"}. The server sends
+{"stream", "data"} frames in Binance's combined-stream shape (or
+{"stream", "event"} in events format), plus {"stream", "status"} when a
+stream goes stale, comes back or resyncs.
+"""
+import argparse
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from collections import deque
+from core import decoding, events, metrics
+from core.feed import BinanceFeed, LIVE, STALE, stream_name
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "binance-feed.sock")
+
+class BusHandler(socketserver.StreamRequestHandler):
+    """One client connection: commands are read here, frames written by a writer thread."""
+
+    # Lines queued for a client that stopped reading before it is dropped
+    MAX_PENDING = 20_000
+
+    def setup(self):
+        super().setup()
+        self.format = "raw"
+        self.streams = set()
+        self.outbox = deque()
+        self.ready = threading.Condition()
+        self.closed = False
+        threading.Thread(target=self.write_loop, daemon=True, name="bus-writer").start()
+
+    def handle(self):
+        bus = self.server.bus
+        for line in self.rfile:
+            try:
+                command = decoding.loads(line)
+                op = command.get("op")
+                if op == "subscribe":
+                    bus.attach(self, command["streams"])
+                elif op == "unsubscribe":
+                    bus.detach(self, command["streams"])
+                elif op == "format":
+                    self.format = "events" if command.get("format") == "events" else "raw"
+            except Exception as e:
+                print(f"Feed bus: bad command from client: {e}")
+
+    def finish(self):
+        self.close()
+        self.server.bus.detach(self, list(self.streams))
+        super().finish()
+
+    def push(self, line):
+        with self.ready:
+            if self.closed:
+                return
+            if len(self.outbox) >= self.MAX_PENDING:
+                print("Feed bus: client is not reading, disconnecting it")
+                self.close()
+                return
+            self.outbox.append(line)
+            self.ready.notify()
+
+    def close(self):
+        with self.ready:
+            if self.closed:
+                return
+            self.closed = True
+            self.ready.notify()
+        try:
+            self.request.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def write_loop(self):
+        while True:
+            with self.ready:
+                while not self.outbox and not self.closed:
+                    self.ready.wait()
+                if self.closed:
+                    return
+                lines, self.outbox = self.outbox, deque()
+            try:
+                self.request.sendall(b"".join(lines))
+            except OSError:
+                self.close()
+                return
+
+class FeedServer:
+    """Publishes a feed's streams to local clients over a Unix socket.
+
+    The feed is subscribed once per stream however many clients want it,
+    and each frame is encoded once per format, not once per client.
+    """
+
+    def __init__(self, feed, path=DEFAULT_SOCKET):
+        self.feed = feed
+        self.path = path
+        self.lock = threading.Lock()
+        self.clients = {}
+        self.server = None
+
+    def start(self):
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                # Left behind by a daemon that did not shut down cleanly
+                os.unlink(self.path)
+            else:
+                raise RuntimeError(f"a feed bus is already listening on {self.path}")
+            finally:
+                probe.close()
+        self.server = socketserver.ThreadingUnixStreamServer(self.path, BusHandler)
+        self.server.daemon_threads = True
+        self.server.bus = self
+        os.chmod(self.path, 0o600)
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="feed-bus").start()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def attach(self, client, streams):
+        for stream in streams:
+            stream = stream_name(stream)
+            if stream in client.streams:
+                continue
+            client.streams.add(stream)
+            with self.lock:
+                clients = self.clients.setdefault(stream, [])
+                first = not clients
+                clients.append(client)
+            if first:
+                self.feed.watch(stream, self.on_status)
+                self.feed.subscribe(stream, self.on_data)
+            elif stream in self.feed.stale:
+                client.push(decoding.dumps({"stream": stream, "status": STALE}) + b"\n")
+
+    def detach(self, client, streams):
+        for stream in streams:
+            stream = stream_name(stream)
+            if stream not in client.streams:
+                continue
+            client.streams.discard(stream)
+            with self.lock:
+                clients = self.clients.get(stream, [])
+                if client in clients:
+                    clients.remove(client)
+                last = not clients
+                if last:
+                    self.clients.pop(stream, None)
+            if last:
+                self.feed.unsubscribe(stream, self.on_data)
+                self.feed.unwatch(stream, self.on_status)
+
+    def on_data(self, stream, data):
+        with self.lock:
+            clients = list(self.clients.get(stream, ()))
+        raw = typed = None
+        for client in clients:
+            if client.format == "events":
+                if typed is None:
+                    event = events.normalize(stream, data)
+                    typed = b"" if event is None else \
+                        decoding.dumps({"stream": stream, "event": events.to_dict(event)}) + b"\n"
+                if typed:
+                    client.push(typed)
+            else:
+                if raw is None:
+                    raw = decoding.dumps({"stream": stream, "data": data}) + b"\n"
+                client.push(raw)
+
+    def on_status(self, stream, status):
+        line = decoding.dumps({"stream": stream, "status": status}) + b"\n"
+        with self.lock:
+            clients = list(self.clients.get(stream, ()))
+        for client in clients:
+            client.push(line)
+
+class RemoteFeed(BinanceFeed):
+    """BinanceFeed that reads from a FeedServer instead of Binance.
+
+    Components subscribe and watch exactly as with a direct feed. The
+    daemon's supervisor reports stale and resynced streams, which are
+    passed on to watchers here. If the daemon goes away, every stream is
+    marked stale and the connection is retried until it comes back.
+    """
+
+    supervised = False
+    RETRY_SECONDS = 2.0
+
+    def __init__(self, path=DEFAULT_SOCKET, recorder=None):
+        super().__init__(recorder)
+        self.path = path
+        self.sock = None
+        self.retrying = False
+        self.send_lock = threading.Lock()
+
+    @property
+    def reconnecting(self):
+        return self.retrying
+
+    def connect(self):
+        # Like ReplayFeed, the feed itself stands in for the websocket
+        self.ws = self
+        self.closing = False
+        threading.Thread(target=self.run_socket, daemon=True, name="feed-bus-client").start()
+
+    def run_socket(self):
+        while not self.closing:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError as e:
+                sock.close()
+                if not self.retrying:
+                    print(f"Feed bus {self.path} unavailable ({e}), retrying")
+                    self.retrying = True
+                time.sleep(self.RETRY_SECONDS)
+                continue
+
+            self.sock = sock
+            self.retrying = False
+            # Everything subscribed so far is requested once connected
+            self.url_streams = set()
+            self.on_open(None)
+            try:
+                for line in sock.makefile("rb"):
+                    try:
+                        self.on_line(line)
+                    except Exception as e:
+                        # A malformed line is skipped; the connection stays up
+                        print(f"Feed bus bad frame: {e!r}")
+            except OSError:
+                pass
+
+            self.sock = None
+            self.connected = False
+            sock.close()
+            if self.closing:
+                return
+            metrics.registry.disconnected()
+            print("Feed bus connection lost, retrying")
+            self.retrying = True
+            with self.lock:
+                streams = list(self.subscribers)
+            for stream in streams:
+                self.mark_stale(stream)
+
+    def on_line(self, line):
+        received = time.time()
+        frame = decoding.loads(line)
+        status = frame.get("status")
+        if status is None:
+            if self.recorder:
+                self.recorder.record_frame(line.decode().rstrip("\n"))
+            self.route(frame, received, time.time())
+            return
+
+        stream = frame["stream"]
+        if status == STALE:
+            self.mark_stale(stream)
+        elif status == LIVE:
+            with self.lock:
+                if stream not in self.stale:
+                    return
+                self.stale.discard(stream)
+            self.notify(stream, LIVE)
+        else:
+            self.notify(stream, status)
+
+    def send(self, method, streams):
+        if not self.connected or not streams:
+            return
+        self.transmit(method, streams)
+
+    def transmit(self, method, streams):
+        sock = self.sock
+        if sock is None:
+            return
+        try:
+            with self.send_lock:
+                sock.sendall(decoding.dumps({"op": method.lower(), "streams": streams}) + b"\n")
+        except OSError as e:
+            print(f"Feed bus {method} failed: {e}")
+
+    def close(self):
+        self.closing = True
+        self.connected = False
+        self.ws = None
+        sock = self.sock
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self.recorder:
+            self.recorder.close()
+
+class BusClient:
+    """Typed events from a running feed bus, for scripts.
+
+        with BusClient() as bus:
+            bus.subscribe("btcusdt@trade", "ethusdt@ticker")
+            for stream, event in bus.events():
+                print(stream, event)
+
+    Events are core.events tuples. A status change arrives as
+    events.Status; !miniTicker@arr gives a list of MiniTicker.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.send({"op": "format", "format": "events"})
+
+    def send(self, command):
+        self.sock.sendall(decoding.dumps(command) + b"\n")
+
+    def subscribe(self, *streams):
+        self.send({"op": "subscribe", "streams": list(streams)})
+
+    def unsubscribe(self, *streams):
+        self.send({"op": "unsubscribe", "streams": list(streams)})
+
+    def events(self):
+        for line in self.sock.makefile("rb"):
+            frame = decoding.loads(line)
+            if "status" in frame:
+                yield frame["stream"], events.Status(frame["stream"], frame["status"])
+            elif frame.get("event") is not None:
+                yield frame["stream"], events.from_dict(frame["event"])
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Binance feed shared over a Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path to listen on")
+    parser.add_argument("--url", default=BinanceFeed.BASE_URL,
+                        help="combined-stream websocket URL (e.g. a local bench.server)")
+    parser.add_argument("--engine", choices=("threads", "asyncio"), default="threads",
+                        help="feed I/O on websocket-client threads or on one asyncio event loop")
+    parser.add_argument("--record", metavar="DIR",
+                        help="record every raw frame to a session file in DIR")
+    parser.add_argument("--metrics", metavar="FILE", nargs="?", const="feed.prom",
+                        help="rewrite stream metrics to FILE in Prometheus text format every 10s")
+    args = parser.parse_args()
+    BinanceFeed.BASE_URL = args.url
+
+    recorder = None
+    if args.record:
+        from core.recorder import FrameRecorder
+        recorder = FrameRecorder(args.record)
+    if args.engine == "asyncio":
+        from core.aiofeed import AsyncFeed
+        feed = AsyncFeed(recorder)
+    else:
+        feed = BinanceFeed(recorder)
+    exporter = None
+    if args.metrics:
+        exporter = metrics.PrometheusExporter(metrics.registry, args.metrics)
+        exporter.start()
+
+    server = FeedServer(feed, args.socket)
+    try:
+        server.start()
+    except (OSError, RuntimeError) as e:
+        print(f"Feed bus failed to start: {e}")
+        return
+    print(f"Feed bus listening on {args.socket}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        feed.close()
+        if exporter:
+            exporter.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import os
+import time
+import threading
+import numpy as np
+from core.candle_buffer import CANDLE_DTYPE
+from core.klines import INTERVAL_MS, fetch_klines
+
+class CandleArchive:
+    """Closed candles on disk, one raw fixed-width file per column.
+
+    Each symbol/interval gets a directory holding time.bin (int64) and
+    open/high/low/close/volume.bin (float64). Files are only ever appended
+    to, and reads map them with np.memmap, so months of 1m history open
+    without parsing anything.
+
+    Candles are only written in time order. Live closes that arrive before
+    a symbol has been gap-filled this session (or that skip a candle) are
+    held back until fill_gaps() has fetched everything before them.
+    """
+
+    PAGE_LIMIT = 1000
+    MAX_PENDING = 1000
+
+    def __init__(self, directory=os.path.join("cache", "archive"), initial_days=7):
+        self.directory = directory
+        self.initial_days = initial_days
+        self.lock = threading.RLock()
+        self.synced = set()
+        self.pending = {}
+
+    def path(self, symbol, interval, column=None):
+        path = os.path.join(self.directory, f"{symbol.lower()}_{interval}")
+        return path if column is None else os.path.join(path, f"{column}.bin")
+
+    def length(self, symbol, interval):
+        """Rows present in every column; a torn append is truncated away."""
+        sizes = []
+        for column in CANDLE_DTYPE.names:
+            path = self.path(symbol, interval, column)
+            sizes.append(os.path.getsize(path) // 8 if os.path.exists(path) else 0)
+        rows = min(sizes)
+        if rows != max(sizes):
+            for column in CANDLE_DTYPE.names:
+                path = self.path(symbol, interval, column)
+                if os.path.exists(path):
+                    os.truncate(path, rows * 8)
+        return rows
+
+    def columns(self, symbol, interval, count=None):
+        """Read-only memory maps of the newest count rows, keyed by column."""
+        with self.lock:
+            rows = self.length(symbol, interval)
+        start = 0 if count is None else max(0, rows - count)
+        if rows == start:
+            return None
+        return {
+            column: np.memmap(self.path(symbol, interval, column), mode="r",
+                              dtype=CANDLE_DTYPE[column], shape=(rows,))[start:]
+            for column in CANDLE_DTYPE.names
+        }
+
+    def read(self, symbol, interval, count=None):
+        """The newest count candles as a CANDLE_DTYPE array."""
+        columns = self.columns(symbol, interval, count)
+        if columns is None:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        candles = np.empty(len(columns["time"]), dtype=CANDLE_DTYPE)
+        for column, values in columns.items():
+            candles[column] = values
+        return candles
+
+    def last_time(self, symbol, interval):
+        with self.lock:
+            rows = self.length(symbol, interval)
+            if not rows:
+                return None
+            with open(self.path(symbol, interval, "time"), "rb") as f:
+                f.seek((rows - 1) * 8)
+                return int(np.frombuffer(f.read(8), dtype=np.int64)[0])
+
+    def append(self, symbol, interval, candles):
+        """Append candles newer than the last stored one."""
+        with self.lock:
+            last = self.last_time(symbol, interval)
+            if last is not None:
+                candles = candles[candles["time"] > last]
+            if not len(candles):
+                return
+            os.makedirs(self.path(symbol, interval), exist_ok=True)
+            for column in CANDLE_DTYPE.names:
+                with open(self.path(symbol, interval, column), "ab") as f:
+                    f.write(np.ascontiguousarray(candles[column]).tobytes())
+
+    def record(self, symbol, interval, candle):
+        """Store a closed candle from the live stream."""
+        row = np.array([(candle["time"], candle["open"], candle["high"], candle["low"],
+                         candle["close"], candle["volume"])], dtype=CANDLE_DTYPE)
+        key = (symbol.lower(), interval)
+        with self.lock:
+            last = self.last_time(symbol, interval)
+            if key in self.synced and last is not None and candle["time"] == last + INTERVAL_MS[interval]:
+                self.append(symbol, interval, row)
+                return
+            # Out of sequence: hold it until fill_gaps() catches up
+            self.synced.discard(key)
+            pending = self.pending.setdefault(key, [])
+            pending.append(row)
+            del pending[:-self.MAX_PENDING]
+
+    def fill_gaps(self, symbol, interval):
+        """Fetch every closed candle between the last stored one and now."""
+        step = INTERVAL_MS[interval]
+        now = time.time() * 1000
+        last = self.last_time(symbol, interval)
+        start = last + step if last is not None else now - self.initial_days * 86_400_000
+
+        while start + step <= now:
+            page = fetch_klines(symbol, interval, int(start), self.PAGE_LIMIT)
+            closed = page[page["time"] + step <= now]
+            self.append(symbol, interval, closed)
+            if len(closed) < self.PAGE_LIMIT or closed["time"][-1] < start:
+                break
+            start = closed["time"][-1] + step
+
+        key = (symbol.lower(), interval)
+        with self.lock:
+            pending = self.pending.pop(key, None)
+            if pending:
+                self.append(symbol, interval, np.concatenate(pending))
+            self.synced.add(key)
@@ -0,0 +1,125 @@
+import numpy as np
+
+CANDLE_DTYPE = np.dtype([
+    ("time", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+])
+
+def klines_to_array(klines):
+    """Convert Binance /api/v3/klines rows into a CANDLE_DTYPE array."""
+    candles = np.empty(len(klines), dtype=CANDLE_DTYPE)
+    if not len(klines):
+        return candles
+    rows = np.array([k[:6] for k in klines], dtype=object)
+    candles["time"] = rows[:, 0].astype(np.int64)
+    for i, field in enumerate(("open", "high", "low", "close", "volume"), start=1):
+        candles[field] = rows[:, i].astype(np.float64)
+    return candles
+
+class CandleBuffer:
+    """Fixed-capacity candle store backed by one preallocated structured array.
+
+    Storage is twice the capacity so the live window is always a single
+    slice: once appends reach the end, the newest rows are moved back to the
+    front in one copy. Appends stay amortized O(1) and view() never copies.
+    """
+
+    def __init__(self, capacity=5000):
+        self.capacity = capacity
+        self.data = np.zeros(capacity * 2, dtype=CANDLE_DTYPE)
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, field):
+        return self.data[field][self.start:self.end]
+
+    def clear(self):
+        self.start = 0
+        self.end = 0
+
+    def view(self, count=None):
+        """The newest count candles (all if None) as a view into the buffer."""
+        start = self.start if count is None else max(self.start, self.end - count)
+        return self.data[start:self.end]
+
+    def last_time(self):
+        return int(self.data["time"][self.end - 1]) if self.end > self.start else None
+
+    def append(self, time, open, high, low, close, volume):
+        if self.end == len(self.data):
+            self.compact()
+        self.data[self.end] = (time, open, high, low, close, volume)
+        self.end += 1
+        if self.end - self.start > self.capacity:
+            self.start += 1
+
+    def extend(self, candles):
+        """Append a CANDLE_DTYPE array, keeping only the newest capacity rows."""
+        candles = candles[-self.capacity:]
+        if self.end + len(candles) > len(self.data):
+            self.compact(keep=self.capacity - len(candles))
+        self.data[self.end:self.end + len(candles)] = candles
+        self.end += len(candles)
+        self.start = max(self.start, self.end - self.capacity)
+
+    def update_last(self, high, low, close, volume):
+        """Update the forming candle in place."""
+        row = self.data[self.end - 1]
+        row["high"] = high
+        row["low"] = low
+        row["close"] = close
+        row["volume"] = volume
+
+    def compact(self, keep=None):
+        keep = min(len(self), self.capacity - 1 if keep is None else keep)
+        self.data[:keep] = self.data[self.end - keep:self.end]
+        self.start = 0
+        self.end = keep
+
+class SeriesBuffer:
+    """Float series kept row-aligned with a CandleBuffer of the same capacity."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = np.full(capacity * 2, np.nan)
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def clear(self):
+        self.start = 0
+        self.end = 0
+
+    def view(self, count=None):
+        start = self.start if count is None else max(self.start, self.end - count)
+        return self.data[start:self.end]
+
+    def append(self, value):
+        if self.end == len(self.data):
+            keep = self.capacity - 1
+            self.data[:keep] = self.data[self.end - keep:self.end]
+            self.start = 0
+            self.end = keep
+        self.data[self.end] = value
+        self.end += 1
+        if self.end - self.start > self.capacity:
+            self.start += 1
+
+    def load(self, values):
+        """Replace the contents with the newest capacity values."""
+        values = values[-self.capacity:]
+        self.clear()
+        self.data[:len(values)] = values
+        self.end = len(values)
+
+    def set_last(self, value):
+        self.data[self.end - 1] = value
@@ -0,0 +1,51 @@
+import json
+import time
+from operator import itemgetter
+
+# orjson parses Binance frames several times faster than the stdlib; it is
+# optional, and everything behaves the same without it.
+try:
+    import orjson
+    loads = orjson.loads
+    dumps = orjson.dumps
+    BACKEND = "orjson"
+except ImportError:
+    loads = json.loads
+    BACKEND = "json"
+
+    def dumps(obj):
+        """Compact JSON as bytes, like orjson.dumps."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# Per-stream field extraction. Values stay as the exchange's strings so the
+# websocket thread does no float() work; components convert them on the Tk
+# thread, and only for updates that survive coalescing.
+SCHEMAS = {
+    # close, change, change %, base volume, high, low
+    "ticker": itemgetter("c", "p", "P", "v", "h", "l"),
+    # trade time (ms), price, quantity, buyer is maker
+    "trade": itemgetter("T", "p", "q", "m"),
+    # open time, open, high, low, close, volume, closed
+    "kline": itemgetter("t", "o", "h", "l", "c", "v", "x"),
+    # REST /api/v3/ticker/24hr, in the same order as "ticker"
+    "ticker_24hr": itemgetter("lastPrice", "priceChange", "priceChangePercent", "volume", "highPrice", "lowPrice"),
+}
+
+class SecondClock:
+    """Formats epoch-ms timestamps as local time, once per distinct second.
+
+    Trades arrive in time order, so almost every call hits the cached text
+    instead of going through datetime/strftime.
+    """
+
+    def __init__(self, fmt="%H:%M:%S"):
+        self.fmt = fmt
+        self.second = None
+        self.text = ""
+
+    def __call__(self, ms):
+        second = ms // 1000
+        if second != self.second:
+            self.second = second
+            self.text = time.strftime(self.fmt, time.localtime(second))
+        return self.text
@@ -0,0 +1,141 @@
+import math
+import threading
+import numpy as np
+
+def nice_step(x):
+    """The smallest 1, 2 or 5 times a power of ten that is at least x."""
+    power = 10 ** math.floor(math.log10(x))
+    for factor in (1, 2, 5, 10):
+        if factor * power >= x * (1 - 1e-9):
+            return factor * power
+
+class DepthHistory:
+    """Rolling price-by-time grid of resting size, one row per sample interval.
+
+    Each row is a book snapshot binned onto a fixed price grid of `levels`
+    bins, `step` apart from `base` upwards. Storage is preallocated like
+    CandleBuffer's: twice the capacity, so the newest rows are always one
+    slice and memory never grows (capacity * 2 * levels float32s).
+
+    The step is chosen from the first snapshot so the grid spans at least
+    `span` times its mid. When the mid drifts into the outer quarter of
+    the grid, the grid is re-anchored on it and the stored rows shifted to
+    match; sizes that fall off the edge are dropped. A view of a quarter
+    span either side of the mid therefore always lies on the grid.
+    """
+
+    INTERVAL = 0.1
+
+    def __init__(self, capacity=3000, levels=400, span=0.02):
+        self.capacity = capacity
+        self.levels = levels
+        self.span = span
+        self.sizes = np.zeros((capacity * 2, levels), dtype=np.float32)
+        self.mids = np.zeros(capacity * 2)
+        self.lock = threading.Lock()
+        self.clear()
+
+    def __len__(self):
+        return self.end - self.start
+
+    @property
+    def nbytes(self):
+        return self.sizes.nbytes + self.mids.nbytes
+
+    def clear(self):
+        self.start = 0
+        self.end = 0
+        self.base = None
+        self.step = None
+        self.last_time = None
+
+    def record(self, now, bids, asks):
+        """Add one snapshot taken at now (time.monotonic()).
+
+        bids and asks are (price, size) levels, best first. Within one
+        interval the newest snapshot replaces the row; after a gap the last
+        row is repeated so every row stays one interval wide.
+        """
+        if not bids or not asks:
+            return
+        bids = np.asarray(bids, dtype=np.float64)
+        asks = np.asarray(asks, dtype=np.float64)
+        mid = (bids[0, 0] + asks[0, 0]) / 2
+
+        with self.lock:
+            if self.step is None:
+                self.step = nice_step(self.span * mid / self.levels)
+                self.recenter(mid)
+            elif not self.levels // 4 <= (mid - self.base) / self.step < self.levels * 3 // 4:
+                self.recenter(mid)
+
+            row = np.zeros(self.levels, dtype=np.float32)
+            for levels in (bids, asks):
+                bins = np.floor((levels[:, 0] - self.base) / self.step).astype(np.int64)
+                inside = (bins >= 0) & (bins < self.levels)
+                row += np.bincount(bins[inside], weights=levels[inside, 1], minlength=self.levels)
+
+            steps = 1 if self.last_time is None else int((now - self.last_time) / self.INTERVAL)
+            if steps == 0:
+                self.sizes[self.end - 1] = row
+                self.mids[self.end - 1] = mid
+                return
+            if steps > self.capacity:
+                steps = 1
+                self.last_time = now
+            else:
+                self.last_time = now if self.last_time is None else self.last_time + steps * self.INTERVAL
+            if self.end > self.start:
+                for _ in range(steps - 1):
+                    self.append(self.sizes[self.end - 1], self.mids[self.end - 1])
+            self.append(row, mid)
+
+    def append(self, row, mid):
+        if self.end == len(self.sizes):
+            keep = self.capacity - 1
+            self.sizes[:keep] = self.sizes[self.end - keep:self.end]
+            self.mids[:keep] = self.mids[self.end - keep:self.end]
+            self.start, self.end = 0, keep
+        self.sizes[self.end] = row
+        self.mids[self.end] = mid
+        self.end += 1
+        if self.end - self.start > self.capacity:
+            self.start += 1
+
+    def recenter(self, mid):
+        base = (math.floor(mid / self.step) - self.levels // 2) * self.step
+        if self.base is not None:
+            shift = round((base - self.base) / self.step)
+            rows = self.sizes[self.start:self.end]
+            if abs(shift) >= self.levels:
+                rows[:] = 0
+            elif shift > 0:
+                rows[:, :-shift] = rows[:, shift:]
+                rows[:, -shift:] = 0
+            elif shift < 0:
+                rows[:, -shift:] = rows[:, :shift]
+                rows[:, :-shift] = 0
+        self.base = base
+
+    def window(self, count, low, high):
+        """(sizes, mids, prices) for the newest count rows and the bins from low to high.
+
+        Copies, so the caller can render while snapshots keep arriving.
+        """
+        with self.lock:
+            if self.step is None or self.end == self.start:
+                return None
+            start = max(self.start, self.end - count)
+            first = max(0, int((low - self.base) // self.step))
+            last = min(self.levels, int((high - self.base) // self.step) + 1)
+            if first >= last:
+                return None
+            return (self.sizes[start:self.end, first:last].copy(), self.mids[start:self.end].copy(),
+                    self.base + self.step * np.arange(first, last))
+
+    def latest(self):
+        """(row, mid) of the newest snapshot, or None."""
+        with self.lock:
+            if self.end == self.start:
+                return None
+            return self.sizes[self.end - 1].copy(), self.mids[self.end - 1]
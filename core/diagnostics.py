@@ -0,0 +1,168 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from core.metrics import Histogram, percentile
+
+class LagWatchdog:
+    """Measures how late the Tk main loop runs after() callbacks.
+
+    A heartbeat is scheduled every interval ms on the Tk thread; how late it
+    fires is the main-loop stall. A background thread watches the heartbeat
+    and, when it is overdue by more than stall_ms, grabs the Tk thread's
+    stack so the stall can be attributed while it is still happening.
+
+    The RenderScheduler reports each callback's run time through
+    record_callback(), and callbacks slower than slow_ms are logged by name.
+    """
+
+    def __init__(self, root, interval=100, stall_ms=250, slow_ms=50):
+        self.root = root
+        self.interval = interval
+        self.stall_ms = stall_ms
+        self.slow_ms = slow_ms
+        self.lag = Histogram()
+        self.max_lag = 0.0
+        self.callbacks = {}
+        self.running = False
+        self.expected = None
+        self.last_beat = None
+        self.stall_stack = None
+        self.tk_thread = threading.get_ident()
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.tk_thread = threading.get_ident()
+        self.last_beat = time.perf_counter()
+        self.expected = self.last_beat + self.interval / 1000
+        self.root.after(self.interval, self.beat)
+        threading.Thread(target=self.watch, daemon=True, name="lag-watchdog").start()
+
+    def stop(self):
+        self.running = False
+
+    def beat(self):
+        if not self.running:
+            return
+        now = time.perf_counter()
+        lag_ms = (now - self.expected) * 1000
+        self.lag.observe(lag_ms)
+        self.max_lag = max(self.max_lag, lag_ms)
+
+        if lag_ms > self.stall_ms:
+            stack = self.stall_stack
+            print(f"UI stalled for {lag_ms:.0f} ms")
+            if stack:
+                print("".join(stack).rstrip())
+        self.stall_stack = None
+
+        self.last_beat = now
+        self.expected = now + self.interval / 1000
+        self.root.after(self.interval, self.beat)
+
+    def watch(self):
+        while self.running:
+            time.sleep(self.interval / 2000)
+            overdue = (time.perf_counter() - self.expected) * 1000
+            if overdue > self.stall_ms and self.stall_stack is None:
+                frame = sys._current_frames().get(self.tk_thread)
+                if frame is not None:
+                    self.stall_stack = traceback.format_stack(frame)
+
+    def record_callback(self, name, seconds):
+        ms = seconds * 1000
+        count, total, slowest = self.callbacks.get(name, (0, 0.0, 0.0))
+        self.callbacks[name] = (count + 1, total + ms, max(slowest, ms))
+        if ms > self.slow_ms:
+            print(f"Slow callback {name}: {ms:.1f} ms")
+
+    def report(self, top=10):
+        """Lag percentiles and the slowest callbacks by worst case."""
+        counts = self.lag.counts
+        lines = [f"Main-loop lag: p50 {percentile(counts, 50) or 0:.1f} ms, "
+                 f"p99 {percentile(counts, 99) or 0:.1f} ms, max {self.max_lag:.1f} ms"]
+        ranked = sorted(self.callbacks.items(), key=lambda item: item[1][2], reverse=True)
+        for name, (count, total, slowest) in ranked[:top]:
+            lines.append(f"  {name:<40} max {slowest:8.1f} ms  avg {total / count:6.2f} ms  x{count}")
+        return "\n".join(lines)
+
+class SamplingProfiler:
+    """Samples every thread's stack and writes collapsed stacks.
+
+    Output is one "thread;outer;...;inner count" line per distinct stack,
+    the format flamegraph.pl and speedscope read directly. Sampling uses
+    sys._current_frames(), so it can be switched on in a running dashboard
+    without restarting under cProfile.
+    """
+
+    def __init__(self, directory="profiles", interval=0.005):
+        self.directory = directory
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = None
+        self.path = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=10, on_done=None):
+        if self.running:
+            return
+        self.stacks = {}
+        self.samples = 0
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, args=(duration, on_done),
+                                       daemon=True, name="sampling-profiler")
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    @staticmethod
+    def frame_name(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self.frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}").replace(" ", "_"))
+            key = ";".join(reversed(stack))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def run(self, duration, on_done):
+        deadline = time.perf_counter() + duration
+        while not self.stopped.is_set() and time.perf_counter() < deadline:
+            self.sample()
+            self.stopped.wait(self.interval)
+
+        self.path = self.write()
+        if on_done:
+            on_done(self.path)
+
+    def write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, time.strftime("profile-%Y%m%d-%H%M%S.folded"))
+        try:
+            with open(path, "w") as f:
+                for stack, count in sorted(self.stacks.items()):
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+            return None
+        print(f"Profile: {self.samples} samples written to {path}")
+        return path
@@ -0,0 +1,60 @@
+from collections import namedtuple
+
+# Typed market events for consumers that should not depend on Binance's
+# wire format (scripts on the feed bus, see core/bus.py). Prices and sizes
+# are floats, times are epoch milliseconds, symbols are upper case.
+Ticker = namedtuple("Ticker", "symbol time price change percent volume high low")
+MiniTicker = namedtuple("MiniTicker", "symbol time price open high low volume quote_volume")
+Trade = namedtuple("Trade", "symbol time price quantity buyer_maker")
+Candle = namedtuple("Candle", "symbol interval open_time open high low close volume closed")
+BookTop = namedtuple("BookTop", "symbol last_id bids asks")
+BookDiff = namedtuple("BookDiff", "symbol time first_id last_id bids asks")
+# A stream going STALE, LIVE or RESYNC (core.feed)
+Status = namedtuple("Status", "stream status")
+
+EVENT_TYPES = {cls.__name__: cls for cls in (Ticker, MiniTicker, Trade, Candle, BookTop, BookDiff, Status)}
+
+def levels(rows):
+    return [(float(price), float(size)) for price, size in rows]
+
+def normalize(stream, data):
+    """The typed event for one stream payload (a list for !miniTicker@arr), or None if unknown."""
+    if stream == "!miniTicker@arr":
+        return [MiniTicker(d["s"], d["E"], float(d["c"]), float(d["o"]), float(d["h"]),
+                           float(d["l"]), float(d["v"]), float(d["q"])) for d in data]
+
+    symbol, _, kind = stream.partition("@")
+    symbol = symbol.upper()
+    if kind == "ticker":
+        return Ticker(symbol, data["E"], float(data["c"]), float(data["p"]), float(data["P"]),
+                      float(data["v"]), float(data["h"]), float(data["l"]))
+    if kind == "trade":
+        return Trade(symbol, data["T"], float(data["p"]), float(data["q"]), data["m"])
+    if kind.startswith("kline_"):
+        k = data["k"]
+        return Candle(symbol, k["i"], k["t"], float(k["o"]), float(k["h"]), float(k["l"]),
+                      float(k["c"]), float(k["v"]), k["x"])
+    if kind.startswith("depth"):
+        # Partial book streams send whole snapshots, diff streams send changes
+        if "lastUpdateId" in data:
+            return BookTop(symbol, data["lastUpdateId"], levels(data["bids"]), levels(data["asks"]))
+        return BookDiff(symbol, data["E"], data["U"], data["u"], levels(data["b"]), levels(data["a"]))
+    return None
+
+def to_dict(event):
+    if isinstance(event, list):
+        return [to_dict(e) for e in event]
+    fields = event._asdict()
+    fields["type"] = type(event).__name__
+    return fields
+
+def from_dict(fields):
+    if isinstance(fields, list):
+        return [from_dict(f) for f in fields]
+    fields = dict(fields)
+    cls = EVENT_TYPES[fields.pop("type")]
+    if cls in (BookTop, BookDiff):
+        # JSON turned the level tuples into lists
+        fields["bids"] = [tuple(level) for level in fields["bids"]]
+        fields["asks"] = [tuple(level) for level in fields["asks"]]
+    return cls(**fields)
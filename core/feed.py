@@ -0,0 +1,266 @@
+import websocket
+import json
+import threading
+import time
+from core import decoding, metrics, startup
+from core.supervisor import FeedSupervisor
+
+# Stream status notifications delivered to watch() callbacks
+STALE = "stale"      # no frames within the stream's expected cadence
+LIVE = "live"        # frames flowing again after being stale
+RESYNC = "resync"    # the connection was re-established; frames were missed
+
+def stream_name(stream):
+    """Lowercase the symbol part; market-wide streams like !miniTicker@arr keep their case."""
+    if stream.startswith("!"):
+        return stream
+    symbol, sep, rest = stream.partition("@")
+    return symbol.lower() + sep + rest
+
+class BinanceFeed:
+    """Single combined-stream connection shared by every component.
+
+    Components register a callback per stream name (e.g. "btcusdt@ticker");
+    the feed keeps one socket open and sends SUBSCRIBE/UNSUBSCRIBE frames as
+    streams come and go, routing each combined frame to its subscribers.
+    A FeedSupervisor reconnects dropped sockets and reports stale streams
+    to callbacks registered with watch().
+    """
+
+    BASE_URL = "wss://stream.binance.com:9443/stream"
+    # Transport heartbeat: ping every 20s, drop the socket if no pong in 10s
+    PING_INTERVAL = 20
+    PING_TIMEOUT = 10
+    supervised = True
+
+    def __init__(self, recorder=None):
+        self.recorder = recorder
+        self.ws = None
+        self.connected = False
+        self.closing = False
+        self.has_connected = False
+        self.subscribers = {}
+        self.watchers = {}
+        self.last_message = {}
+        self.stale = set()
+        self.url_streams = set()
+        self.lock = threading.Lock()
+        self.request_id = 0
+        self.supervisor = FeedSupervisor(self) if self.supervised else None
+
+    @property
+    def reconnecting(self):
+        return self.supervisor is not None and self.supervisor.reconnecting
+
+    def subscribe(self, stream, callback):
+        stream = stream_name(stream)
+        with self.lock:
+            callbacks = self.subscribers.setdefault(stream, [])
+            is_new = not callbacks
+            callbacks.append(callback)
+            if is_new:
+                self.last_message[stream] = time.monotonic()
+
+        if self.ws is None:
+            # A pending reconnect picks the stream up from subscribers
+            if not self.reconnecting:
+                self.connect()
+        elif is_new:
+            self.send("SUBSCRIBE", [stream])
+
+    def unsubscribe(self, stream, callback):
+        stream = stream_name(stream)
+        with self.lock:
+            callbacks = self.subscribers.get(stream)
+            if not callbacks or callback not in callbacks:
+                return
+            callbacks.remove(callback)
+            if callbacks:
+                return
+            del self.subscribers[stream]
+            self.last_message.pop(stream, None)
+            self.stale.discard(stream)
+
+        self.send("UNSUBSCRIBE", [stream])
+
+    def watch(self, stream, callback):
+        """Call callback(stream, status) with STALE, LIVE or RESYNC for stream."""
+        with self.lock:
+            self.watchers.setdefault(stream_name(stream), []).append(callback)
+
+    def unwatch(self, stream, callback):
+        with self.lock:
+            callbacks = self.watchers.get(stream_name(stream))
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+
+    def notify(self, stream, status):
+        with self.lock:
+            callbacks = list(self.watchers.get(stream, ()))
+        for callback in callbacks:
+            try:
+                callback(stream, status)
+            except Exception as e:
+                print(f"Feed status callback error for {stream}: {e}")
+
+    def order_book(self, symbol, on_update=None):
+        """A book for symbol kept current from this feed's depth stream."""
+        from core.order_book import LocalOrderBook
+        return LocalOrderBook(self, symbol, on_update)
+
+    def mark_stale(self, stream):
+        with self.lock:
+            if stream in self.stale or stream not in self.subscribers:
+                return
+            self.stale.add(stream)
+        self.notify(stream, STALE)
+
+    def stream_url(self):
+        """Combined-stream URL carrying every current subscription."""
+        with self.lock:
+            streams = list(self.subscribers)
+        self.url_streams = set(streams)
+
+        url = self.BASE_URL
+        if streams:
+            url += "?streams=" + "/".join(streams)
+        return url
+
+    def connect(self):
+        url = self.stream_url()
+        self.closing = False
+        ws = self.ws = websocket.WebSocketApp(
+            url,
+            on_message=self.on_message,
+            on_error=lambda ws, err: print("Feed error:", err),
+            on_close=self.on_close,
+            on_open=self.on_open
+        )
+        threading.Thread(target=self.run_socket, args=(ws,), daemon=True).start()
+        if self.supervisor:
+            self.supervisor.start()
+
+    def run_socket(self, ws):
+        ws.run_forever(ping_interval=self.PING_INTERVAL, ping_timeout=self.PING_TIMEOUT)
+
+        # run_forever returns however the connection ended: closed by the
+        # server, network error, failed handshake or missed pong.
+        if ws is not self.ws or self.closing:
+            return
+        self.connected = False
+        # Pending before ws is cleared, so a subscribe() in between leaves
+        # the reconnect to the supervisor instead of opening its own socket
+        if self.supervisor:
+            self.supervisor.connection_lost()
+        self.ws = None
+        with self.lock:
+            streams = list(self.subscribers)
+        for stream in streams:
+            self.mark_stale(stream)
+
+    def drop(self):
+        """Close the socket without shutting down; the supervisor reconnects."""
+        ws = self.ws
+        if ws:
+            ws.close()
+
+    def close(self):
+        self.closing = True
+        if self.supervisor:
+            self.supervisor.stop()
+        ws = self.ws
+        self.ws = None
+        self.connected = False
+        if ws:
+            ws.close()
+        if self.recorder:
+            self.recorder.close()
+
+    def send(self, method, streams):
+        if not self.connected or not streams:
+            return
+        if self.supervisor:
+            self.supervisor.queue(method, streams)
+        else:
+            self.transmit(method, streams)
+
+    def transmit(self, method, streams):
+        self.request_id += 1
+        try:
+            self.ws.send(json.dumps({"method": method, "params": streams, "id": self.request_id}))
+        except Exception as e:
+            print(f"Feed {method} failed: {e}")
+
+    def on_open(self, ws):
+        if not self.has_connected:
+            startup.timer.mark("feed connected")
+        self.connected = True
+        metrics.registry.connected()
+        if self.supervisor:
+            self.supervisor.connected()
+        print("Feed connected")
+
+        # Streams changed between connect() and the socket opening, so
+        # reconcile them against what was requested in the URL.
+        with self.lock:
+            streams = set(self.subscribers)
+            now = time.monotonic()
+            for stream in streams:
+                self.last_message[stream] = now
+        self.send("SUBSCRIBE", sorted(streams - self.url_streams))
+        self.send("UNSUBSCRIBE", sorted(self.url_streams - streams))
+
+        if self.has_connected:
+            for stream in streams:
+                self.notify(stream, RESYNC)
+        self.has_connected = True
+
+    def on_close(self, ws, status, msg):
+        if ws is self.ws:
+            self.connected = False
+        metrics.registry.disconnected()
+        print("Feed closed")
+
+    def on_message(self, ws, message):
+        if ws is not self.ws:
+            # A replaced socket still draining its last frames
+            return
+        received = time.time()
+        if self.recorder:
+            self.recorder.record_frame(message)
+
+        frame = decoding.loads(message)
+        self.route(frame, received, time.time())
+
+    def route(self, frame, received, parsed):
+        """Deliver one decoded combined-stream frame ({"stream", "data"})."""
+        stream = frame.get("stream")
+        if stream is None:
+            # SUBSCRIBE/UNSUBSCRIBE acknowledgements carry only "result"/"id"
+            if frame.get("error"):
+                print("Feed request error:", frame["error"])
+            return
+
+        self.last_message[stream] = time.monotonic()
+        if stream in self.stale:
+            with self.lock:
+                self.stale.discard(stream)
+            self.notify(stream, LIVE)
+
+        data = frame["data"]
+        metrics.registry.begin(stream, data, received, parsed)
+        try:
+            self.dispatch(stream, data)
+        finally:
+            metrics.registry.end()
+
+    def dispatch(self, stream, data):
+        with self.lock:
+            callbacks = list(self.subscribers.get(stream, ()))
+
+        # One failing component must not take down the thread that feeds the rest
+        for callback in callbacks:
+            try:
+                callback(stream, data)
+            except Exception as e:
+                print(f"Feed callback error for {stream}: {e!r}")
@@ -0,0 +1,27 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = "https://api.binance.com"
+TIMEOUT = 10
+
+# One pooled session for every REST call so symbol switches reuse warm
+# keep-alive connections instead of paying a TLS handshake each time.
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Hooks for session recording and replay (see core/recorder.py and
+# core/replay.py): the recorder sees every response, the responder
+# answers requests instead of the network.
+recorder = None
+responder = None
+
+def get_json(path, params=None, timeout=TIMEOUT):
+    if responder is not None:
+        return responder(path, params)
+
+    response = session.get(API_URL + path, params=params, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    if recorder is not None:
+        recorder.record_rest(path, params, data)
+    return data
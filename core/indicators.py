@@ -0,0 +1,317 @@
+import numpy as np
+from core.candle_buffer import SeriesBuffer
+
+DAY_MS = 86_400_000
+
+def ema(values, alpha, initial=None):
+    """Exponential moving average, vectorized in blocks.
+
+    Within a block y[t] = d^(t+1) * y0 + alpha * d^t * cumsum(x[i] / d^i)
+    with d = 1 - alpha. Blocks are kept short enough that d^-i stays well
+    inside float precision.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty_like(values)
+    if not len(values):
+        return out
+
+    decay = 1.0 - alpha
+    block = max(1, int(10 / -np.log(decay))) if decay > 0 else 1
+    prev = values[0] if initial is None else initial
+    for start in range(0, len(values), block):
+        x = values[start:start + block]
+        powers = decay ** np.arange(len(x))
+        out[start:start + len(x)] = decay * powers * prev + alpha * powers * np.cumsum(x / powers)
+        prev = out[start + len(x) - 1]
+    return out
+
+def rolling_sum(values, period):
+    """Sum over the trailing period values; NaN until the window is full."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        sums = np.cumsum(np.r_[0.0, values])
+        out[period - 1:] = sums[period:] - sums[:-period]
+    return out
+
+# Each indicator computes its whole history with vectorized passes in
+# backfill(), leaving its state as of the last closed bar. step() then
+# derives the forming bar's values from that state in O(1), and advances
+# the state when called with commit=True once the bar has closed.
+
+class SMA:
+    panel = "price"
+    outputs = ("sma",)
+
+    def __init__(self, period=20):
+        self.period = period
+        self.label = f"SMA {period}"
+
+    def backfill(self, candles):
+        closes = candles["close"]
+        self.window = closes[-self.period:-1].sum() if len(closes) > 1 else 0.0
+        return {"sma": rolling_sum(closes, self.period) / self.period}
+
+    def step(self, candles, commit):
+        closes = candles["close"]
+        value = (self.window + closes[-1]) / self.period if len(closes) >= self.period else np.nan
+        if commit:
+            self.window += closes[-1]
+            if len(closes) >= self.period:
+                self.window -= closes[-self.period]
+        return (value,)
+
+class EMA:
+    panel = "price"
+    outputs = ("ema",)
+
+    def __init__(self, period=50):
+        self.alpha = 2 / (period + 1)
+        self.label = f"EMA {period}"
+
+    def backfill(self, candles):
+        values = ema(candles["close"], self.alpha)
+        self.prev = values[-2] if len(values) > 1 else None
+        return {"ema": values}
+
+    def step(self, candles, commit):
+        close = candles["close"][-1]
+        value = close if self.prev is None else self.prev + self.alpha * (close - self.prev)
+        if commit:
+            self.prev = value
+        return (value,)
+
+class Bollinger:
+    panel = "price"
+    outputs = ("upper", "middle", "lower")
+
+    def __init__(self, period=20, width=2.0):
+        self.period = period
+        self.width = width
+        self.label = f"BB {period}/{width:g}"
+
+    def bands(self, total, total_sq):
+        mean = total / self.period
+        std = np.sqrt(np.maximum(total_sq / self.period - mean * mean, 0.0))
+        return mean + self.width * std, mean, mean - self.width * std
+
+    def backfill(self, candles):
+        closes = candles["close"]
+        self.window = closes[-self.period:-1].sum() if len(closes) > 1 else 0.0
+        self.window_sq = (closes[-self.period:-1] ** 2).sum() if len(closes) > 1 else 0.0
+        upper, middle, lower = self.bands(rolling_sum(closes, self.period),
+                                          rolling_sum(closes * closes, self.period))
+        return {"upper": upper, "middle": middle, "lower": lower}
+
+    def step(self, candles, commit):
+        closes = candles["close"]
+        close = closes[-1]
+        if len(closes) >= self.period:
+            values = self.bands(self.window + close, self.window_sq + close * close)
+        else:
+            values = (np.nan, np.nan, np.nan)
+        if commit:
+            self.window += close
+            self.window_sq += close * close
+            if len(closes) >= self.period:
+                self.window -= closes[-self.period]
+                self.window_sq -= closes[-self.period] ** 2
+        return values
+
+class RSI:
+    panel = "RSI"
+    outputs = ("rsi",)
+
+    def __init__(self, period=14):
+        self.alpha = 1 / period
+        self.label = f"RSI {period}"
+
+    @staticmethod
+    def rsi(gain, loss):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+
+    def backfill(self, candles):
+        closes = candles["close"]
+        out = np.full(len(closes), np.nan)
+        self.prev_close = closes[-2] if len(closes) > 1 else None
+        self.gain = self.loss = None
+        if len(closes) < 2:
+            return {"rsi": out}
+
+        changes = np.diff(closes)
+        gains = ema(np.maximum(changes, 0), self.alpha)
+        losses = ema(np.maximum(-changes, 0), self.alpha)
+        out[1:] = self.rsi(gains, losses)
+        if len(changes) > 1:
+            self.gain, self.loss = gains[-2], losses[-2]
+        return {"rsi": out}
+
+    def step(self, candles, commit):
+        close = candles["close"][-1]
+        if self.prev_close is None:
+            if commit:
+                self.prev_close = close
+            return (np.nan,)
+
+        change = close - self.prev_close
+        if self.gain is None:
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+        else:
+            gain = self.gain + self.alpha * (max(change, 0.0) - self.gain)
+            loss = self.loss + self.alpha * (max(-change, 0.0) - self.loss)
+        if commit:
+            self.gain, self.loss, self.prev_close = gain, loss, close
+        return (float(self.rsi(np.float64(gain), np.float64(loss))),)
+
+class MACD:
+    panel = "MACD"
+    outputs = ("macd", "signal", "histogram")
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.alphas = (2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+        self.label = f"MACD {fast}/{slow}/{signal}"
+
+    def backfill(self, candles):
+        closes = candles["close"]
+        fast_alpha, slow_alpha, signal_alpha = self.alphas
+        fast = ema(closes, fast_alpha)
+        slow = ema(closes, slow_alpha)
+        macd = fast - slow
+        signal = ema(macd, signal_alpha)
+        self.state = (fast[-2], slow[-2], signal[-2]) if len(closes) > 1 else None
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+    def step(self, candles, commit):
+        close = candles["close"][-1]
+        if self.state is None:
+            fast = slow = close
+            signal = 0.0
+        else:
+            fast_alpha, slow_alpha, signal_alpha = self.alphas
+            prev_fast, prev_slow, prev_signal = self.state
+            fast = prev_fast + fast_alpha * (close - prev_fast)
+            slow = prev_slow + slow_alpha * (close - prev_slow)
+            signal = prev_signal + signal_alpha * (fast - slow - prev_signal)
+        if commit:
+            self.state = (fast, slow, signal)
+        return fast - slow, signal, fast - slow - signal
+
+class VWAP:
+    """Volume-weighted average price, reset at each UTC day."""
+
+    panel = "price"
+    outputs = ("vwap",)
+
+    def __init__(self):
+        self.label = "VWAP"
+
+    def backfill(self, candles):
+        typical = (candles["high"] + candles["low"] + candles["close"]) / 3
+        volume = candles["volume"]
+        days = candles["time"] // DAY_MS
+
+        # Cumulative sums restarted at every session boundary
+        starts = np.r_[True, days[1:] != days[:-1]] if len(days) else np.empty(0, bool)
+        session_start = np.maximum.accumulate(np.where(starts, np.arange(len(days)), 0))
+        cum_pv = np.cumsum(typical * volume)
+        cum_v = np.cumsum(volume)
+        base_pv = np.r_[0.0, cum_pv][session_start]
+        base_v = np.r_[0.0, cum_v][session_start]
+        session_pv = cum_pv - base_pv
+        session_v = cum_v - base_v
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(session_v > 0, session_pv / session_v, typical)
+
+        if len(days) > 1:
+            self.day = days[-2]
+            self.pv, self.v = session_pv[-2], session_v[-2]
+        else:
+            self.day, self.pv, self.v = None, 0.0, 0.0
+        return {"vwap": out}
+
+    def step(self, candles, commit):
+        last = candles[-1]
+        typical = (last["high"] + last["low"] + last["close"]) / 3
+        day = last["time"] // DAY_MS
+        pv, v = (self.pv, self.v) if day == self.day else (0.0, 0.0)
+        pv += typical * last["volume"]
+        v += last["volume"]
+        if commit:
+            self.day, self.pv, self.v = day, pv, v
+        return (pv / v if v > 0 else typical,)
+
+INDICATORS = {
+    "SMA 20": lambda: SMA(20),
+    "EMA 50": lambda: EMA(50),
+    "Bollinger 20/2": lambda: Bollinger(20, 2.0),
+    "VWAP": VWAP,
+    "RSI 14": lambda: RSI(14),
+    "MACD 12/26/9": lambda: MACD(12, 26, 9),
+}
+
+class IndicatorEngine:
+    """Runs a set of indicators against one CandleBuffer.
+
+    Output series are SeriesBuffers row-aligned with the candles, so the
+    renderer can slice the same window from both.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.indicators = {}
+        self.series = {}
+
+    def add(self, name, indicator):
+        self.indicators[name] = indicator
+        self.series[name] = {output: SeriesBuffer(self.buffer.capacity) for output in indicator.outputs}
+        self.backfill(name)
+
+    def remove(self, name):
+        self.indicators.pop(name, None)
+        self.series.pop(name, None)
+
+    def bind(self, buffer):
+        """Switch to another buffer (e.g. a new timeframe) and recompute."""
+        self.buffer = buffer
+        for name, indicator in self.indicators.items():
+            self.series[name] = {output: SeriesBuffer(buffer.capacity) for output in indicator.outputs}
+        self.reload()
+
+    def reload(self):
+        for name in self.indicators:
+            self.backfill(name)
+
+    def backfill(self, name):
+        candles = self.buffer.view()
+        if not len(candles):
+            for series in self.series[name].values():
+                series.clear()
+            self.indicators[name].backfill(candles)
+            return
+        for output, values in self.indicators[name].backfill(candles).items():
+            self.series[name][output].load(values)
+
+    def update(self, new_bar):
+        """Fold the buffer's latest tick into every indicator.
+
+        new_bar means the buffer just appended a candle, so the previous one
+        is final and gets committed before the new forming bar is computed.
+        """
+        candles = self.buffer.view()
+        if not len(candles):
+            return
+
+        for name, indicator in self.indicators.items():
+            series = self.series[name]
+            if new_bar:
+                if len(candles) > 1:
+                    for output, value in zip(indicator.outputs, indicator.step(candles[:-1], commit=True)):
+                        series[output].set_last(value)
+                for output, value in zip(indicator.outputs, indicator.step(candles, commit=False)):
+                    series[output].append(value)
+            else:
+                for output, value in zip(indicator.outputs, indicator.step(candles, commit=False)):
+                    series[output].set_last(value)
+
+    def values(self, name, output, count=None):
+        return self.series[name][output].view(count)
@@ -0,0 +1,10 @@
+from core.http import get_json
+from core.candle_buffer import klines_to_array
+
+INTERVAL_MS = {"1m": 60_000}
+
+def fetch_klines(symbol, interval, start_time=None, limit=1000):
+    params = {"symbol": symbol.upper(), "interval": interval, "limit": limit}
+    if start_time is not None:
+        params["startTime"] = start_time
+    return klines_to_array(get_json("/api/v3/klines", params))
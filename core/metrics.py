@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in milliseconds; the last bucket is +Inf
+BUCKETS_MS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+STAGES = ("network", "parse", "render", "end_to_end")
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds.
+
+    Each histogram has a single writer thread, so observe() takes no lock;
+    readers copy the counts and tolerate being one sample behind.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0.0
+
+    def observe(self, ms):
+        ms = max(ms, 0.0)
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.total += ms
+
+    def snapshot(self):
+        return list(self.counts), self.total
+
+def percentile(counts, p):
+    """Estimate the p-th percentile from bucket counts (linear within a bucket)."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = p / 100 * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            low = BUCKETS_MS[i - 1] if i else 0.0
+            high = BUCKETS_MS[i] if i < len(BUCKETS_MS) else BUCKETS_MS[-1] * 2
+            return low + (high - low) * (rank - seen) / count
+        seen += count
+    return BUCKETS_MS[-1]
+
+class StreamMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.messages = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.stages = {stage: Histogram() for stage in STAGES}
+        # Messages in the last complete second, for a rate that does not
+        # depend on how often anyone reads it
+        self.second = 0
+        self.second_count = 0
+        self.last_second_count = 0
+
+    def count(self, now):
+        second = int(now)
+        if second != self.second:
+            self.last_second_count = self.second_count if second == self.second + 1 else 0
+            self.second = second
+            self.second_count = 0
+        self.second_count += 1
+        self.messages += 1
+
+    def rate(self, now=None):
+        second = int(time.time() if now is None else now)
+        if second == self.second:
+            return self.last_second_count
+        return self.second_count if second == self.second + 1 else 0
+
+class Sample:
+    """Timestamps of one message on its way from the exchange to the screen."""
+
+    __slots__ = ("stream", "event", "received", "parsed", "claimed")
+
+    def __init__(self, stream, event, received, parsed):
+        self.stream = stream
+        self.event = event
+        self.received = received
+        self.parsed = parsed
+        self.claimed = False
+
+class Metrics:
+    """Per-stream latency and throughput across feed -> scheduler -> Tk.
+
+    The feed opens a Sample for each frame with begin() and closes it with
+    end() after dispatch. If a component hands the frame to the
+    RenderScheduler meanwhile (on the same thread), the scheduler claims the
+    sample and completes it with rendered() once the callback has run, or
+    with coalesced() if a newer update replaced it. Frames nobody claimed
+    (stale symbol, unsynced book) count as dropped.
+    """
+
+    def __init__(self):
+        self.streams = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.connects = 0
+        self.disconnects = 0
+        self.started = time.time()
+
+    def stream(self, name):
+        metrics = self.streams.get(name)
+        if metrics is None:
+            with self.lock:
+                metrics = self.streams.setdefault(name, StreamMetrics(name))
+        return metrics
+
+    def begin(self, name, data, received, parsed):
+        metrics = self.stream(name)
+        metrics.count(received)
+        # Exchange timestamps are in ms; trades carry T, most events E.
+        # Array streams (!miniTicker@arr) are timed by their first item.
+        if isinstance(data, list):
+            data = data[0] if data else None
+        event = (data.get("E") or data.get("T")) if isinstance(data, dict) else None
+        event = event / 1000 if event else None
+        if event:
+            metrics.stages["network"].observe((received - event) * 1000)
+        metrics.stages["parse"].observe((parsed - received) * 1000)
+        self.local.sample = Sample(metrics, event, received, parsed)
+
+    def end(self):
+        sample = getattr(self.local, "sample", None)
+        self.local.sample = None
+        if sample is not None and not sample.claimed:
+            sample.stream.dropped += 1
+
+    def claim(self):
+        """The current thread's in-flight sample, once; None elsewhere."""
+        sample = getattr(self.local, "sample", None)
+        if sample is None or sample.claimed:
+            return None
+        sample.claimed = True
+        return sample
+
+    def coalesced(self, samples):
+        for sample in samples:
+            sample.stream.coalesced += 1
+
+    def rendered(self, samples, now=None):
+        now = time.time() if now is None else now
+        for sample in samples:
+            sample.stream.stages["render"].observe((now - sample.parsed) * 1000)
+            if sample.event:
+                sample.stream.stages["end_to_end"].observe((now - sample.event) * 1000)
+
+    def connected(self):
+        self.connects += 1
+
+    def disconnected(self):
+        self.disconnects += 1
+
+    @property
+    def reconnects(self):
+        return max(0, self.connects - 1)
+
+    def snapshot(self):
+        """Plain-data copy of every counter and histogram."""
+        now = time.time()
+        with self.lock:
+            streams = list(self.streams.values())
+        return {
+            "reconnects": self.reconnects,
+            "streams": {
+                s.name: {
+                    "messages": s.messages,
+                    "coalesced": s.coalesced,
+                    "dropped": s.dropped,
+                    "rate": s.rate(now),
+                    "stages": {stage: h.snapshot() for stage, h in s.stages.items()},
+                }
+                for s in streams
+            },
+        }
+
+    def prometheus(self):
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP dashboard_feed_reconnects_total Websocket reconnections since start.",
+            "# TYPE dashboard_feed_reconnects_total counter",
+            f"dashboard_feed_reconnects_total {snapshot['reconnects']}",
+        ]
+        counters = (("messages", "Messages received."), ("coalesced", "Updates replaced before render."),
+                    ("dropped", "Messages never handed to the renderer."))
+        for field, help_text in counters:
+            name = f"dashboard_stream_{field}_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{stream="{stream}"}} {s[field]}' for stream, s in snapshot["streams"].items()]
+
+        lines += ["# HELP dashboard_stream_rate Messages in the last complete second.",
+                  "# TYPE dashboard_stream_rate gauge"]
+        lines += [f'dashboard_stream_rate{{stream="{stream}"}} {s["rate"]}'
+                  for stream, s in snapshot["streams"].items()]
+
+        name = "dashboard_stream_latency_seconds"
+        lines += [f"# HELP {name} Latency per stage: network (event->receive), parse, "
+                  "render (parsed->drawn), end_to_end (event->drawn).",
+                  f"# TYPE {name} histogram"]
+        for stream, s in snapshot["streams"].items():
+            for stage, (counts, total) in s["stages"].items():
+                labels = f'stream="{stream}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS_MS + (None,), counts):
+                    cumulative += count
+                    le = "+Inf" if bound is None else repr(bound / 1000)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {total / 1000}")
+                lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+class PrometheusExporter:
+    """Rewrites a Prometheus text-format file every interval seconds.
+
+    The file is replaced atomically so a scraper (e.g. node_exporter's
+    textfile collector) never reads a half-written file.
+    """
+
+    def __init__(self, metrics, path, interval=10):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+        self.write()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.write()
+
+    def write(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                f.write(self.metrics.prometheus())
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+# Shared by the feed and the render scheduler
+registry = Metrics()
@@ -0,0 +1,298 @@
+import bisect
+import math
+import threading
+from collections import deque
+from core.http import get_json
+from core.feed import RESYNC
+
+def aggregate(levels, n, tick, descending):
+    """The n best levels after grouping prices into buckets of tick size.
+
+    levels are (price, size), best first. Bids round down and asks round
+    up, so a bucket never claims a better price than the orders inside it.
+    """
+    grouped = []
+    for price, size in levels:
+        if descending:
+            bucket = math.floor(price / tick + 1e-9) * tick
+        else:
+            bucket = math.ceil(price / tick - 1e-9) * tick
+        bucket = round(bucket, 10)
+        if grouped and grouped[-1][0] == bucket:
+            grouped[-1][1] += size
+        elif len(grouped) == n:
+            break
+        else:
+            grouped.append([bucket, size])
+    return [tuple(level) for level in grouped]
+
+class BookSide:
+    """Price levels for one side of the book, kept sorted by price.
+
+    Lookups are a dict hit and inserts/removals a bisect into the price
+    list, so top-N and range queries are plain slices.
+    """
+
+    def __init__(self, descending):
+        self.descending = descending
+        self.prices = []
+        self.sizes = {}
+
+    def __len__(self):
+        return len(self.prices)
+
+    def clear(self):
+        self.prices = []
+        self.sizes = {}
+
+    def set(self, price, size):
+        if size == 0:
+            if self.sizes.pop(price, None) is not None:
+                del self.prices[bisect.bisect_left(self.prices, price)]
+        else:
+            if price not in self.sizes:
+                bisect.insort(self.prices, price)
+            self.sizes[price] = size
+
+    def best(self):
+        if not self.prices:
+            return None
+        return self.prices[-1] if self.descending else self.prices[0]
+
+    def top(self, n):
+        """The n best levels as (price, size), best first."""
+        prices = self.prices[:-n - 1:-1] if self.descending else self.prices[:n]
+        return [(p, self.sizes[p]) for p in prices]
+
+    def range(self, low, high):
+        """Levels with low <= price <= high, in ascending price order."""
+        i = bisect.bisect_left(self.prices, low)
+        j = bisect.bisect_right(self.prices, high)
+        return [(p, self.sizes[p]) for p in self.prices[i:j]]
+
+    def aggregated(self, n, tick):
+        prices = reversed(self.prices) if self.descending else self.prices
+        return aggregate(((p, self.sizes[p]) for p in prices), n, tick, self.descending)
+
+class LocalOrderBook:
+    """Full order book for one symbol, maintained from the diff-depth stream.
+
+    Follows Binance's procedure: buffer diff events, fetch a REST snapshot,
+    drop events older than the snapshot and apply the rest, requiring each
+    event's first update id to follow the previous event's last one. Any gap
+    throws the book away and starts a fresh sync.
+    """
+
+    # Diff events buffered while a snapshot loads; older ones are dropped,
+    # which the update-id check then turns into a resync
+    MAX_PENDING = 1000
+
+    def __init__(self, feed, symbol, on_update=None, snapshot_limit=1000):
+        self.feed = feed
+        self.symbol = symbol.lower()
+        self.on_update = on_update
+        self.snapshot_limit = snapshot_limit
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.lock = threading.Lock()
+        self.is_active = False
+        self.synced = False
+        self.syncing = False
+        self.pending = deque(maxlen=self.MAX_PENDING)
+        self.last_update_id = None
+
+    @property
+    def stream(self):
+        return f"{self.symbol}@depth@100ms"
+
+    def start(self):
+        if self.is_active:
+            return
+        self.is_active = True
+        self.feed.watch(self.stream, self.on_status)
+        self.feed.subscribe(self.stream, self.on_message)
+        self.resync()
+
+    def stop(self):
+        if not self.is_active:
+            return
+        self.is_active = False
+        self.feed.unsubscribe(self.stream, self.on_message)
+        self.feed.unwatch(self.stream, self.on_status)
+        with self.lock:
+            self.reset()
+
+    def change_symbol(self, symbol):
+        was_active = self.is_active
+        self.stop()
+        self.symbol = symbol.lower()
+        if was_active:
+            self.start()
+
+    def reset(self):
+        self.synced = False
+        self.pending = deque(maxlen=self.MAX_PENDING)
+        self.last_update_id = None
+        self.bids.clear()
+        self.asks.clear()
+
+    def resync(self):
+        with self.lock:
+            self.reset()
+            if self.syncing:
+                return
+            self.syncing = True
+        threading.Thread(target=self.load_snapshot, args=(self.symbol,), daemon=True).start()
+
+    def load_snapshot(self, symbol):
+        try:
+            params = {"symbol": symbol.upper(), "limit": self.snapshot_limit}
+            snapshot = get_json("/api/v3/depth", params)
+        except Exception as e:
+            print(f"Order book snapshot failed for {symbol}: {e}")
+            snapshot = None
+
+        with self.lock:
+            if not self.is_active:
+                self.syncing = False
+                return
+            if symbol != self.symbol:
+                # The symbol changed while this load was running, and resync()
+                # left the new symbol's fetch to it
+                threading.Thread(target=self.load_snapshot, args=(self.symbol,), daemon=True).start()
+                return
+            if snapshot is None or "lastUpdateId" not in snapshot:
+                # Retry shortly; diff events keep buffering meanwhile
+                retry = threading.Timer(2.0, self.load_snapshot, args=(symbol,))
+                retry.daemon = True
+                retry.start()
+                return
+
+            self.syncing = False
+            for price, size in snapshot["bids"]:
+                self.bids.set(float(price), float(size))
+            for price, size in snapshot["asks"]:
+                self.asks.set(float(price), float(size))
+            self.last_update_id = snapshot["lastUpdateId"]
+            self.synced = True
+
+            pending, self.pending = self.pending, deque(maxlen=self.MAX_PENDING)
+            ok = all(self.apply(event) for event in pending)
+
+        if not ok:
+            self.resync()
+        elif self.on_update:
+            self.on_update()
+
+    def on_status(self, stream, status):
+        # Diffs were missed while disconnected; start over from a snapshot
+        if status == RESYNC and self.is_active and stream == self.stream:
+            self.resync()
+
+    def on_message(self, stream, data):
+        if not self.is_active or stream != self.stream:
+            return
+
+        with self.lock:
+            if not self.synced:
+                self.pending.append(data)
+                return
+            ok = self.apply(data)
+
+        if not ok:
+            print(f"Order book gap for {self.symbol}, resyncing")
+            self.resync()
+        elif self.on_update:
+            self.on_update()
+
+    def apply(self, event):
+        """Apply one diff event; False if it does not follow the last one applied."""
+        if event["u"] <= self.last_update_id:
+            return True
+        if event["U"] > self.last_update_id + 1:
+            return False
+
+        for price, size in event["b"]:
+            self.bids.set(float(price), float(size))
+        for price, size in event["a"]:
+            self.asks.set(float(price), float(size))
+        self.last_update_id = event["u"]
+        return True
+
+    def top(self, n, tick=None):
+        """The n best (bids, asks), optionally aggregated to a tick size."""
+        with self.lock:
+            if tick:
+                return self.bids.aggregated(n, tick), self.asks.aggregated(n, tick)
+            return self.bids.top(n), self.asks.top(n)
+
+    def range(self, low, high):
+        with self.lock:
+            return self.bids.range(low, high), self.asks.range(low, high)
+
+class SnapshotBook:
+    """Top of book replaced wholesale by each partial-depth payload.
+
+    For feeds that publish an already maintained book instead of diffs
+    (core.shared_market.SharedFeed): {"lastUpdateId", "bids", "asks"}
+    frames arrive on the usual depth stream, best level first. Answers
+    top() and range() like LocalOrderBook, from the levels it was given.
+    """
+
+    def __init__(self, feed, symbol, on_update=None):
+        self.feed = feed
+        self.symbol = symbol.lower()
+        self.on_update = on_update
+        self.bids = []
+        self.asks = []
+        self.lock = threading.Lock()
+        self.is_active = False
+        self.synced = False
+
+    @property
+    def stream(self):
+        return f"{self.symbol}@depth@100ms"
+
+    def start(self):
+        if self.is_active:
+            return
+        self.is_active = True
+        self.feed.subscribe(self.stream, self.on_message)
+
+    def stop(self):
+        if not self.is_active:
+            return
+        self.is_active = False
+        self.feed.unsubscribe(self.stream, self.on_message)
+        with self.lock:
+            self.bids, self.asks = [], []
+            self.synced = False
+
+    def change_symbol(self, symbol):
+        was_active = self.is_active
+        self.stop()
+        self.symbol = symbol.lower()
+        if was_active:
+            self.start()
+
+    def on_message(self, stream, data):
+        if not self.is_active or stream != self.stream:
+            return
+        with self.lock:
+            self.bids, self.asks = data["bids"], data["asks"]
+            self.synced = True
+        if self.on_update:
+            self.on_update()
+
+    def top(self, n, tick=None):
+        with self.lock:
+            bids, asks = self.bids, self.asks
+        if tick:
+            return aggregate(bids, n, tick, True), aggregate(asks, n, tick, False)
+        return bids[:n], asks[:n]
+
+    def range(self, low, high):
+        with self.lock:
+            bids, asks = self.bids, self.asks
+        return ([level for level in reversed(bids) if low <= level[0] <= high],
+                [level for level in asks if low <= level[0] <= high])
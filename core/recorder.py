@@ -0,0 +1,55 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+class FrameRecorder:
+    """Appends every raw websocket frame and REST response to a gzip session file.
+
+    One line per record: "W", receive time and the raw combined-stream
+    frame, or "R", receive time and a JSON object with the request path,
+    params and response. Replay (core/replay.py) reads the same format.
+    """
+
+    def __init__(self, directory="recordings", path=None):
+        if path is None:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S.log.gz"))
+        self.path = path
+        self.file = gzip.open(path, "at", encoding="utf-8")
+        self.lock = threading.Lock()
+        self.frames = 0
+        print(f"Recording session to {path}")
+
+    def write(self, kind, payload, received=None):
+        received = time.time() if received is None else received
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write(f"{kind}\t{received:.6f}\t{payload}\n")
+            self.frames += 1
+
+    def record_frame(self, message, received=None):
+        self.write("W", message, received)
+
+    def record_rest(self, path, params, data):
+        self.write("R", json.dumps({"path": path, "params": params, "data": data}))
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+                print(f"Recorded {self.frames} frames to {self.path}")
+
+def read_session(path):
+    """Yield (kind, received, payload) from a recorded session file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                kind, received, payload = line.rstrip("\n").split("\t", 2)
+                yield kind, float(received), payload
+        except (ValueError, EOFError):
+            # A session cut off mid-write ends with a partial line/member
+            return
@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+import core.http
+from core.feed import BinanceFeed
+from core.recorder import read_session
+
+class ReplayFeed(BinanceFeed):
+    """Plays a recorded session through the normal feed routing.
+
+    Frames reach components through BinanceFeed.on_message exactly as live
+    ones do, paced by their recorded receive times divided by speed
+    (speed=0 replays as fast as possible). Recorded REST responses answer
+    the app's REST calls, so no network connection is needed.
+    """
+
+    # Gaps in a recording are not outages
+    supervised = False
+
+    def __init__(self, path, speed=1.0):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.position = None
+        self.responses = {}
+        self.stopped = threading.Event()
+
+        for kind, received, payload in read_session(path):
+            if kind == "R":
+                record = json.loads(payload)
+                key = (record["path"], (record["params"] or {}).get("symbol"))
+                self.responses.setdefault(key, []).append((received, record["data"]))
+        core.http.responder = self.respond
+
+    def respond(self, path, params=None):
+        """The latest recorded response at the current replay position."""
+        recorded = self.responses.get((path, (params or {}).get("symbol")))
+        if not recorded:
+            raise LookupError(f"No recorded response for {path} {params}")
+        position = self.position
+        best = recorded[0][1]
+        for received, data in recorded:
+            if position is None or received > position:
+                break
+            best = data
+        return best
+
+    def connect(self):
+        self.ws = self
+        self.connected = True
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def send(self, method, streams):
+        pass
+
+    def close(self):
+        self.stopped.set()
+        self.connected = False
+        if core.http.responder == self.respond:
+            core.http.responder = None
+
+    def run(self):
+        print(f"Replaying {self.path} at {'max' if not self.speed else f'{self.speed:g}x'} speed")
+        start = None
+        frames = 0
+        for kind, received, payload in read_session(self.path):
+            if self.stopped.is_set():
+                return
+            if start is None:
+                start = (received, time.monotonic())
+            self.position = received
+
+            if self.speed:
+                delay = (received - start[0]) / self.speed - (time.monotonic() - start[1])
+                if delay > 0 and self.stopped.wait(delay):
+                    return
+
+            if kind == "W":
+                self.on_message(self, payload)
+                frames += 1
+        print(f"Replay finished: {frames} frames")
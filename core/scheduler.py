@@ -0,0 +1,137 @@
+import threading
+import time
+from core import metrics
+
+class RenderScheduler:
+    """Collects UI updates from websocket threads and applies them once per frame.
+
+    post() keeps only the latest arguments for a key (tickers, depth, the
+    forming candle); append() queues items that must all be shown (trades)
+    and hands the callback the whole batch. Everything pending is flushed on
+    the Tk thread in a single tick at the configured frame rate.
+
+    Updates posted while the feed is dispatching a frame carry that frame's
+    metrics sample, which is marked rendered (or coalesced) here. A callback
+    that does not show its update yet takes the samples with hold().
+
+    animate() registers Tk-thread work that has to happen later without new
+    input (fading a highlight, a throttled redraw). It rides on the same
+    tick instead of scheduling an after() per event.
+    """
+
+    def __init__(self, root, fps=30):
+        self.root = root
+        self.lock = threading.Lock()
+        self.latest = {}
+        self.batches = {}
+        self.animations = {}
+        self.running = False
+        self.coalesced = 0
+        self.flushed = 0
+        # Samples of the callback being run, for hold()
+        self.samples = []
+        # Optional LagWatchdog (core/diagnostics.py) told how long each callback took
+        self.monitor = None
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        self.fps = fps
+        self.interval = max(1, int(1000 / fps))
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.root.after(self.interval, self.tick)
+
+    def stop(self):
+        self.running = False
+
+    def post(self, key, callback, *args):
+        """Schedule callback(*args), replacing anything pending under key."""
+        sample = metrics.registry.claim()
+        with self.lock:
+            pending = self.latest.get(key)
+            if pending is not None:
+                self.coalesced += 1
+                metrics.registry.coalesced(pending[2])
+            self.latest[key] = (callback, args, [sample] if sample else [])
+
+    def append(self, key, callback, item):
+        """Queue item; callback receives every item queued under key this frame."""
+        sample = metrics.registry.claim()
+        with self.lock:
+            batch = self.batches.get(key)
+            if batch is None:
+                batch = self.batches[key] = (callback, [], [])
+            else:
+                self.coalesced += 1
+            batch[1].append(item)
+            if sample:
+                batch[2].append(sample)
+
+    def hold(self):
+        """Take the running callback's metrics samples instead of marking them rendered.
+
+        For an update kept back to be shown later; the caller reports the
+        samples with metrics.registry.rendered() or coalesced() itself.
+        """
+        held = list(self.samples)
+        self.samples.clear()
+        return held
+
+    def animate(self, key, callback):
+        """Call callback(now) every tick, with now from time.monotonic(), until it returns False."""
+        with self.lock:
+            self.animations[key] = callback
+
+    def stats(self):
+        return {"fps": self.fps, "coalesced": self.coalesced, "flushed": self.flushed}
+
+    def tick(self):
+        if not self.running:
+            return
+
+        with self.lock:
+            latest, self.latest = self.latest, {}
+            batches, self.batches = self.batches, {}
+
+        for callback, args, samples in latest.values():
+            self.samples = samples
+            self.run(callback, *args)
+            metrics.registry.rendered(samples)
+        for callback, items, samples in batches.values():
+            self.samples = samples
+            self.run(callback, items)
+            metrics.registry.rendered(samples)
+        self.samples = []
+        self.flushed += len(latest) + len(batches)
+
+        if self.animations:
+            self.step_animations(time.monotonic())
+
+        self.root.after(self.interval, self.tick)
+
+    def step_animations(self, now):
+        with self.lock:
+            animations = list(self.animations.items())
+        for key, callback in animations:
+            try:
+                more = callback(now)
+            except Exception as e:
+                print(f"Render error in {getattr(callback, '__name__', callback)}: {e}")
+                more = False
+            if not more:
+                with self.lock:
+                    if self.animations.get(key) is callback:
+                        del self.animations[key]
+
+    def run(self, callback, *args):
+        monitor = self.monitor
+        start = time.perf_counter() if monitor else 0
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"Render error in {getattr(callback, '__name__', callback)}: {e}")
+        if monitor:
+            monitor.record_callback(getattr(callback, "__qualname__", repr(callback)), time.perf_counter() - start)
@@ -0,0 +1,652 @@
+"""Market state in shared memory: one feed process, any number of viewer dashboards.
+
+    python -m core.shared_market --symbols btcusdt,ethusdt,solusdt
+    python main.py --shared
+
+MarketPublisher owns the feed, an order book per symbol and the candle
+archive, and keeps the latest tickers, top book levels, candle history and
+recent trades in multiprocessing.shared_memory segments. In a viewer,
+SharedFeed stands in for BinanceFeed: it polls those segments and hands
+components ready-made values, so viewers open no sockets and parse no JSON,
+and the cost of each extra window is its rendering alone.
+
+Every record (one ticker, one book, one symbol's candle or trade ring)
+starts with a sequence number used as a seqlock. The writer makes it odd,
+writes, and makes it even again; a reader keeps its copy only if the number
+was even and unchanged around the copy, so readers never hold up the
+writer. Python cannot issue memory fences, so this relies on stores
+becoming visible in program order, as they do on x86. On weaker hardware
+a torn value is possible but rare, and the next write replaces it.
+"""
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import core.http
+from core.candle_buffer import CANDLE_DTYPE
+from core.decoding import SCHEMAS
+from core.feed import BinanceFeed, RESYNC
+from core.order_book import SnapshotBook
+from core.supervisor import STALE_AFTER
+
+DEFAULT_NAME = "binance-market"
+DEFAULT_SYMBOLS = ["btcusdt", "ethusdt", "bnbusdt", "solusdt", "adausdt", "xrpusdt"]
+VERSION = 1
+
+# Book levels kept per side: everything LocalOrderBook loads from its REST
+# snapshot (snapshot_limit), so viewers group and bin the same depth a
+# direct connection has. Fewer would cut the widest groupings and depth
+# ranges short on liquid pairs, whose levels are one tick apart.
+BOOK_LEVELS = 1000
+# ChartPanel's default capacity: 90 days of 1m candles
+CANDLE_CAPACITY = 129_600
+TRADE_CAPACITY = 500
+
+HEADER_DTYPE = np.dtype([
+    ("version", "u4"), ("count", "u4"), ("pid", "i8"),
+    ("book_levels", "i8"), ("candle_capacity", "i8"), ("trade_capacity", "i8"),
+])
+SYMBOL_DTYPE = np.dtype("S16")
+TICKER_DTYPE = np.dtype([
+    ("seq", "u8"), ("time", "i8"), ("price", "f8"), ("change", "f8"), ("percent", "f8"),
+    ("volume", "f8"), ("high", "f8"), ("low", "f8"),
+])
+# Header of a per-symbol ring; end counts every row ever written, and
+# generation changes when the writer replaces the contents wholesale
+RING_DTYPE = np.dtype([("seq", "u8"), ("generation", "u8"), ("end", "i8")])
+TRADE_DTYPE = np.dtype([("time", "i8"), ("price", "f8"), ("quantity", "f8"), ("buyer_maker", "?")])
+
+TICKER_FIELDS = SCHEMAS["ticker"]
+TRADE_FIELDS = SCHEMAS["trade"]
+KLINE_FIELDS = SCHEMAS["kline"]
+
+def book_dtype(levels):
+    return np.dtype([
+        ("seq", "u8"), ("time", "i8"), ("update_id", "i8"), ("bid_count", "i8"), ("ask_count", "i8"),
+        ("bids", "f8", (levels, 2)), ("asks", "f8", (levels, 2)),
+    ])
+
+def begin_write(records, i):
+    records["seq"][i] += 1
+
+def end_write(records, i):
+    records["seq"][i] += 1
+
+def read_consistent(records, i, copy, attempts=1000):
+    """(seq, copy()) taken while record i was not being written, or (None, None)."""
+    seqs = records["seq"]
+    for _ in range(attempts):
+        seq = int(seqs[i])
+        if not seq & 1:
+            value = copy()
+            if int(seqs[i]) == seq:
+                return seq, value
+        time.sleep(0)
+    return None, None
+
+def attach_segment(name):
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the segment with this
+        # process's resource tracker, which would unlink it at exit
+        segment = shared_memory.SharedMemory(name)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class SharedMarket:
+    """The arrays behind one market name, created by the publisher or attached by a viewer.
+
+    Segments are "<name>-index" (header and symbol list), "-tickers",
+    "-books", "-candles" and "-trades". A viewer's arrays are read-only.
+    """
+
+    KINDS = ("index", "tickers", "books", "candles", "trades")
+
+    def __init__(self, name, segments, owner):
+        self.name = name
+        self.segments = segments
+        self.owner = owner
+
+        index = segments["index"].buf
+        self.header = np.ndarray((), HEADER_DTYPE, buffer=index)
+        if int(self.header["version"]) != VERSION:
+            raise RuntimeError(f"shared market {name} has version {int(self.header['version'])}, expected {VERSION}")
+        count = int(self.header["count"])
+        levels = int(self.header["book_levels"])
+        self.candle_capacity = int(self.header["candle_capacity"])
+        self.trade_capacity = int(self.header["trade_capacity"])
+        names = np.ndarray(count, SYMBOL_DTYPE, buffer=index, offset=HEADER_DTYPE.itemsize)
+        self.symbols = [s.decode() for s in names]
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.tickers = np.ndarray(count, TICKER_DTYPE, buffer=segments["tickers"].buf)
+        self.books = np.ndarray(count, book_dtype(levels), buffer=segments["books"].buf)
+        self.candle_rings = np.ndarray(count, RING_DTYPE, buffer=segments["candles"].buf)
+        self.candles = np.ndarray((count, self.candle_capacity), CANDLE_DTYPE, buffer=segments["candles"].buf,
+                                  offset=RING_DTYPE.itemsize * count)
+        self.trade_rings = np.ndarray(count, RING_DTYPE, buffer=segments["trades"].buf)
+        self.trades = np.ndarray((count, self.trade_capacity), TRADE_DTYPE, buffer=segments["trades"].buf,
+                                 offset=RING_DTYPE.itemsize * count)
+        if not owner:
+            for array in self.arrays():
+                array.flags.writeable = False
+
+    def arrays(self):
+        return (self.header, self.tickers, self.books, self.candle_rings, self.candles,
+                self.trade_rings, self.trades)
+
+    @classmethod
+    def create(cls, name, symbols, book_levels=BOOK_LEVELS, candle_capacity=CANDLE_CAPACITY,
+               trade_capacity=TRADE_CAPACITY):
+        count = len(symbols)
+        sizes = {
+            "index": HEADER_DTYPE.itemsize + SYMBOL_DTYPE.itemsize * count,
+            "tickers": TICKER_DTYPE.itemsize * count,
+            "books": book_dtype(book_levels).itemsize * count,
+            "candles": (RING_DTYPE.itemsize + CANDLE_DTYPE.itemsize * candle_capacity) * count,
+            "trades": (RING_DTYPE.itemsize + TRADE_DTYPE.itemsize * trade_capacity) * count,
+        }
+
+        try:
+            existing = cls.attach(name)
+        except FileNotFoundError:
+            pass
+        else:
+            pid = int(existing.header["pid"])
+            existing.close()
+            if process_alive(pid):
+                raise RuntimeError(f"shared market {name} is already published by process {pid}")
+        # Left behind by a publisher that did not shut down cleanly
+        for kind in cls.KINDS:
+            try:
+                stale = attach_segment(f"{name}-{kind}")
+            except FileNotFoundError:
+                continue
+            stale.close()
+            stale.unlink()
+
+        segments = {}
+        try:
+            for kind in cls.KINDS:
+                segments[kind] = shared_memory.SharedMemory(f"{name}-{kind}", create=True, size=sizes[kind])
+        except BaseException:
+            for segment in segments.values():
+                segment.close()
+                segment.unlink()
+            raise
+
+        # Fresh segments are zero-filled, so every seq starts even
+        header = np.ndarray((), HEADER_DTYPE, buffer=segments["index"].buf)
+        header["count"] = count
+        header["pid"] = os.getpid()
+        header["book_levels"] = book_levels
+        header["candle_capacity"] = candle_capacity
+        header["trade_capacity"] = trade_capacity
+        np.ndarray(count, SYMBOL_DTYPE, buffer=segments["index"].buf,
+                   offset=HEADER_DTYPE.itemsize)[:] = [s.lower().encode() for s in symbols]
+        # Written last: viewers ignore the index until the version is set
+        header["version"] = VERSION
+        del header
+        return cls(name, segments, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        segments = {}
+        try:
+            for kind in cls.KINDS:
+                segments[kind] = attach_segment(f"{name}-{kind}")
+            header = np.ndarray((), HEADER_DTYPE, buffer=segments["index"].buf)
+            if int(header["version"]) == 0:
+                raise FileNotFoundError(f"shared market {name} is still being created")
+            del header
+            return cls(name, segments, owner=False)
+        except BaseException:
+            for segment in segments.values():
+                segment.close()
+            raise
+
+    @property
+    def publisher_alive(self):
+        return process_alive(int(self.header["pid"]))
+
+    def close(self):
+        # The arrays export the segments' buffers; drop them before closing
+        self.header = self.tickers = self.books = None
+        self.candle_rings = self.candles = self.trade_rings = self.trades = None
+        for segment in self.segments.values():
+            segment.close()
+            if self.owner:
+                segment.unlink()
+
+    def ring_rows(self, rings, rows, i, start):
+        """(generation, end, rows start..end) of one symbol's ring, read consistently."""
+        capacity = rows.shape[1]
+
+        def copy():
+            end = int(rings["end"][i])
+            first = max(start, end - capacity, 0)
+            return int(rings["generation"][i]), end, rows[i, np.arange(first, end) % capacity]
+
+        _, value = read_consistent(rings, i, copy)
+        return value
+
+class MarketPublisher:
+    """Writes a feed's market data for the given symbols into a SharedMarket."""
+
+    def __init__(self, feed, market, archive):
+        self.feed = feed
+        self.market = market
+        self.archive = archive
+        self.books = {}
+        self.lock = threading.Lock()
+        # The snapshot thread and the feed thread both publish books
+        self.book_lock = threading.Lock()
+
+    def start(self):
+        for symbol in self.market.symbols:
+            self.feed.subscribe(f"{symbol}@ticker", self.on_ticker)
+            self.feed.subscribe(f"{symbol}@trade", self.on_trade)
+            self.feed.subscribe(f"{symbol}@kline_1m", self.on_kline)
+            self.feed.watch(f"{symbol}@kline_1m", self.on_kline_status)
+            book = self.books[symbol] = self.feed.order_book(
+                symbol, on_update=lambda symbol=symbol: self.on_book(symbol))
+            book.start()
+        threading.Thread(target=self.backfill, args=(self.market.symbols,), daemon=True,
+                         name="shared-backfill").start()
+
+    def stop(self):
+        for symbol in self.market.symbols:
+            self.feed.unsubscribe(f"{symbol}@ticker", self.on_ticker)
+            self.feed.unsubscribe(f"{symbol}@trade", self.on_trade)
+            self.feed.unsubscribe(f"{symbol}@kline_1m", self.on_kline)
+            self.feed.unwatch(f"{symbol}@kline_1m", self.on_kline_status)
+        for book in self.books.values():
+            book.stop()
+
+    def on_ticker(self, stream, data):
+        i = self.market.index[stream.partition("@")[0]]
+        tickers = self.market.tickers
+        price, change, percent, volume, high, low = TICKER_FIELDS(data)
+        begin_write(tickers, i)
+        tickers[i] = (tickers["seq"][i], data["E"], float(price), float(change), float(percent),
+                      float(volume), float(high), float(low))
+        end_write(tickers, i)
+
+    def on_trade(self, stream, data):
+        i = self.market.index[stream.partition("@")[0]]
+        rings, trades = self.market.trade_rings, self.market.trades
+        trade_time, price, quantity, buyer_maker = TRADE_FIELDS(data)
+        begin_write(rings, i)
+        end = int(rings["end"][i])
+        trades[i, end % self.market.trade_capacity] = (trade_time, float(price), float(quantity), buyer_maker)
+        rings["end"][i] = end + 1
+        end_write(rings, i)
+
+    def on_book(self, symbol):
+        i = self.market.index[symbol]
+        book = self.books[symbol]
+        books = self.market.books
+        levels = books["bids"].shape[1]
+        with self.book_lock:
+            bids, asks = book.top(levels)
+            begin_write(books, i)
+            record = books[i]
+            record["time"] = int(time.time() * 1000)
+            record["update_id"] = book.last_update_id or 0
+            record["bid_count"] = len(bids)
+            record["ask_count"] = len(asks)
+            if bids:
+                record["bids"][:len(bids)] = bids
+            if asks:
+                record["asks"][:len(asks)] = asks
+            end_write(books, i)
+
+    def on_kline(self, stream, data):
+        symbol = stream.partition("@")[0]
+        i = self.market.index[symbol]
+        open_time, o, h, l, c, v, is_closed = KLINE_FIELDS(data["k"])
+        candle = (open_time, float(o), float(h), float(l), float(c), float(v))
+        rings, candles = self.market.candle_rings, self.market.candles
+        capacity = self.market.candle_capacity
+
+        with self.lock:
+            begin_write(rings, i)
+            end = int(rings["end"][i])
+            if end and candles[i, (end - 1) % capacity]["time"] == open_time:
+                candles[i, (end - 1) % capacity] = candle
+            else:
+                candles[i, end % capacity] = candle
+                rings["end"][i] = end + 1
+            end_write(rings, i)
+
+        if is_closed:
+            self.archive.record(symbol, "1m", dict(zip(CANDLE_DTYPE.names, candle)))
+
+    def on_kline_status(self, stream, status):
+        # Candles closed while disconnected are in the archive once filled
+        if status == RESYNC:
+            symbol = stream.partition("@")[0]
+            threading.Thread(target=self.backfill, args=([symbol],), daemon=True).start()
+
+    def backfill(self, symbols):
+        """Load each symbol's ring from the archive, keeping live candles newer than it."""
+        capacity = self.market.candle_capacity
+        rings, candles = self.market.candle_rings, self.market.candles
+        for symbol in symbols:
+            try:
+                self.archive.fill_gaps(symbol, "1m")
+            except Exception as e:
+                print(f"Shared market backfill failed for {symbol}: {e}")
+            history = self.archive.read(symbol, "1m", capacity)
+            i = self.market.index[symbol]
+
+            with self.lock:
+                end = int(rings["end"][i])
+                live = candles[i, np.arange(max(0, end - capacity), end) % capacity]
+                if len(history):
+                    live = live[live["time"] > history["time"][-1]]
+                rows = np.concatenate([history, live])[-capacity:]
+                begin_write(rings, i)
+                candles[i, :len(rows)] = rows
+                rings["end"][i] = len(rows)
+                rings["generation"][i] += 1
+                end_write(rings, i)
+
+class SharedFeed(BinanceFeed):
+    """BinanceFeed for viewer dashboards, reading a MarketPublisher's segments.
+
+    Streams are polled every POLL_INTERVAL and delivered through the normal
+    routing, as small dicts in the shapes components already read: @ticker
+    and @trade fields, @kline_1m candles, and the depth stream as whole
+    top-of-book snapshots for SnapshotBook. Candle history comes from
+    SharedArchive. A stream that stops changing goes stale, and every
+    stream resyncs once a restarted publisher is found.
+    """
+
+    supervised = False
+    POLL_INTERVAL = 0.05
+    RETRY_SECONDS = 2.0
+
+    def __init__(self, name=DEFAULT_NAME):
+        super().__init__()
+        self.name = name
+        self.market = None
+        self.seen = {}
+        self.thread = None
+        self.stopped = threading.Event()
+        self.retrying = False
+        self.checked = 0.0
+        core.http.responder = self.respond
+
+    @property
+    def reconnecting(self):
+        return self.retrying
+
+    def order_book(self, symbol, on_update=None):
+        return SnapshotBook(self, symbol, on_update)
+
+    def connect(self):
+        self.ws = self
+        self.closing = False
+        if self.thread is None:
+            # Attached straight away so the first panels can read history
+            self.attach()
+            self.thread = threading.Thread(target=self.run, daemon=True, name="shared-feed")
+            self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.POLL_INTERVAL):
+            try:
+                if self.market is None and not self.attach():
+                    self.stopped.wait(self.RETRY_SECONDS)
+                    continue
+                self.poll()
+            except Exception as e:
+                print(f"Shared feed error: {e}")
+
+    def attach(self):
+        try:
+            market = SharedMarket.attach(self.name)
+        except (FileNotFoundError, RuntimeError) as e:
+            if not self.retrying:
+                print(f"Shared market {self.name} unavailable ({e}), retrying")
+                self.retrying = True
+            return False
+        if not market.publisher_alive:
+            market.close()
+            return False
+
+        self.market = market
+        self.retrying = False
+        self.seen = {}
+        self.on_open(None)
+        return True
+
+    def detach(self):
+        print(f"Shared market {self.name} publisher stopped, retrying")
+        market, self.market = self.market, None
+        market.close()
+        self.connected = False
+        self.retrying = True
+        with self.lock:
+            streams = list(self.subscribers)
+        for stream in streams:
+            self.mark_stale(stream)
+
+    def poll(self):
+        now = time.monotonic()
+        if now - self.checked > 1.0:
+            self.checked = now
+            if not self.market.publisher_alive:
+                self.detach()
+                return
+
+        with self.lock:
+            streams = list(self.subscribers)
+        for stream in streams:
+            symbol, _, kind = stream.partition("@")
+            i = self.market.index.get(symbol)
+            if i is None:
+                continue
+            if kind == "ticker":
+                self.poll_ticker(stream, i)
+            elif kind == "trade":
+                self.poll_trades(stream, i)
+            elif kind == "kline_1m":
+                self.poll_candles(stream, i)
+            elif kind.startswith("depth"):
+                self.poll_book(stream, i)
+
+            stale_after = STALE_AFTER.get(kind)
+            if stale_after and stream not in self.stale and now - self.last_message.get(stream, now) > stale_after:
+                self.mark_stale(stream)
+
+    def deliver(self, stream, data):
+        received = time.time()
+        self.route({"stream": stream, "data": data}, received, received)
+
+    def poll_ticker(self, stream, i):
+        tickers = self.market.tickers
+        if int(tickers["seq"][i]) == self.seen.get(stream):
+            return
+        seq, t = read_consistent(tickers, i, lambda: tickers[i].copy())
+        if seq is None or not t["time"]:
+            return
+        self.seen[stream] = seq
+        self.deliver(stream, {"E": int(t["time"]), "c": float(t["price"]), "p": float(t["change"]),
+                              "P": float(t["percent"]), "v": float(t["volume"]),
+                              "h": float(t["high"]), "l": float(t["low"])})
+
+    def poll_book(self, stream, i):
+        books = self.market.books
+        if int(books["seq"][i]) == self.seen.get(stream):
+            return
+        seq, book = read_consistent(books, i, lambda: books[i].copy())
+        if seq is None or not book["time"]:
+            return
+        self.seen[stream] = seq
+        self.deliver(stream, {"E": int(book["time"]), "lastUpdateId": int(book["update_id"]),
+                              "bids": [tuple(level) for level in book["bids"][:book["bid_count"]].tolist()],
+                              "asks": [tuple(level) for level in book["asks"][:book["ask_count"]].tolist()]})
+
+    def poll_trades(self, stream, i):
+        rings = self.market.trade_rings
+        seen = self.seen.get(stream)
+        if seen is not None and int(rings["seq"][i]) == seen[0]:
+            return
+        seq = int(rings["seq"][i])
+        value = self.market.ring_rows(rings, self.market.trades, i, seen[1] if seen else 0)
+        if value is None:
+            return
+        _, end, rows = value
+        self.seen[stream] = (seq, end)
+        for trade_time, price, quantity, buyer_maker in rows.tolist():
+            self.deliver(stream, {"E": trade_time, "T": trade_time, "p": price, "q": quantity, "m": buyer_maker})
+
+    def poll_candles(self, stream, i):
+        rings = self.market.candle_rings
+        seen = self.seen.get(stream)
+        if seen is not None and int(rings["seq"][i]) == seen[0]:
+            return
+        seq = int(rings["seq"][i])
+        # The last candle sent may have closed since; send it again
+        start = seen[2] - 1 if seen else 0
+        value = self.market.ring_rows(rings, self.market.candles, i, start)
+        if value is None:
+            return
+        generation, end, rows = value
+        if seen and generation != seen[1]:
+            # History was reloaded; the chart reads it again from SharedArchive.
+            # The ring may now be shorter than where this stream had read to.
+            self.notify(stream, RESYNC)
+            value = self.market.ring_rows(rings, self.market.candles, i, max(end - 1, 0))
+            if value is None:
+                return
+            generation, end, rows = value
+        # History comes from SharedArchive; only the forming candle is streamed
+        if not seen or generation != seen[1]:
+            rows = rows[-1:]
+        self.seen[stream] = (seq, generation, end)
+        for n, (open_time, o, h, l, c, v) in enumerate(rows.tolist(), start=end - len(rows)):
+            self.deliver(stream, {"E": int(time.time() * 1000),
+                                  "k": {"t": open_time, "o": o, "h": h, "l": l, "c": c, "v": v,
+                                        "x": n < end - 1}})
+
+    def read_candles(self, symbol, count=None):
+        market = self.market
+        if market is None or symbol not in market.index:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        value = market.ring_rows(market.candle_rings, market.candles, market.index[symbol], 0)
+        if value is None:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        rows = value[2]
+        # The forming candle is streamed; history holds closed ones only
+        rows = rows[:-1]
+        return rows if count is None else rows[-count:]
+
+    def respond(self, path, params=None):
+        """REST answers from shared memory; viewers make no network requests."""
+        if path == "/api/v3/ticker/24hr" and self.market is not None:
+            rows = []
+            for symbol in json.loads((params or {}).get("symbols", "[]")):
+                i = self.market.index.get(symbol.lower())
+                if i is None:
+                    continue
+                tickers = self.market.tickers
+                seq, t = read_consistent(tickers, i, lambda: tickers[i].copy())
+                if seq is None or not t["time"]:
+                    continue
+                rows.append({"symbol": symbol, "lastPrice": float(t["price"]), "priceChange": float(t["change"]),
+                             "priceChangePercent": float(t["percent"]), "volume": float(t["volume"]),
+                             "highPrice": float(t["high"]), "lowPrice": float(t["low"])})
+            return rows
+        raise LookupError(f"{path} is not published to shared memory")
+
+    def send(self, method, streams):
+        pass
+
+    def close(self):
+        self.closing = True
+        self.stopped.set()
+        self.connected = False
+        self.ws = None
+        if self.thread:
+            self.thread.join(self.POLL_INTERVAL * 10)
+            self.thread = None
+        if self.market:
+            self.market.close()
+            self.market = None
+        if core.http.responder == self.respond:
+            core.http.responder = None
+
+class SharedArchive:
+    """CandleArchive stand-in for viewers: history is the publisher's candle ring."""
+
+    def __init__(self, feed):
+        self.feed = feed
+
+    def read(self, symbol, interval, count=None):
+        return self.feed.read_candles(symbol.lower(), count)
+
+    def fill_gaps(self, symbol, interval):
+        # The publisher keeps the ring filled from its own archive
+        pass
+
+    def record(self, symbol, interval, candle):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish Binance market state to shared memory for viewer dashboards")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="shared memory segment prefix")
+    parser.add_argument("--symbols", default=",".join(DEFAULT_SYMBOLS), help="comma-separated symbols to publish")
+    parser.add_argument("--url", default=BinanceFeed.BASE_URL,
+                        help="combined-stream websocket URL (e.g. a local bench.server)")
+    parser.add_argument("--engine", choices=("threads", "asyncio"), default="threads",
+                        help="feed I/O on websocket-client threads or on one asyncio event loop")
+    args = parser.parse_args()
+    BinanceFeed.BASE_URL = args.url
+
+    from core.candle_archive import CandleArchive
+    symbols = [s.strip().lower() for s in args.symbols.split(",") if s.strip()]
+    try:
+        market = SharedMarket.create(args.name, symbols)
+    except (OSError, RuntimeError) as e:
+        print(f"Shared market failed to start: {e}")
+        return
+
+    if args.engine == "asyncio":
+        from core.aiofeed import AsyncFeed
+        feed = AsyncFeed()
+    else:
+        feed = BinanceFeed()
+    publisher = MarketPublisher(feed, market, CandleArchive())
+    publisher.start()
+    print(f"Publishing {', '.join(symbols)} to shared memory {args.name}")
+    stopped = threading.Event()
+    # A killed publisher would leave its segments for the resource tracker
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.stop()
+        feed.close()
+        market.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import pickle
+import threading
+import time
+
+class SnapshotStore:
+    """Last-known market state, kept across restarts.
+
+    Holds each ticker card's last values, the order book's top levels and
+    the recent trades, as plain tuples of the exchange's strings and
+    floats. It is written atomically on shutdown and every INTERVAL seconds
+    while running. At startup it is painted, marked stale, before any
+    socket is open. Candles are not included: the chart already reads them
+    from the candle archive before going to the network.
+    """
+
+    VERSION = 1
+    INTERVAL = 60
+
+    def __init__(self, path=os.path.join("cache", "snapshot.pkl")):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Ignoring unreadable snapshot {self.path}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return {}
+        return data
+
+    def save(self, data):
+        data = dict(data, version=self.VERSION, saved=time.time())
+        # The periodic save runs on a worker thread; don't let two interleave
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, "wb") as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"Error saving snapshot: {e}")
+
+    def save_async(self, data):
+        threading.Thread(target=self.save, args=(data,), daemon=True).start()
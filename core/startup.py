@@ -0,0 +1,46 @@
+import time
+
+class StartupTimer:
+    """Wall-clock marks from launch to the first painted price.
+
+    main.py imports this module before anything heavy, so the origin is
+    within a few milliseconds of interpreter start. The phase breakdown is
+    printed once, when the first ticker card renders a price.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = []
+        self.painted = False
+        self.callbacks = []
+
+    def mark(self, name):
+        if not self.painted:
+            self.marks.append((name, time.perf_counter()))
+
+    def when_painted(self, callback):
+        """Run callback (on the Tk thread) after the first price is painted."""
+        if self.painted:
+            callback()
+        else:
+            self.callbacks.append(callback)
+
+    def first_paint(self):
+        if self.painted:
+            return
+        self.mark("first price painted")
+        self.painted = True
+        print(self.report())
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def report(self):
+        lines = ["Startup timing:"]
+        previous = self.origin
+        for name, at in self.marks:
+            lines.append(f"  {name:<22} {(at - previous) * 1000:7.1f} ms   (at {(at - self.origin) * 1000:7.1f} ms)")
+            previous = at
+        return "\n".join(lines)
+
+timer = StartupTimer()
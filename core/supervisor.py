@@ -0,0 +1,168 @@
+import random
+import threading
+import time
+from collections import deque
+
+# Seconds without a frame before a stream counts as stale, by stream type.
+# Depth diffs arrive every 100ms and tickers every second; trades depend
+# on market activity, so they have no expected cadence.
+STALE_AFTER = {
+    "depth@100ms": 2.0,
+    "depth10@100ms": 2.0,
+    "ticker": 5.0,
+    "kline_1m": 10.0,
+    "arr": 5.0,  # !miniTicker@arr, every second
+}
+
+# With every cadence stream silent this long the socket is assumed dead
+CONNECTION_TIMEOUT = 10.0
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with equal jitter: half fixed, half random."""
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+class RateLimiter:
+    """Token bucket: rate tokens per second, at most burst saved up."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+class FeedSupervisor:
+    """Keeps a BinanceFeed connected and its streams fresh.
+
+    A background thread reconnects after the socket drops, using jittered
+    exponential backoff, and marks each stream stale when it falls silent
+    past its expected cadence. It also paces SUBSCRIBE/UNSUBSCRIBE frames.
+    Binance allows 5 incoming messages per second per connection and 300
+    connections per 5 minutes per IP. Both limits are enforced here so that
+    resubscribing many symbols at once cannot get the client disconnected
+    or banned.
+    """
+
+    CHECK_INTERVAL = 0.25
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.lock = threading.Lock()
+        self.outbox = deque()
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.attempt = 0
+        self.reconnect_at = None
+        self.connected_at = time.monotonic()
+        self.message_limiter = RateLimiter(rate=4, burst=4)
+        self.connect_limiter = RateLimiter(rate=1.0, burst=5)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True, name="feed-supervisor")
+            self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+
+    def queue(self, method, streams):
+        """Send a control frame when the rate limit allows, merging with the last one if possible."""
+        with self.lock:
+            if self.outbox and self.outbox[-1][0] == method:
+                self.outbox[-1][1].extend(s for s in streams if s not in self.outbox[-1][1])
+            else:
+                self.outbox.append((method, list(streams)))
+        self.wake.set()
+
+    def connected(self):
+        self.attempt = 0
+        self.reconnect_at = None
+        self.connected_at = time.monotonic()
+
+    def connection_lost(self):
+        with self.lock:
+            # The reconnect URL carries every current stream
+            self.outbox.clear()
+        delay = backoff_delay(self.attempt)
+        self.attempt += 1
+        self.reconnect_at = time.monotonic() + delay
+        print(f"Feed reconnecting in {delay:.1f}s (attempt {self.attempt})")
+        self.wake.set()
+
+    @property
+    def reconnecting(self):
+        return self.reconnect_at is not None
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.wake.wait(self.CHECK_INTERVAL)
+            self.wake.clear()
+            if self.stopped.is_set():
+                return
+            self.step()
+
+    def step(self):
+        """One supervision pass; run() calls it every CHECK_INTERVAL, an event loop may instead."""
+        try:
+            self.flush()
+            self.check_reconnect()
+            self.check_staleness()
+        except Exception as e:
+            print(f"Feed supervisor error: {e}")
+
+    def flush(self):
+        while self.feed.connected:
+            with self.lock:
+                if not self.outbox or not self.message_limiter.acquire():
+                    return
+                method, streams = self.outbox.popleft()
+            self.feed.transmit(method, streams)
+
+    def check_reconnect(self):
+        if self.reconnect_at is None or time.monotonic() < self.reconnect_at:
+            return
+        if self.feed.ws is not None:
+            # The lost socket is still being cleared, or another is already open
+            return
+        if not self.connect_limiter.acquire():
+            return
+        self.reconnect_at = None
+        self.feed.connect()
+
+    def check_staleness(self):
+        feed = self.feed
+        if not feed.connected:
+            return
+
+        now = time.monotonic()
+        with feed.lock:
+            streams = [s for s in feed.subscribers if s.partition("@")[2] in STALE_AFTER]
+        if not streams:
+            return
+
+        newest = max(feed.last_message.get(s, 0.0) for s in streams)
+        if now - max(newest, self.connected_at) > CONNECTION_TIMEOUT:
+            print(f"Feed silent for {CONNECTION_TIMEOUT:.0f}s, reconnecting")
+            feed.drop()
+            return
+
+        for stream in streams:
+            if stream in feed.stale:
+                continue
+            last = max(feed.last_message.get(stream, 0.0), self.connected_at)
+            if now - last > STALE_AFTER[stream.partition("@")[2]]:
+                feed.mark_stale(stream)
+                # A lost subscription looks the same as a quiet one, and
+                # subscribing again to a live stream is harmless
+                self.queue("SUBSCRIBE", [stream])
@@ -0,0 +1,110 @@
+import numpy as np
+from core.candle_buffer import CANDLE_DTYPE, CandleBuffer
+
+TIMEFRAMES = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+TIMEFRAME_TITLES = {
+    "1m": "1-Minute",
+    "5m": "5-Minute",
+    "15m": "15-Minute",
+    "1h": "1-Hour",
+    "4h": "4-Hour",
+    "1d": "1-Day",
+}
+
+def aggregate(candles, timeframe_ms):
+    """Group 1m candles into buckets of timeframe_ms (UTC-aligned like Binance)."""
+    if not len(candles):
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    buckets = candles["time"] - candles["time"] % timeframe_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(candles)] - 1
+
+    result = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    result["time"] = buckets[starts]
+    result["open"] = candles["open"][starts]
+    result["high"] = np.maximum.reduceat(candles["high"], starts)
+    result["low"] = np.minimum.reduceat(candles["low"], starts)
+    result["close"] = candles["close"][ends]
+    result["volume"] = np.add.reduceat(candles["volume"], starts)
+    return result
+
+class TimeframeAggregator:
+    """Derives every timeframe from 1m history and the live 1m kline stream.
+
+    Each timeframe has its own CandleBuffer. A tick touches only the forming
+    candle of each timeframe: high/low/close fold in directly, and volume is
+    the closed 1m volume already in the bucket plus the forming 1m volume.
+    """
+
+    def __init__(self, capacity, timeframes=TIMEFRAMES):
+        self.timeframes = timeframes
+        self.buffers = {
+            name: CandleBuffer(max(1000, -(-capacity * TIMEFRAMES["1m"] // ms)))
+            for name, ms in timeframes.items()
+        }
+        self.base_volume = dict.fromkeys(timeframes, 0.0)
+        self.minute_time = None
+        self.minute_volume = 0.0
+
+    def clear(self):
+        for buffer in self.buffers.values():
+            buffer.clear()
+        self.base_volume = dict.fromkeys(self.timeframes, 0.0)
+        self.minute_time = None
+        self.minute_volume = 0.0
+
+    def load(self, candles):
+        """Rebuild every timeframe from a 1m CANDLE_DTYPE array."""
+        self.clear()
+        if not len(candles):
+            return
+
+        for name, ms in self.timeframes.items():
+            self.buffers[name].extend(aggregate(candles, ms))
+            # Volume of the closed 1m candles already inside the forming bucket
+            bucket = candles["time"][-1] - candles["time"][-1] % ms
+            in_bucket = candles["time"][:-1] >= bucket
+            self.base_volume[name] = float(candles["volume"][:-1][in_bucket].sum())
+
+        self.minute_time = int(candles["time"][-1])
+        self.minute_volume = float(candles["volume"][-1])
+
+    def update(self, c):
+        """Fold a live 1m kline into every timeframe.
+
+        Returns the timeframes that started a new candle, or None if the
+        tick was ignored (no history loaded yet, or older than the last one).
+        """
+        if self.minute_time is None or c["time"] < self.minute_time:
+            return None
+
+        new_minute = c["time"] != self.minute_time
+        started = set()
+
+        for name, ms in self.timeframes.items():
+            buffer = self.buffers[name]
+            bucket = c["time"] - c["time"] % ms
+
+            if bucket == buffer.last_time():
+                if new_minute:
+                    self.base_volume[name] += self.minute_volume
+                last = buffer.view(1)[0]
+                buffer.update_last(max(last["high"], c["high"]), min(last["low"], c["low"]),
+                                   c["close"], self.base_volume[name] + c["volume"])
+            else:
+                buffer.append(bucket, c["open"], c["high"], c["low"], c["close"], c["volume"])
+                self.base_volume[name] = 0.0
+                started.add(name)
+
+        self.minute_time = c["time"]
+        self.minute_volume = c["volume"]
+        return started
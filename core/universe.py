@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from core.http import get_json
+
+class SymbolUniverse:
+    """Tradable spot symbols from /api/v3/exchangeInfo, cached on disk.
+
+    exchangeInfo is several megabytes, so only symbol/base/quote of the
+    TRADING pairs are kept, in a small JSON file refreshed once max_age has
+    passed. A stale cache is still used if the refresh fails.
+    """
+
+    def __init__(self, path=os.path.join("cache", "exchange_info.json"), max_age=86_400):
+        self.path = path
+        self.max_age = max_age
+        self.symbols = []
+        self.by_symbol = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Read the cache, refreshing it over REST if missing or old. Blocking."""
+        cached = self.read_cache()
+        if cached is None or time.time() - cached["fetched"] > self.max_age:
+            try:
+                cached = self.fetch()
+                self.write_cache(cached)
+            except Exception as e:
+                print(f"exchangeInfo refresh failed: {e}")
+                if cached is None:
+                    return self
+        self.set_symbols(cached["symbols"])
+        return self
+
+    def load_async(self, on_loaded=None):
+        def run():
+            self.load()
+            if on_loaded:
+                on_loaded(self)
+        threading.Thread(target=run, daemon=True).start()
+
+    def fetch(self):
+        info = get_json("/api/v3/exchangeInfo")
+        symbols = [
+            {"symbol": s["symbol"].lower(), "base": s["baseAsset"], "quote": s["quoteAsset"]}
+            for s in info.get("symbols", ())
+            if s.get("status") == "TRADING"
+        ]
+        return {"fetched": time.time(), "symbols": symbols}
+
+    def read_cache(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_cache(self, data):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Error caching exchangeInfo: {e}")
+
+    def set_symbols(self, symbols):
+        with self.lock:
+            self.symbols = symbols
+            self.by_symbol = {s["symbol"]: s for s in symbols}
+
+    def quoted_in(self, quote):
+        """(symbol, "BASE/QUOTE") pairs for one quote asset, e.g. USDT."""
+        with self.lock:
+            return [(s["symbol"], f"{s['base']}/{s['quote']}") for s in self.symbols if s["quote"] == quote]
@@ -1,8 +1,77 @@
+from core import startup  # first, so startup timing starts before the heavy imports
+import argparse
+import os
+import tempfile
 import tkinter as tk
 from core.app import DashboardApp
+from core.feed import BinanceFeed
+from core.candle_archive import CandleArchive
+from core.snapshot import SnapshotStore
+from core.bus import DEFAULT_SOCKET
+
+startup.timer.mark("imports")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Binance real-time dashboard")
+    parser.add_argument("--record", metavar="DIR", nargs="?", const="recordings",
+                        help="record every raw frame to a session file in DIR")
+    parser.add_argument("--bus", metavar="SOCKET", nargs="?", const=DEFAULT_SOCKET,
+                        help="read market data from a running feed bus (python -m core.bus) instead of Binance")
+    parser.add_argument("--shared", metavar="NAME", nargs="?", const="binance-market",
+                        help="view market state published to shared memory (python -m core.shared_market)")
+    parser.add_argument("--engine", choices=("threads", "asyncio"), default="threads",
+                        help="feed I/O on websocket-client threads or on one asyncio event loop")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay a recorded session instead of connecting to Binance")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed multiplier, 0 for as fast as possible")
+    parser.add_argument("--metrics", metavar="FILE", nargs="?", const="dashboard.prom",
+                        help="rewrite stream metrics to FILE in Prometheus text format every 10s")
+    parser.add_argument("--chart-worker", action="store_true",
+                        help="render the chart in a worker process so matplotlib never blocks the UI")
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="log main-loop stalls and slow callbacks; F12 toggles the sampling profiler")
+    return parser.parse_args()
+
+def build_feed(args):
+    if args.replay:
+        from core.replay import ReplayFeed
+        # Replayed data must not leak into the real history archive or snapshot
+        scratch = tempfile.mkdtemp(prefix="replay-")
+        return (ReplayFeed(args.replay, args.speed), CandleArchive(scratch),
+                SnapshotStore(os.path.join(scratch, "snapshot.pkl")))
+    if args.shared:
+        from core.shared_market import SharedFeed, SharedArchive
+        feed = SharedFeed(args.shared)
+        # Viewers keep no state of their own; the publisher has it all
+        scratch = tempfile.mkdtemp(prefix="viewer-")
+        return feed, SharedArchive(feed), SnapshotStore(os.path.join(scratch, "snapshot.pkl"))
+    recorder = None
+    if args.record:
+        import core.http
+        from core.recorder import FrameRecorder
+        recorder = FrameRecorder(args.record)
+        core.http.recorder = recorder
+    if args.bus:
+        from core.bus import RemoteFeed
+        return RemoteFeed(args.bus, recorder), None, None
+    if args.engine == "asyncio":
+        from core.aiofeed import AsyncFeed
+        return AsyncFeed(recorder), None, None
+    return BinanceFeed(recorder), None, None
 
 if __name__ == "__main__":
+    args = parse_args()
+    feed, archive, snapshots = build_feed(args)
+    exporter = None
+    if args.metrics:
+        from core import metrics
+        exporter = metrics.PrometheusExporter(metrics.registry, args.metrics)
+        exporter.start()
     root = tk.Tk()
-    app = DashboardApp(root)
+    app = DashboardApp(root, feed=feed, archive=archive, diagnostics=args.diagnostics,
+                       snapshots=snapshots, chart_worker=args.chart_worker)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    if exporter:
+        exporter.stop()
@@ -0,0 +1,173 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from core.aiofeed import (AsyncFeed, WebSocket, mask, CONTINUATION, TEXT, BINARY, PING, PONG,
+                          HANDSHAKE_GUID)
+
+class Writer:
+    """Collects what a WebSocket writes."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.transport = SimpleNamespace(abort=lambda: None)
+
+    def write(self, data):
+        self.data += data
+
+def frame(opcode, payload, fin=True):
+    """An unmasked server frame."""
+    n = len(payload)
+    head = bytearray([(0x80 if fin else 0) | opcode])
+    if n < 126:
+        head.append(n)
+    elif n < 2**16:
+        head.append(126)
+        head += n.to_bytes(2, "big")
+    else:
+        head.append(127)
+        head += n.to_bytes(8, "big")
+    return bytes(head) + payload
+
+def receive(data):
+    """Every message recv() returns from data, and the bytes the socket wrote back."""
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        writer = Writer()
+        ws = WebSocket(reader, writer)
+        messages = []
+        try:
+            while True:
+                messages.append(await ws.recv())
+        except asyncio.IncompleteReadError:
+            pass
+        return messages, bytes(writer.data)
+    return asyncio.run(run())
+
+class MaskTest(unittest.TestCase):
+    def test_matches_bytewise_xor(self):
+        key = b"\x01\x82\x43\xf4"
+        for n in (0, 1, 3, 4, 5, 126, 1000):
+            payload = os.urandom(n)
+            expected = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+            self.assertEqual(mask(payload, key), expected)
+
+    def test_is_its_own_inverse_and_keeps_leading_zeros(self):
+        key = os.urandom(4)
+        payload = b"\x00\x00\x00hello"
+        self.assertEqual(mask(mask(payload, key), key), payload)
+
+class FramingTest(unittest.TestCase):
+    def round_trip(self, opcode, payload):
+        writer = Writer()
+        WebSocket(None, writer).send_frame(opcode, payload)
+        return receive(bytes(writer.data))[0]
+
+    def test_round_trips_every_length_encoding(self):
+        for n in (0, 125, 126, 200, 65535, 65536, 70000):
+            text = "x" * n
+            self.assertEqual(self.round_trip(TEXT, text.encode()), [text], n)
+
+    def test_client_frames_are_masked(self):
+        writer = Writer()
+        WebSocket(None, writer).send("hello")
+        self.assertTrue(writer.data[1] & 0x80)
+        self.assertNotIn(b"hello", bytes(writer.data))
+
+    def test_binary_messages_stay_bytes(self):
+        self.assertEqual(self.round_trip(BINARY, b"\x00\xff"), [b"\x00\xff"])
+
+    def test_fragments_are_joined_around_a_ping(self):
+        data = (frame(TEXT, b"hel", fin=False) + frame(PING, b"p1")
+                + frame(CONTINUATION, b"lo ", fin=False) + frame(CONTINUATION, b"world")
+                + frame(TEXT, b"next"))
+        messages, written = receive(data)
+        self.assertEqual(messages, ["hello world", "next"])
+        # The reply is one masked PONG carrying the ping's payload
+        self.assertEqual(written[0], 0x80 | PONG)
+        self.assertEqual(written[1] & 0x7F, 2)
+        self.assertEqual(mask(written[6:8], written[2:6]), b"p1")
+
+    def test_pong_updates_last_pong(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(frame(PONG, b"") + frame(TEXT, b"x"))
+            ws = WebSocket(reader, Writer())
+            ws.last_pong = 0.0
+            await ws.recv()
+            return ws.last_pong
+        self.assertGreater(asyncio.run(run()), 0.0)
+
+class StubServer:
+    """Websocket server that sends one bad frame on the first connection, then good ones."""
+
+    def __init__(self):
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(4)
+        self.port = self.listener.getsockname()[1]
+        self.connections = 0
+        self.sockets = []
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            self.sockets.append(conn)
+            self.connections += 1
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += conn.recv(4096)
+            key = next(line.split(":", 1)[1].strip() for line in request.decode().split("\r\n")
+                       if line.lower().startswith("sec-websocket-key"))
+            accept = base64.b64encode(hashlib.sha1((key + HANDSHAKE_GUID).encode()).digest()).decode()
+            conn.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                          f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+            if self.connections == 1:
+                conn.sendall(frame(TEXT, b"\xff\xfe not utf-8"))
+            else:
+                message = {"stream": "btcusdt@trade", "data": {"t": 1, "E": int(time.time() * 1000)}}
+                conn.sendall(frame(TEXT, json.dumps(message).encode()))
+
+    def close(self):
+        self.listener.close()
+        for conn in self.sockets:
+            conn.close()
+
+class RecoveryTest(unittest.TestCase):
+    def test_reconnects_after_a_malformed_frame(self):
+        server = StubServer()
+        feed = AsyncFeed()
+        feed.BASE_URL = f"ws://127.0.0.1:{server.port}/stream"
+        received = threading.Event()
+        try:
+            feed.subscribe("btcusdt@trade", lambda stream, data: received.set())
+            self.assertTrue(received.wait(10))
+            self.assertEqual(server.connections, 2)
+            self.assertTrue(feed.connected)
+        finally:
+            feed.close()
+            server.close()
+
+    def test_abort_fails_over_when_the_connection_task_is_gone(self):
+        feed = AsyncFeed()
+        feed.ws = feed
+        feed.connected = True
+        feed.abort()
+        self.assertIsNone(feed.ws)
+        self.assertFalse(feed.connected)
+        self.assertTrue(feed.supervisor.reconnecting)
+
+if __name__ == "__main__":
+    unittest.main()
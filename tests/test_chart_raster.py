@@ -0,0 +1,83 @@
+import queue
+import unittest
+from unittest import mock
+import numpy as np
+from components import chart_raster
+from components.chart_raster import ChartRasterizer
+from core.candle_buffer import CANDLE_DTYPE
+
+class Scheduler:
+    """Runs posted callbacks when the test asks, like the Tk thread would."""
+
+    def __init__(self):
+        self.posted = queue.Queue()
+
+    def post(self, key, callback, *args):
+        self.posted.put((callback, args))
+
+    def run_next(self, timeout=30):
+        callback, args = self.posted.get(timeout=timeout)
+        callback(*args)
+        return callback.__name__
+
+class Photo:
+    def configure(self, **size):
+        self.size = size
+
+def candles(n=20):
+    view = np.zeros(n, dtype=CANDLE_DTYPE)
+    view["time"] = np.arange(n) * 60_000
+    view["open"] = view["close"] = 100.0 + np.arange(n)
+    view["high"] = view["close"] + 1
+    view["low"] = view["open"] - 1
+    view["volume"] = 1.0
+    return view
+
+class ChartRasterizerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.rasterizer = ChartRasterizer(self.scheduler, Photo(), size=(200, 150))
+        patcher = mock.patch.object(chart_raster, "blit")
+        self.blit = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.rasterizer.close)
+
+    def request(self, view):
+        self.rasterizer.request("TEST", view, {}, [], ["price", "volume"])
+
+    def test_a_failed_render_is_reported_and_the_next_one_drawn(self):
+        self.request(np.zeros(3))
+        self.request(candles())
+        with mock.patch("builtins.print") as report:
+            self.assertEqual(self.scheduler.run_next(), "show_frame")
+        self.assertIn("Chart render failed", report.call_args[0][0])
+        self.assertEqual(self.rasterizer.frames, 0)
+        # The pending request went out in place of the failed one
+        self.assertTrue(self.rasterizer.in_flight)
+        self.assertEqual(self.scheduler.run_next(), "show_frame")
+        self.assertEqual(self.rasterizer.frames, 1)
+        self.assertFalse(self.rasterizer.in_flight)
+        self.blit.assert_called_once()
+
+    def test_a_worker_that_exits_is_restarted_with_the_lost_request(self):
+        self.request(candles())
+        self.assertEqual(self.scheduler.run_next(), "show_frame")
+        self.rasterizer.process.kill()
+        with mock.patch("builtins.print"):
+            self.assertEqual(self.scheduler.run_next(), "worker_exited")
+        self.assertEqual(self.rasterizer.restarts, 1)
+        self.assertTrue(self.rasterizer.process.is_alive())
+        self.assertEqual(self.scheduler.run_next(), "show_frame")
+        self.assertEqual(self.rasterizer.frames, 2)
+
+    def test_gives_up_after_max_restarts(self):
+        self.rasterizer.restarts = ChartRasterizer.MAX_RESTARTS
+        self.rasterizer.process.kill()
+        with mock.patch("builtins.print"):
+            self.assertEqual(self.scheduler.run_next(), "worker_exited")
+        self.assertTrue(self.rasterizer.failed)
+        self.request(candles())
+        self.assertFalse(self.rasterizer.in_flight)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from core import order_book
+from core.order_book import LocalOrderBook
+
+class FakeFeed:
+    def __init__(self):
+        self.subscribers = {}
+
+    def subscribe(self, stream, callback):
+        self.subscribers[stream] = callback
+
+    def unsubscribe(self, stream, callback):
+        self.subscribers.pop(stream, None)
+
+    def watch(self, stream, callback):
+        pass
+
+    def unwatch(self, stream, callback):
+        pass
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+class SymbolChangeTest(unittest.TestCase):
+    def test_changing_symbol_during_snapshot_load_syncs_new_symbol(self):
+        requests = []
+        release = threading.Event()
+
+        def get_json(path, params):
+            requests.append(params["symbol"])
+            if params["symbol"] == "BTCUSDT":
+                release.wait(5)
+            return {"lastUpdateId": 100, "bids": [["1.0", "2.0"]], "asks": [["1.1", "3.0"]]}
+
+        feed = FakeFeed()
+        with mock.patch.object(order_book, "get_json", get_json):
+            book = LocalOrderBook(feed, "btcusdt")
+            book.start()
+            self.assertTrue(wait_for(lambda: requests == ["BTCUSDT"]))
+            book.change_symbol("ethusdt")
+            for u in range(90, 140):
+                feed.subscribers["ethusdt@depth@100ms"]("ethusdt@depth@100ms",
+                                                        {"U": u, "u": u, "b": [], "a": []})
+            release.set()
+            self.assertTrue(wait_for(lambda: book.synced))
+
+        self.assertEqual(requests, ["BTCUSDT", "ETHUSDT"])
+        self.assertFalse(book.syncing)
+        self.assertEqual(len(book.pending), 0)
+        self.assertEqual(book.last_update_id, 139)
+        book.stop()
+
+    def test_pending_diffs_are_capped(self):
+        release = threading.Event()
+
+        def get_json(path, params):
+            release.wait(5)
+            return None
+
+        feed = FakeFeed()
+        with mock.patch.object(order_book, "get_json", get_json):
+            book = LocalOrderBook(feed, "btcusdt")
+            book.start()
+            for u in range(book.MAX_PENDING * 2):
+                book.on_message(book.stream, {"U": u, "u": u, "b": [], "a": []})
+            self.assertEqual(len(book.pending), book.MAX_PENDING)
+            book.stop()
+            release.set()
+
+if __name__ == "__main__":
+    unittest.main()